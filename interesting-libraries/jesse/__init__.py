@@ -1,179 +1,28 @@
+import os
+import time
 import warnings
-from typing import Optional, Dict, Set
+from importlib.metadata import version as package_version
 import click
-import pkg_resources
-from fastapi import BackgroundTasks, Query, Header
-from fastapi.responses import JSONResponse, FileResponse
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-from starlette.websockets import WebSocket, WebSocketDisconnect
-from jesse.services.multiprocessing import process_manager
-from jesse.services.web import fastapi_app
-from jesse.services.redis import async_redis, async_publish, sync_publish
-from jesse.services.web import fastapi_app, BacktestRequestJson, ImportCandlesRequestJson, CancelRequestJson, \
-    LoginRequestJson, ConfigRequestJson, LoginJesseTradeRequestJson, NewStrategyRequestJson, FeedbackRequestJson, \
-    ReportExceptionRequestJson, OptimizationRequestJson, StoreExchangeApiKeyRequestJson, \
-    DeleteExchangeApiKeyRequestJson, StoreNotificationApiKeyRequestJson, DeleteNotificationApiKeyRequestJson, \
-    ExchangeSupportedSymbolsRequestJson, SaveStrategyRequestJson, GetStrategyRequestJson, DeleteStrategyRequestJson, \
-    DeleteCandlesRequestJson
-from jesse.services import auth as authenticator
-
-from jesse.services.ws_manager import ws_manager
-import uvicorn
 import jesse.helpers as jh
-import time
-
-# variable to know if the live trade plugin is installed
-HAS_LIVE_TRADE_PLUGIN = True
-try:
-    import jesse_live
-except ModuleNotFoundError:
-    HAS_LIVE_TRADE_PLUGIN = False
 
 # to silent stupid pandas warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 # get the jesse directory
-JESSE_DIR = pkg_resources.resource_filename(__name__, '')
-
-
-# load homepage
-@fastapi_app.get("/")
-async def index():
-    return FileResponse(f"{JESSE_DIR}/static/index.html")
-
-
-@fastapi_app.post("/terminate-all")
-async def terminate_all(authorization: Optional[str] = Header(None)):
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    process_manager.flush()
-    return JSONResponse({'message': 'terminating all tasks...'})
-
-
-@fastapi_app.post("/shutdown")
-async def shutdown(background_tasks: BackgroundTasks, authorization: Optional[str] = Header(None)):
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    background_tasks.add_task(jh.terminate_app)
-    return JSONResponse({'message': 'Shutting down...'})
-
-
-@fastapi_app.post("/auth")
-def auth(json_request: LoginRequestJson):
-    return authenticator.password_to_token(json_request.password)
-
-
-@fastapi_app.post("/make-strategy")
-def make_strategy(json_request: NewStrategyRequestJson, authorization: Optional[str] = Header(None)) -> JSONResponse:
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    from jesse.services import strategy_handler
-    return strategy_handler.generate(json_request.name)
-
-
-@fastapi_app.post("/feedback")
-def feedback(json_request: FeedbackRequestJson, authorization: Optional[str] = Header(None)) -> JSONResponse:
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    from jesse.services import jesse_trade
-    return jesse_trade.feedback(json_request.description, json_request.email)
-
-
-@fastapi_app.post("/report-exception")
-def report_exception(json_request: ReportExceptionRequestJson,
-                     authorization: Optional[str] = Header(None)) -> JSONResponse:
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    from jesse.services import jesse_trade
-    return jesse_trade.report_exception(
-        json_request.description,
-        json_request.traceback,
-        json_request.mode,
-        json_request.attach_logs,
-        json_request.session_id,
-        json_request.email,
-        has_live=HAS_LIVE_TRADE_PLUGIN
-    )
-
-
-@fastapi_app.post("/get-config")
-def get_config(json_request: ConfigRequestJson, authorization: Optional[str] = Header(None)):
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    from jesse.modes.data_provider import get_config as gc
+JESSE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    return JSONResponse({
-        'data': gc(json_request.current_config, has_live=HAS_LIVE_TRADE_PLUGIN)
-    }, status_code=200)
 
+def __getattr__(name: str):
+    # the dashboard's app is loaded lazily (see jesse/app.py)
+    if name == 'fastapi_app':
+        from jesse.app import fastapi_app
+        return fastapi_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@fastapi_app.post("/update-config")
-def update_config(json_request: ConfigRequestJson, authorization: Optional[str] = Header(None)):
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    from jesse.modes.data_provider import update_config as uc
-
-    uc(json_request.current_config)
-
-    return JSONResponse({'message': 'Updated configurations successfully'}, status_code=200)
-
-
-@fastapi_app.post("/clear-candles-database-cache")
-def clear_candles_database_cache(authorization: Optional[str] = Header(None)):
-    if not authenticator.is_valid_token(authorization):
-        return authenticator.unauthorized_response()
-
-    from jesse.services.cache import cache
-    cache.flush()
-
-    return JSONResponse({
-        'status': 'success',
-        'message': 'Candles database cache cleared successfully',
-    }, status_code=200)
-
-
-@fastapi_app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
-    from jesse.services.env import ENV_VALUES
-
-    if not authenticator.is_valid_token(token):
-        return
-
-    # Use connection manager to handle this websocket
-    connection_id = str(id(websocket))
-    print(jh.color(f"=> WebSocket {connection_id} connecting", 'yellow'))
-    
-    await ws_manager.connect(websocket)
-    channel_pattern = f"{ENV_VALUES['APP_PORT']}:channel:*"
-    
-    # Start Redis listener if not already started
-    await ws_manager.start_redis_listener(channel_pattern)
-    
-    try:
-        # Keep the connection alive
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        print(jh.color(f"WebSocket {connection_id} disconnected", 'yellow'))
-        ws_manager.disconnect(websocket)
-        # Optionally stop Redis listener if no more clients
-        await ws_manager.stop_redis_listener()
-    except Exception as e:
-        print(jh.color(f"WebSocket error: {str(e)}", 'red'))
-        ws_manager.disconnect(websocket)
-        await ws_manager.stop_redis_listener()
 
 # create a Click group
 @click.group()
-@click.version_option(pkg_resources.get_distribution("jesse").version)
+@click.version_option(package_version("jesse"))
 def cli() -> None:
     pass
 
@@ -200,7 +49,7 @@ def run() -> None:
  ╚════╝ ╚══════╝╚══════╝╚══════╝╚══════╝
                                         
     """
-    version = pkg_resources.get_distribution("jesse").version
+    version = package_version("jesse")
     print(welcome_message)
     print(f"Main Framework Version: {version}")
     
@@ -240,56 +89,73 @@ def run() -> None:
         host = "0.0.0.0"
 
     # run the main application
+    import uvicorn
+    from jesse.app import fastapi_app
+    from jesse.services.multiprocessing import process_manager
     process_manager.flush()
     uvicorn.run(fastapi_app, host=host, port=port, log_level="info")
 
 
-@fastapi_app.on_event("shutdown")
-def shutdown_event():
-    from jesse.services.db import database
-    database.close_connection()
+@cli.command()
+@click.option('--strategy', 'strategies', multiple=True, help='Only compile the indicators which this strategy uses. Can be repeated.')
+def warmup_kernels(strategies: tuple) -> None:
+    """
+    Compiles the numba kernels of the indicators into numba's on-disk cache, so that
+    backtests and optimization workers don't have to compile them on their first call.
+    """
+    from jesse.services.indicator_kernels import warmup_kernels as warmup, warmup_routes_kernels
+    start = time.time()
+    if strategies:
+        jh.validate_cwd()
+        result = warmup_routes_kernels([{'strategy': s} for s in strategies])
+    else:
+        result = warmup()
 
+    print(f"Compiled the kernels of {len(result['durations'])} indicators in {round(time.time() - start, 2)} seconds")
+    for name, error in result['errors'].items():
+        print(jh.color(f'{name}: {error}', 'red'))
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Routes
-# # # # # # # # # # # # # # # # # # # # # # # # # # # #
-from jesse.controllers.websocket_controller import router as websocket_router
-from jesse.controllers.optimization_controller import router as optimization_router
-from jesse.controllers.exchange_controller import router as exchange_router
-from jesse.controllers.backtest_controller import router as backtest_router
-from jesse.controllers.candles_controller import router as candles_router
-from jesse.controllers.strategy_controller import router as strategy_router
-from jesse.controllers.auth_controller import router as auth_router
-from jesse.controllers.config_controller import router as config_router
-from jesse.controllers.notification_controller import router as notification_router
-from jesse.controllers.system_controller import router as system_router
-from jesse.controllers.file_controller import router as file_router
-from jesse.controllers.custom_data_controller import router as custom_data_router
 
-# register routers
-fastapi_app.include_router(websocket_router)
-fastapi_app.include_router(optimization_router)
-fastapi_app.include_router(exchange_router)
-fastapi_app.include_router(backtest_router)
-fastapi_app.include_router(candles_router)
-fastapi_app.include_router(strategy_router)
-fastapi_app.include_router(auth_router)
-fastapi_app.include_router(config_router)
-fastapi_app.include_router(notification_router)
-fastapi_app.include_router(system_router)
-fastapi_app.include_router(file_router)
-fastapi_app.include_router(custom_data_router)
+@cli.group()
+def benchmark() -> None:
+    pass
 
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Live Trade Plugin
-# # # # # # # # # # # # # # # # # # # # # # # # # # # #
-if jh.has_live_trade_plugin():
-    from jesse.controllers.live_controller import router as live_router
-    fastapi_app.include_router(live_router)
+@benchmark.command()
+@click.option('--trials', default=200, show_default=True, help='Number of trials for each number of CPU cores.')
+@click.option('--cores', default=None, type=int, help='Maximum number of CPU cores. Defaults to all of them.')
+@click.option('--days', default=30, show_default=True, help='Days of synthetic 1m candles.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON.')
+def optimization(trials: int, cores: int, days: int, as_json: bool) -> None:
+    """
+    Measures the throughput of the optimize mode on synthetic candles
+    without requiring Redis or Postgres.
+    """
+    import json
+    from jesse.benchmarks.optimization import run as run_benchmark, print_report
+    report = run_benchmark(trials=trials, max_cores=cores, days=days)
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
 
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Static Files (Must be loaded at the end to prevent overlapping with API endpoints)
-# # # # # # # # # # # # # # # # # # # # # # # # # # # #
-fastapi_app.mount("/", StaticFiles(directory=f"{JESSE_DIR}/static"), name="static")
+@benchmark.command()
+@click.option('--sizes', default='240,10000,1000000', show_default=True, help='Comma separated numbers of candles.')
+@click.option('--indicator', 'names', multiple=True, help='Only time this indicator. Can be repeated.')
+@click.option('--baseline', default=None, type=click.Path(exists=True, dir_okay=False), help='JSON report to compare the timings with.')
+@click.option('--threshold', default=0.25, show_default=True, help='Slowdown (relative to the baseline) which is reported.')
+@click.option('--save', default=None, type=click.Path(dir_okay=False), help='Write the report to this JSON file.')
+def indicators(sizes: str, names: tuple, baseline: str, threshold: float, save: str) -> None:
+    """
+    Times every indicator in the sequential and non-sequential modes on candles generated
+    from the bundled test candles. Exits with 1 when there are slowdowns compared to the baseline.
+    """
+    from jesse.benchmarks.indicators import run as run_benchmark, compare, load_report, print_report, save_report
+    report = run_benchmark(sizes=[int(s) for s in sizes.split(',')], names=names or None)
+    slowdowns = compare(report, load_report(baseline), threshold) if baseline else None
+    print_report(report, slowdowns)
+    if save:
+        save_report(report, save)
+    if slowdowns:
+        raise SystemExit(1)
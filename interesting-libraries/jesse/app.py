@@ -0,0 +1,212 @@
+"""
+The FastAPI application of the dashboard. It's only imported by `jesse run` (and
+the Uvicorn server), so that importing jesse (for research, backtest processes and
+optimization workers) doesn't have to load the web stack and the controllers.
+"""
+from typing import Optional
+from fastapi import BackgroundTasks, Query, Header
+from fastapi.responses import JSONResponse, FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from jesse import JESSE_DIR
+from jesse.services.multiprocessing import process_manager
+from jesse.services.web import fastapi_app, LoginRequestJson, ConfigRequestJson, NewStrategyRequestJson, \
+    FeedbackRequestJson, ReportExceptionRequestJson
+from jesse.services import auth as authenticator
+from jesse.services.ws_manager import ws_manager
+import jesse.helpers as jh
+
+# variable to know if the live trade plugin is installed
+HAS_LIVE_TRADE_PLUGIN = True
+try:
+    import jesse_live
+except ModuleNotFoundError:
+    HAS_LIVE_TRADE_PLUGIN = False
+
+
+# load homepage
+@fastapi_app.get("/")
+async def index():
+    return FileResponse(f"{JESSE_DIR}/static/index.html")
+
+
+@fastapi_app.post("/terminate-all")
+async def terminate_all(authorization: Optional[str] = Header(None)):
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    process_manager.flush()
+    return JSONResponse({'message': 'terminating all tasks...'})
+
+
+@fastapi_app.post("/shutdown")
+async def shutdown(background_tasks: BackgroundTasks, authorization: Optional[str] = Header(None)):
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    background_tasks.add_task(jh.terminate_app)
+    return JSONResponse({'message': 'Shutting down...'})
+
+
+@fastapi_app.post("/auth")
+def auth(json_request: LoginRequestJson):
+    return authenticator.password_to_token(json_request.password)
+
+
+@fastapi_app.post("/make-strategy")
+def make_strategy(json_request: NewStrategyRequestJson, authorization: Optional[str] = Header(None)) -> JSONResponse:
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    from jesse.services import strategy_handler
+    return strategy_handler.generate(json_request.name)
+
+
+@fastapi_app.post("/feedback")
+def feedback(json_request: FeedbackRequestJson, authorization: Optional[str] = Header(None)) -> JSONResponse:
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    from jesse.services import jesse_trade
+    return jesse_trade.feedback(json_request.description, json_request.email)
+
+
+@fastapi_app.post("/report-exception")
+def report_exception(json_request: ReportExceptionRequestJson,
+                     authorization: Optional[str] = Header(None)) -> JSONResponse:
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    from jesse.services import jesse_trade
+    return jesse_trade.report_exception(
+        json_request.description,
+        json_request.traceback,
+        json_request.mode,
+        json_request.attach_logs,
+        json_request.session_id,
+        json_request.email,
+        has_live=HAS_LIVE_TRADE_PLUGIN
+    )
+
+
+@fastapi_app.post("/get-config")
+def get_config(json_request: ConfigRequestJson, authorization: Optional[str] = Header(None)):
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    from jesse.modes.data_provider import get_config as gc
+
+    return JSONResponse({
+        'data': gc(json_request.current_config, has_live=HAS_LIVE_TRADE_PLUGIN)
+    }, status_code=200)
+
+
+@fastapi_app.post("/update-config")
+def update_config(json_request: ConfigRequestJson, authorization: Optional[str] = Header(None)):
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    from jesse.modes.data_provider import update_config as uc
+
+    uc(json_request.current_config)
+
+    return JSONResponse({'message': 'Updated configurations successfully'}, status_code=200)
+
+
+@fastapi_app.post("/clear-candles-database-cache")
+def clear_candles_database_cache(authorization: Optional[str] = Header(None)):
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    from jesse.services.cache import cache
+    cache.flush()
+
+    return JSONResponse({
+        'status': 'success',
+        'message': 'Candles database cache cleared successfully',
+    }, status_code=200)
+
+
+@fastapi_app.websocket("/ws")
+async def websocket_endpoint(
+        websocket: WebSocket, token: str = Query(...), encoding: str = Query('json'), columnar: bool = Query(False)
+):
+    from jesse.services.env import ENV_VALUES
+
+    if not authenticator.is_valid_token(token):
+        return
+
+    # Use connection manager to handle this websocket
+    connection_id = str(id(websocket))
+    print(jh.color(f"=> WebSocket {connection_id} connecting", 'yellow'))
+    
+    await ws_manager.connect(websocket, encoding, columnar)
+    channel_pattern = f"{ENV_VALUES['APP_PORT']}:channel:*"
+    
+    # Start Redis listener if not already started
+    await ws_manager.start_redis_listener(channel_pattern)
+    
+    try:
+        # Keep the connection alive
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        print(jh.color(f"WebSocket {connection_id} disconnected", 'yellow'))
+        ws_manager.disconnect(websocket)
+        # Optionally stop Redis listener if no more clients
+        await ws_manager.stop_redis_listener()
+    except Exception as e:
+        print(jh.color(f"WebSocket error: {str(e)}", 'red'))
+        ws_manager.disconnect(websocket)
+        await ws_manager.stop_redis_listener()
+
+
+@fastapi_app.on_event("shutdown")
+def shutdown_event():
+    from jesse.services.db import database
+    database.close_connection()
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Routes
+# # # # # # # # # # # # # # # # # # # # # # # # # # # #
+from jesse.controllers.websocket_controller import router as websocket_router
+from jesse.controllers.optimization_controller import router as optimization_router
+from jesse.controllers.exchange_controller import router as exchange_router
+from jesse.controllers.backtest_controller import router as backtest_router
+from jesse.controllers.candles_controller import router as candles_router
+from jesse.controllers.strategy_controller import router as strategy_router
+from jesse.controllers.auth_controller import router as auth_router
+from jesse.controllers.config_controller import router as config_router
+from jesse.controllers.notification_controller import router as notification_router
+from jesse.controllers.system_controller import router as system_router
+from jesse.controllers.file_controller import router as file_router
+from jesse.controllers.custom_data_controller import router as custom_data_router
+
+# register routers
+fastapi_app.include_router(websocket_router)
+fastapi_app.include_router(optimization_router)
+fastapi_app.include_router(exchange_router)
+fastapi_app.include_router(backtest_router)
+fastapi_app.include_router(candles_router)
+fastapi_app.include_router(strategy_router)
+fastapi_app.include_router(auth_router)
+fastapi_app.include_router(config_router)
+fastapi_app.include_router(notification_router)
+fastapi_app.include_router(system_router)
+fastapi_app.include_router(file_router)
+fastapi_app.include_router(custom_data_router)
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Live Trade Plugin
+# # # # # # # # # # # # # # # # # # # # # # # # # # # #
+if jh.has_live_trade_plugin():
+    from jesse.controllers.live_controller import router as live_router
+    fastapi_app.include_router(live_router)
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Static Files (Must be loaded at the end to prevent overlapping with API endpoints)
+# # # # # # # # # # # # # # # # # # # # # # # # # # # #
+fastapi_app.mount("/", StaticFiles(directory=f"{JESSE_DIR}/static"), name="static")
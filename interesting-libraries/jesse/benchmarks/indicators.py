@@ -0,0 +1,207 @@
+"""
+A micro-benchmark of jesse.indicators. It times every indicator in both the sequential and
+the non-sequential mode at several numbers of candles, and compares the timings with a
+JSON baseline to catch slowdowns. Run it with:
+
+    jesse benchmark indicators --save baseline.json
+    jesse benchmark indicators --baseline baseline.json
+
+The candles are generated from the bundled test candles, so it runs offline.
+"""
+import json
+import os
+import platform
+import runpy
+import warnings
+from time import perf_counter
+from typing import Iterable
+
+import numpy as np
+
+import jesse.helpers as jh
+
+SIZES = (240, 10_000, 1_000_000)
+# a case is a slowdown when it takes more than (1 + threshold) times its baseline
+DEFAULT_THRESHOLD = 0.25
+# cases faster than this are too noisy to be compared
+MIN_COMPARED_SECONDS = 5e-6
+# time each case for at least this long
+MIN_TIMING_SECONDS = 0.05
+# an indicator isn't timed at a bigger size if that's expected to take longer than this per call
+MAX_CALL_SECONDS = 2.0
+
+_TEST_CANDLES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'tests', 'data', 'test_candles_indicators.py'
+)
+
+
+def _base_candles() -> np.ndarray:
+    if os.path.exists(_TEST_CANDLES_PATH):
+        return np.array(runpy.run_path(_TEST_CANDLES_PATH)['test_candles_6'], dtype=np.float64)
+
+    # an installed package doesn't include the tests
+    from jesse.factories import range_candles
+    return range_candles(500)
+
+
+def benchmark_candles(size: int) -> np.ndarray:
+    """
+    1m candles made by repeating the moves (relative to the previous close) of the
+    bundled test candles until there are `size` of them.
+    """
+    base = _base_candles()
+    previous_close = np.concatenate(([base[0, 1]], base[:-1, 2]))
+    moves = base[:, 1:5] / previous_close[:, None]
+
+    indexes = np.arange(size) % len(base)
+    closes = base[0, 1] * np.cumprod(moves[indexes, 1])
+    previous = np.concatenate(([base[0, 1]], closes[:-1]))
+
+    candles = np.empty((size, 6))
+    candles[:, 0] = 1_609_459_200_000 + np.arange(size) * 60_000
+    candles[:, 1:5] = moves[indexes] * previous[:, None]
+    candles[:, 5] = base[indexes, 5]
+    return candles
+
+
+def case_name(size: int, sequential: bool) -> str:
+    return f"{size}/{'sequential' if sequential else 'single'}"
+
+
+def time_call(func, min_seconds: float = MIN_TIMING_SECONDS) -> float:
+    """
+    Returns the seconds that one call takes: the best of the batches of calls that
+    run for at least min_seconds in total.
+    """
+    # the first call compiles (or loads) the numba kernels
+    start = perf_counter()
+    func()
+    first = perf_counter() - start
+
+    number = max(1, int(min_seconds / 5 / max(first, 1e-7)))
+    best = first
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        batch = perf_counter() - start
+        elapsed += batch
+        best = min(best, batch / number)
+    return best
+
+
+def run(
+        sizes: Iterable[int] = SIZES,
+        names: Iterable[str] = None,
+        min_seconds: float = MIN_TIMING_SECONDS,
+        max_call_seconds: float = MAX_CALL_SECONDS,
+) -> dict:
+    """
+    Times the indicators (all of them by default) and returns a report of
+    {indicator: {case: seconds per call}}, where a case is "<size>/sequential" or
+    "<size>/single". Failed and skipped cases are listed separately.
+    """
+    from jesse.services.indicator_kernels import call_indicator, indicator_names
+
+    sizes = sorted(sizes)
+    candles = {size: benchmark_candles(size) for size in sizes}
+
+    results, errors, skipped = {}, {}, {}
+    for name in sorted(names if names is not None else indicator_names()):
+        results[name] = {}
+        for sequential in (False, True):
+            previous = None
+            for size in sizes:
+                case = case_name(size, sequential)
+                # assume it's linear in the number of candles
+                if previous is not None and previous[1] * size / previous[0] > max_call_seconds:
+                    skipped.setdefault(name, []).append(case)
+                    continue
+                try:
+                    with warnings.catch_warnings(), np.errstate(all='ignore'):
+                        warnings.simplefilter('ignore')
+                        seconds = time_call(lambda: call_indicator(name, candles[size], sequential), min_seconds)
+                except Exception as e:
+                    errors.setdefault(name, {})[case] = str(e)
+                    break
+                results[name][case] = seconds
+                previous = (size, seconds)
+
+    return {
+        'meta': {
+            'created_at': jh.now_to_timestamp(force_fresh=True),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'sizes': sizes,
+        },
+        'results': results,
+        'errors': errors,
+        'skipped': skipped,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Returns the cases which are more than `threshold` slower than in the baseline,
+    the biggest slowdowns first.
+    """
+    slowdowns = []
+    for name, cases in report['results'].items():
+        for case, seconds in cases.items():
+            base = baseline['results'].get(name, {}).get(case)
+            if base is None or max(seconds, base) < MIN_COMPARED_SECONDS:
+                continue
+            if seconds > base * (1 + threshold):
+                slowdowns.append({
+                    'indicator': name, 'case': case, 'baseline': base, 'current': seconds, 'ratio': seconds / base
+                })
+
+    return sorted(slowdowns, key=lambda s: s['ratio'], reverse=True)
+
+
+def save_report(report: dict, path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:.2f} ms'
+    return f'{seconds:.2f} s'
+
+
+def print_report(report: dict, slowdowns: list = None) -> None:
+    from jesse.services.table import multi_value
+
+    cases = [case_name(size, sequential) for sequential in (False, True) for size in report['meta']['sizes']]
+    rows = [['Indicator'] + cases]
+    for name, results in report['results'].items():
+        rows.append([name] + [_format_seconds(results.get(case)) for case in cases])
+    multi_value(rows)
+
+    for name, cases_errors in report['errors'].items():
+        for case, error in cases_errors.items():
+            print(jh.color(f'{name} ({case}) failed: {error}', 'red'))
+
+    if slowdowns is None:
+        return
+    if not slowdowns:
+        print(jh.color('\nNo slowdowns compared to the baseline', 'green'))
+        return
+    print(jh.color(f'\n{len(slowdowns)} slowdowns compared to the baseline', 'red'))
+    multi_value([['Indicator', 'Case', 'Baseline', 'Current', 'Ratio']] + [
+        [s['indicator'], s['case'], _format_seconds(s['baseline']), _format_seconds(s['current']), f"{s['ratio']:.2f}x"]
+        for s in slowdowns
+    ])
@@ -0,0 +1,326 @@
+"""
+A reproducible benchmark for the optimize mode. It runs the optimizer on synthetic candles and a
+reference strategy, with local stand-ins for Redis and Postgres, so it can be used to catch
+regressions and to compare changes to the Ray path. Run it with:
+
+    jesse benchmark optimization --trials 200 --cores 4
+"""
+import os
+import random
+import tempfile
+from contextlib import contextmanager, ExitStack
+from multiprocessing import cpu_count
+from time import perf_counter
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+import jesse.helpers as jh
+import jesse.indicators as ta
+from jesse import utils
+from jesse.factories import range_candles
+from jesse.strategies import Strategy
+
+EXCHANGE = 'Sandbox'
+SYMBOL = 'BTC-USDT'
+TIMEFRAME = '5m'
+# the default number of warmup candles which optimization workers use
+WARMUP_CANDLES_NUM = 240
+
+
+class BenchmarkStrategy(Strategy):
+    """
+    Reference strategy of the benchmark: a moving average trend follower with a
+    percentage based stop-loss and take-profit.
+    """
+    def should_long(self) -> bool:
+        return ta.sma(self.candles, self.hp['fast_period']) > ta.sma(self.candles, self.hp['slow_period'])
+
+    def go_long(self):
+        qty = utils.size_to_qty(self.balance * 0.1, self.price)
+        self.buy = qty, self.price
+        self.stop_loss = qty, self.price * (1 - self.hp['stop_loss'] / 100)
+        self.take_profit = qty, self.price * (1 + self.hp['take_profit'] / 100)
+
+    def should_cancel_entry(self) -> bool:
+        return True
+
+    def hyperparameters(self):
+        return [
+            {'name': 'fast_period', 'type': int, 'min': 5, 'max': 20, 'default': 10},
+            {'name': 'slow_period', 'type': int, 'min': 21, 'max': 60, 'default': 30},
+            {'name': 'stop_loss', 'type': float, 'min': 0.1, 'max': 2, 'default': 0.5},
+            {'name': 'take_profit', 'type': float, 'min': 0.1, 'max': 4, 'default': 1},
+        ]
+
+
+def synthetic_candles(days: int, seed: int = 0) -> tuple:
+    """
+    Generates 1m candles with factories.range_candles() and splits them into
+    (training_warmup, training, testing_warmup, testing) candle dicts. The
+    testing period is the last third of the days.
+    """
+    random.seed(seed)
+    warmup_count = WARMUP_CANDLES_NUM * jh.timeframe_to_one_minutes(TIMEFRAME)
+    trading_count = days * 1440
+    training_count = trading_count * 2 // 3
+    arr = range_candles(warmup_count + trading_count)
+
+    training_start = warmup_count
+    testing_start = warmup_count + training_count
+
+    def to_dict(candles: np.ndarray) -> dict:
+        return {jh.key(EXCHANGE, SYMBOL): {'exchange': EXCHANGE, 'symbol': SYMBOL, 'candles': candles}}
+
+    return (
+        to_dict(arr[:training_start]),
+        to_dict(arr[training_start:testing_start]),
+        to_dict(arr[testing_start - warmup_count:testing_start]),
+        to_dict(arr[testing_start:]),
+    )
+
+
+def _routes() -> list:
+    return [{'exchange': EXCHANGE, 'symbol': SYMBOL, 'timeframe': TIMEFRAME, 'strategy': BenchmarkStrategy}]
+
+
+def _user_config(trials_per_hyperparameter: int) -> dict:
+    return {
+        'exchange': {
+            'name': EXCHANGE,
+            'balance': 10_000,
+            'fee': 0.001,
+            'type': 'futures',
+            'futures_leverage': 1,
+            'futures_leverage_mode': 'cross',
+        },
+        'warm_up_candles': WARMUP_CANDLES_NUM,
+        'objective_function': 'sharpe',
+        'trials': trials_per_hyperparameter,
+    }
+
+
+def measure_trial_phases(candles: tuple, trials: int = 10, seed: int = 0) -> dict:
+    """
+    Runs the training backtest of `trials` random hyperparameters in the current process,
+    once by setting up an isolated backtest for each trial (the cold path) and once on a
+    WarmBacktest (what optimization workers do), and reports the average seconds spent on
+    setting up the backtest versus running the simulation.
+    """
+    from jesse.config import reset_config
+    from jesse.modes.backtest_mode import simulator
+    from jesse.modes.optimize_mode.fitness import _formatted_inputs_for_isolated_backtest
+    from jesse.modes.optimize_mode.Optimize import generate_trial_params
+    from jesse.research.backtest import _prepare_isolated_backtest, WarmBacktest
+    from jesse.store import store
+
+    training_warmup_candles, training_candles = candles[0], candles[1]
+    routes = _routes()
+    inputs = _formatted_inputs_for_isolated_backtest(_user_config(1), routes)
+    inputs['warm_up_candles'] = WARMUP_CANDLES_NUM
+    strategy_hp = BenchmarkStrategy.hyperparameters(None)
+    np.random.seed(seed)
+    hps = [generate_trial_params(strategy_hp) for _ in range(trials)]
+
+    cold_setup, cold_simulation = [], []
+    for hp in hps:
+        start = perf_counter()
+        trading_candles = _prepare_isolated_backtest(inputs, routes, [], training_candles, training_warmup_candles)
+        cold_setup.append(perf_counter() - start)
+
+        start = perf_counter()
+        simulator(trading_candles, run_silently=True, hyperparameters=hp)
+        cold_simulation.append(perf_counter() - start)
+
+        reset_config()
+        store.reset()
+
+    start = perf_counter()
+    warm_backtest = WarmBacktest(inputs, routes, [], training_candles, training_warmup_candles)
+    warm_setup = perf_counter() - start
+
+    warm_trial = []
+    for hp in hps:
+        start = perf_counter()
+        warm_backtest.run(hp)
+        warm_trial.append(perf_counter() - start)
+
+    reset_config()
+    store.reset()
+
+    return {
+        'trials': trials,
+        'cold_setup_seconds': float(np.mean(cold_setup)),
+        'cold_simulation_seconds': float(np.mean(cold_simulation)),
+        'warm_setup_seconds': warm_setup,
+        'warm_trial_seconds': float(np.mean(warm_trial)),
+    }
+
+
+def _discard(event, msg, compression=False):
+    pass
+
+
+def install_worker_stand_ins() -> None:
+    """
+    Executed in each Ray worker process before it runs any task. Optimization workers
+    log every trial through the logger which publishes to Redis.
+    """
+    import jesse.services.logger as logger_module
+    import jesse.services.redis as redis_module
+    logger_module.sync_publish = _discard
+    redis_module.sync_publish = _discard
+
+
+@contextmanager
+def _local_stand_ins(published: list):
+    """
+    Replaces the Redis and Postgres calls of the optimizer with in-memory stand-ins and
+    runs it inside a temporary directory (for Optuna's SQLite storage and the log files).
+    """
+    import jesse.models.OptimizationSession as session_module
+    import jesse.modes.optimize_mode.Optimize as optimize_module
+    import jesse.services.logger as logger_module
+    import jesse.services.redis as redis_module
+
+    def publish(event, msg, compression=False):
+        published.append(event)
+
+    session = {'status': 'running'}
+    patches = {
+        optimize_module: {
+            'sync_publish': publish,
+            'is_process_active': lambda client_id: True,
+            'get_optimization_session': lambda session_id: session,
+            'get_optimization_session_by_id': lambda session_id: SimpleNamespace(completed_trials=0),
+            'update_optimization_session_status': lambda session_id, status: session.update(status=status),
+            'update_optimization_session_trials': lambda *args, **kwargs: None,
+            'append_optimization_session_trials': lambda *args, **kwargs: None,
+        },
+        session_module: {'add_session_exception': lambda *args, **kwargs: None},
+        logger_module: {'sync_publish': publish},
+        redis_module: {'sync_publish': publish},
+    }
+
+    cwd = os.getcwd()
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as directory:
+        for module, attributes in patches.items():
+            for name, value in attributes.items():
+                stack.enter_context(mock.patch.object(module, name, value))
+        os.chdir(directory)
+        try:
+            yield
+        finally:
+            os.chdir(cwd)
+
+
+def measure_throughput(candles: tuple, cpu_cores: int, trials: int, seed: int = 0) -> dict:
+    """
+    Runs the optimizer with `cpu_cores` workers for (roughly) `trials` trials and returns
+    the number of finished trials per second, including the start-up of the workers.
+    """
+    import ray
+    from jesse.config import config, reset_config, set_config
+    from jesse.modes.optimize_mode.Optimize import Optimizer
+    from jesse.routes import router
+    from jesse.store import store
+
+    strategy_hp = BenchmarkStrategy.hyperparameters(None)
+    trials_per_hyperparameter = max(1, trials // len(strategy_hp))
+    user_config = _user_config(trials_per_hyperparameter)
+    published = []
+
+    with _local_stand_ins(published):
+        config['app']['trading_mode'] = 'optimize'
+        # the trading mode and config values read earlier in this process are cached
+        jh.is_optimizing.cache_clear()
+        jh.CACHED_CONFIG.clear()
+        set_config(user_config)
+        router.initiate(_routes(), [])
+        np.random.seed(seed)
+        # Start Ray here (instead of inside the optimizer) to install the stand-ins in the workers too
+        ray.init(
+            num_cpus=cpu_cores,
+            runtime_env={'worker_process_setup_hook': f'{__name__}.install_worker_stand_ins'},
+            ignore_reinit_error=True
+        )
+
+        optimizer = Optimizer(jh.generate_unique_id(), user_config, *candles, False, 100, cpu_cores)
+        try:
+            start = perf_counter()
+            optimizer.run()
+            elapsed = perf_counter() - start
+        finally:
+            optimizer.tl.stop()
+            reset_config()
+            jh.is_optimizing.cache_clear()
+            jh.CACHED_CONFIG.clear()
+            store.reset()
+
+    return {
+        'cpu_cores': optimizer.cpu_cores,
+        'trials': optimizer.completed_trials,
+        'seconds': elapsed,
+        'trials_per_second': optimizer.completed_trials / elapsed,
+        'published_messages': len(published),
+    }
+
+
+def _core_counts(max_cores: int) -> list:
+    counts = []
+    n = 1
+    while n < max_cores:
+        counts.append(n)
+        n *= 2
+    counts.append(max_cores)
+    return counts
+
+
+def run(trials: int = 200, max_cores: int = None, days: int = 30, phase_trials: int = 10, seed: int = 0) -> dict:
+    """
+    Runs the whole benchmark and returns a report with the trial phases and the
+    throughput at 1, 2, 4, ... max_cores CPU cores. The scaling efficiency is the
+    speed-up compared to a single core divided by the number of cores.
+    """
+    if max_cores is None:
+        max_cores = cpu_count()
+    max_cores = max(1, min(max_cores, cpu_count()))
+
+    candles = synthetic_candles(days, seed)
+
+    report = {
+        'days': days,
+        'phases': measure_trial_phases(candles, phase_trials, seed),
+        'scaling': [],
+    }
+
+    for cores in _core_counts(max_cores):
+        result = measure_throughput(candles, cores, trials, seed)
+        result['efficiency'] = result['trials_per_second'] / (report['scaling'][0]['trials_per_second'] * cores) \
+            if report['scaling'] else 1.0
+        report['scaling'].append(result)
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    from jesse.services.table import key_value, multi_value
+
+    phases = report['phases']
+    print(jh.color(f"Trial phases ({phases['trials']} trials, {report['days']} days of 1m candles)", 'yellow'))
+    key_value([
+        ['Cold setup per trial', f"{phases['cold_setup_seconds'] * 1000:.1f} ms"],
+        ['Cold simulation per trial', f"{phases['cold_simulation_seconds'] * 1000:.1f} ms"],
+        ['Warm setup (once per worker)', f"{phases['warm_setup_seconds'] * 1000:.1f} ms"],
+        ['Warm trial', f"{phases['warm_trial_seconds'] * 1000:.1f} ms"],
+    ], 'phases')
+
+    print(jh.color('\nThroughput', 'yellow'))
+    rows = [['CPU cores', 'Trials', 'Seconds', 'Trials/sec', 'Efficiency', 'Published messages']]
+    for r in report['scaling']:
+        rows.append([
+            r['cpu_cores'], r['trials'], round(r['seconds'], 2), round(r['trials_per_second'], 2),
+            f"{r['efficiency'] * 100:.0f}%", r['published_messages']
+        ])
+    multi_value(rows)
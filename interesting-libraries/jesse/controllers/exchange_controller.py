@@ -5,7 +5,7 @@ from starlette.responses import JSONResponse
 from jesse.modes.import_candles_mode import CandleExchange
 from jesse.modes.import_candles_mode.drivers import drivers, driver_names
 from jesse.services import auth as authenticator
-from jesse.services.redis import sync_redis
+from jesse.services.redis import get_sync_redis
 from jesse.services.web import ExchangeSupportedSymbolsRequestJson, StoreExchangeApiKeyRequestJson, DeleteExchangeApiKeyRequestJson
 
 
@@ -55,7 +55,7 @@ def delete_exchange_api_keys_endpoint(json_request: DeleteExchangeApiKeyRequestJ
 def get_exchange_supported_symbols(exchange: str) -> JSONResponse:
     # first try to get from cache
     cache_key = f'exchange-symbols:{exchange}'
-    cached_result = sync_redis.get(cache_key)
+    cached_result = get_sync_redis().get(cache_key)
     if cached_result is not None:
         return JSONResponse({
             'data': eval(cached_result)
@@ -71,7 +71,7 @@ def get_exchange_supported_symbols(exchange: str) -> JSONResponse:
     try:
         arr = driver.get_available_symbols()
         # cache successful result for 5 minutes
-        sync_redis.setex(cache_key, 300, str(arr))
+        get_sync_redis().setex(cache_key, 300, str(arr))
     except Exception as e:
         return JSONResponse({
             'error': str(e)
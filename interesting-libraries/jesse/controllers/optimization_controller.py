@@ -5,12 +5,12 @@ from pydantic import BaseModel
 
 from jesse.services import auth as authenticator
 from jesse.services.multiprocessing import process_manager
-from jesse.services.web import OptimizationRequestJson, CancelRequestJson, UpdateOptimizationSessionStateRequestJson, UpdateOptimizationSessionStatusRequestJson, TerminateOptimizationRequestJson
+from jesse.services.web import OptimizationRequestJson, WalkForwardOptimizationRequestJson, CancelRequestJson, UpdateOptimizationSessionStateRequestJson, UpdateOptimizationSessionStatusRequestJson, TerminateOptimizationRequestJson
 from jesse import helpers as jh
 from jesse.models.OptimizationSession import get_optimization_sessions as get_sessions, update_optimization_session_state, update_optimization_session_status, delete_optimization_session, reset_optimization_session
 from jesse.services.transformers import get_optimization_session, get_optimization_session_for_load_more
 from jesse.models.OptimizationSession import get_optimization_session_by_id as get_optimization_session_by_id_from_db
-from jesse.modes.optimize_mode import run as run_optimization
+from jesse.modes.optimize_mode import run as run_optimization, run_walk_forward
 
 
 router = APIRouter(prefix="/optimization", tags=["Optimization"])
@@ -53,6 +53,43 @@ async def optimization(request_json: OptimizationRequestJson, authorization: Opt
     return JSONResponse({'message': 'Started optimization...'}, status_code=202)
 
 
+@router.post("/walk-forward")
+async def walk_forward_optimization(request_json: WalkForwardOptimizationRequestJson, authorization: Optional[str] = Header(None)):
+    """
+    Start a walk-forward optimization process
+    """
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    jh.validate_cwd()
+
+    # Check Python version before imports
+    if jh.python_version() == (3, 13):
+        return JSONResponse({
+            'error': 'Optimization is not supported on Python 3.13',
+            'message': 'The Ray library used for optimization does not support Python 3.13 yet. Please use Python 3.12 or lower.'
+        }, status_code=500)
+
+    process_manager.add_task(
+        run_walk_forward,
+        request_json.id,
+        request_json.config,
+        request_json.exchange,
+        request_json.routes,
+        request_json.data_routes,
+        request_json.start_date,
+        request_json.finish_date,
+        request_json.folds,
+        request_json.anchored,
+        request_json.optimal_total,
+        request_json.fast_mode,
+        request_json.cpu_cores,
+        request_json.state,
+    )
+
+    return JSONResponse({'message': 'Started walk-forward optimization...'}, status_code=202)
+
+
 @router.post("/rerun")
 async def rerun_optimization(request_json: OptimizationRequestJson, authorization: Optional[str] = Header(None)):
     """
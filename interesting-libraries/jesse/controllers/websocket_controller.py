@@ -1,10 +1,11 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 import asyncio
-import json
 from asyncio import Queue
 
+from jesse.libs import columnar as columnar_lib
 from jesse.services import auth as authenticator
-from jesse.services.redis import async_redis
+from jesse.services import message_encoding
+from jesse.services.redis import get_async_redis
 from jesse.services.multiprocessing import process_manager
 import jesse.helpers as jh
 
@@ -12,7 +13,7 @@ router = APIRouter(tags=["WebSocket"])
 
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
+async def websocket_endpoint(websocket: WebSocket, token: str = Query(...), columnar: bool = Query(False)):
     from jesse.services.env import ENV_VALUES
 
     if not authenticator.is_valid_token(token):
@@ -21,15 +22,26 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
     await websocket.accept()
 
     queue = Queue()
+    async_redis = await get_async_redis()
     ch, = await async_redis.psubscribe(f"{ENV_VALUES['APP_PORT']}:channel:*")
 
     async def echo(q):
         try:
             while True:
                 msg = await q.get()
-                msg = json.loads(msg)
-                msg['id'] = process_manager.get_client_id(msg['id'])
-                await websocket.send_json(msg)
+                if columnar_lib.is_encoded(msg):
+                    # only the clients which have asked for it in the handshake get the columnar frame
+                    if columnar:
+                        header, buffers = columnar_lib.decode_header(msg)
+                        header['id'] = process_manager.get_client_id(header['id'])
+                        await websocket.send_bytes(columnar_lib.encode_with_header(header, buffers))
+                        continue
+                    msg = message_encoding.from_columnar(msg)
+                else:
+                    msg = message_encoding.decode(msg)
+                for m in (msg['data'] if msg.get('is_batch') else [msg]):
+                    m['id'] = process_manager.get_client_id(m['id'])
+                    await websocket.send_text(message_encoding.render(m, message_encoding.JSON))
         except WebSocketDisconnect:
             await async_redis.punsubscribe(f"{ENV_VALUES['APP_PORT']}:channel:*")
             print(jh.color('WebSocket disconnected', 'yellow'))
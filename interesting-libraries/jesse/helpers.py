@@ -859,6 +859,15 @@ def style(msg_text: str, msg_style: str) -> str:
 
 
 def terminate_app() -> None:
+    # write the logs which are still in the queue
+    from jesse.services import logger
+    logger.flush()
+    # write the candles which are still buffered, before the database is closed
+    from jesse.services.candle_writer import candle_writer
+    try:
+        candle_writer.close()
+    except Exception as e:
+        print(color(f'Failed to store the buffered candles: {e}', 'red'))
     # close the database
     from jesse.services.db import database
     database.close_connection()
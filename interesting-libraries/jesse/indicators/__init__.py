@@ -12,6 +12,7 @@ from .aroonosc import aroonosc
 from .atr import atr
 from .avgprice import avgprice
 from .bandpass import bandpass
+from .batch import batch
 from .beta import beta
 from .bollinger_bands import bollinger_bands
 from .bollinger_bands_width import bollinger_bands_width
@@ -26,6 +27,7 @@ from .cksp import cksp
 from .cmo import cmo
 from .correl import correl
 from .correlation_cycle import correlation_cycle
+from .cross_section import cross_section
 from .cvi import cvi
 from .cwma import cwma
 from .damiani_volatmeter import damiani_volatmeter
@@ -5,7 +5,7 @@ from jesse.helpers import slice_candles
 from numba import njit
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _adxr(high, low, close, period):
     n = len(high)
     TR = np.zeros(n)
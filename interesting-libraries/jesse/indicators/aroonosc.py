@@ -5,7 +5,7 @@ from numba import njit
 
 from jesse.helpers import slice_candles
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _compute_aroonosc_nb(high: np.ndarray, low: np.ndarray, period: int) -> np.ndarray:
     n = high.shape[0]
     result = np.empty(n, dtype=np.float64)
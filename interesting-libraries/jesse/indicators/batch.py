@@ -0,0 +1,185 @@
+import inspect
+from functools import lru_cache
+from typing import Callable, Iterable, Union
+
+import numpy as np
+
+from jesse.helpers import get_candle_source, slice_candles
+from jesse_rust import atr as atr_rust
+from jesse_rust import bollinger_bands as bb_rust
+from jesse_rust import ema as ema_rust
+from jesse_rust import sma as sma_rust
+
+Spec = Union[str, tuple, dict]
+
+
+class _SharedSeries:
+    """
+    Intermediate series of one batch() call. Each one is computed the first time an
+    indicator asks for it, and then reused by the others.
+    """
+    def __init__(self, candles: np.ndarray) -> None:
+        self.candles = candles
+        self._cache = {}
+
+    def _get(self, key: tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def source(self, source_type: str) -> np.ndarray:
+        if len(self.candles.shape) == 1:
+            return self.candles
+        return self._get(('source', source_type), lambda: get_candle_source(self.candles, source_type=source_type))
+
+    def sma(self, source_type: str, period: int) -> np.ndarray:
+        return self._get(('sma', source_type, period), lambda: sma_rust(self.source(source_type), period))
+
+    def ema(self, source_type: str, period: int) -> np.ndarray:
+        return self._get(('ema', source_type, period), lambda: ema_rust(self.source(source_type), period))
+
+    def bollinger_bands(self, source_type: str, period: int, devup: float, devdn: float) -> tuple:
+        def compute():
+            bands = bb_rust(self.source(source_type).astype(np.float64), period, devup, devdn)
+            # the middle band is the SMA
+            self._cache.setdefault(('sma', source_type, period), bands[1])
+            return bands
+
+        return self._get(('bollinger_bands', source_type, period, devup, devdn), compute)
+
+    def atr(self, period: int) -> np.ndarray:
+        return self._get(('atr', period), lambda: atr_rust(self.candles, period))
+
+
+# fused implementations: they receive the indicator's arguments (with the defaults applied)
+# and return the sequential result, or None for the cases they don't cover
+
+def _sma(shared: _SharedSeries, period: int, source_type: str):
+    return shared.sma(source_type, period)
+
+
+def _ema(shared: _SharedSeries, period: int, source_type: str):
+    return shared.ema(source_type, period)
+
+
+def _atr(shared: _SharedSeries, period: int):
+    return shared.atr(period)
+
+
+def _supertrend(shared: _SharedSeries, period: int, factor: float):
+    from jesse.indicators.supertrend import SuperTrend, supertrend_fast
+
+    trend, changed = supertrend_fast(shared.candles, shared.atr(period), factor, period)
+    return SuperTrend(trend, changed)
+
+
+def _bollinger_bands(shared: _SharedSeries, period: int, devup: float, devdn: float, matype: int, devtype: int,
+                     source_type: str):
+    from jesse.indicators.bollinger_bands import BollingerBands
+
+    if matype != 0 or devtype != 0:
+        return None
+    return BollingerBands(*shared.bollinger_bands(source_type, period, devup, devdn))
+
+
+def _macd(shared: _SharedSeries, fast_period: int, slow_period: int, signal_period: int, source_type: str):
+    from jesse.indicators.macd import MACD
+
+    if len(shared.source(source_type)) == 0:
+        return None
+    macd_line = shared.ema(source_type, fast_period) - shared.ema(source_type, slow_period)
+    signal_line = ema_rust(macd_line, signal_period)
+    return MACD(macd_line, signal_line, macd_line - signal_line)
+
+
+_FUSED = {
+    'sma': _sma,
+    'ema': _ema,
+    'atr': _atr,
+    'supertrend': _supertrend,
+    'bollinger_bands': _bollinger_bands,
+    'macd': _macd,
+}
+
+
+def _parse_spec(spec: Spec) -> tuple:
+    if isinstance(spec, str):
+        return spec, {}
+    if isinstance(spec, dict):
+        spec = dict(spec)
+        return spec.pop('name'), spec
+    name, kwargs = spec
+    return name, dict(kwargs)
+
+
+@lru_cache
+def _indicator(name: str) -> tuple:
+    """
+    Returns the indicator function, the defaults of its arguments, and whether it accepts `sequential`
+    """
+    import jesse.indicators as ta
+
+    indicator = getattr(ta, name, None) if name not in ('batch', 'cross_section') else None
+    if not inspect.isfunction(indicator):
+        raise ValueError(f"Indicator '{name}' not found")
+
+    parameters = list(inspect.signature(indicator).parameters.values())[1:]
+    defaults = {p.name: p.default for p in parameters if p.name != 'sequential'}
+    return indicator, defaults, any(p.name == 'sequential' for p in parameters)
+
+
+def _last(result):
+    # the non-sequential value of a sequential result
+    if isinstance(result, tuple):
+        return type(result)(*(r[-1] for r in result))
+    return result[-1]
+
+
+def batch(candles: np.ndarray, specs: Iterable[Spec], sequential: bool = False) -> list:
+    """
+    Computes several indicators over the same candles at once. The candles are sliced and
+    their sources extracted once, and the intermediate series which the indicators have
+    in common (moving averages, ATR) are computed once.
+
+    Each spec is the name of an indicator, a (name, kwargs) tuple, or a dict with a "name"
+    key and the arguments, for example:
+
+        ema9, ema21, bb, st = ta.batch(candles, [
+            ('ema', {'period': 9}),
+            ('ema', {'period': 21}),
+            'bollinger_bands',
+            {'name': 'supertrend', 'period': 10, 'factor': 3},
+        ])
+
+    Indicators which have no fused implementation are computed by calling them normally.
+
+    :param candles: np.ndarray
+    :param specs: list of indicator specs
+    :param sequential: bool - default: False
+
+    :return: list of the indicators' results, in the order of specs
+    """
+    candles = slice_candles(candles, sequential)
+    shared = _SharedSeries(candles)
+
+    results = []
+    for spec in specs:
+        name, kwargs = _parse_spec(spec)
+        indicator, defaults, has_sequential = _indicator(name)
+        if 'sequential' in kwargs:
+            raise ValueError("Pass sequential to batch() instead of the indicator's spec")
+        unknown = kwargs.keys() - defaults.keys()
+        if unknown:
+            raise TypeError(f"{name}() got unexpected arguments: {', '.join(sorted(unknown))}")
+
+        if not has_sequential:
+            # such as hurst_exponent, which only returns the latest value
+            results.append(indicator(candles, **kwargs))
+            continue
+
+        result = _FUSED[name](shared, **{**defaults, **kwargs}) if name in _FUSED else None
+        if result is None:
+            result = indicator(candles, **kwargs, sequential=True)
+        results.append(result if sequential else _last(result))
+
+    return results
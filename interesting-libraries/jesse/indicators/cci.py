@@ -5,29 +5,91 @@ from numba import njit
 
 from jesse.helpers import slice_candles
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
+def _fenwick_add(counts, sums, index, count, value):
+    index += 1
+    while index < counts.shape[0]:
+        counts[index] += count
+        sums[index] += value
+        index += index & -index
+
+
+@njit(cache=True, nogil=True)
+def _fenwick_prefix(counts, sums, index):
+    count = 0
+    total = 0.0
+    while index > 0:
+        count += counts[index]
+        total += sums[index]
+        index -= index & -index
+    return count, total
+
+
+@njit(cache=True, nogil=True)
 def calculate_cci_loop(tp, period):
+    """
+    The mean deviation of each window comes from the count and the sum of its values
+    which are below its mean:
+
+        sum(|tp - sma|) = sum(tp) - 2 * sum(tp < sma) + sma * (2 * count(tp < sma) - period)
+
+    The window's values are kept in Fenwick trees indexed by their rank in the whole series,
+    so that each window costs O(log n) instead of O(period). Nearly flat windows, for which
+    the formula cancels badly, are computed directly.
+    """
     n = tp.shape[0]
-    result = np.empty(n)
-    # initialize result with NaNs
-    for i in range(n):
-        result[i] = np.nan
+    result = np.full(n, np.nan)
     if n < period:
         return result
-    for i in range(period - 1, n):
-        sum_tp = 0.0
-        for j in range(i - period + 1, i + 1):
-            sum_tp += tp[j]
-        sma = sum_tp / period
-        sum_diff = 0.0
-        for j in range(i - period + 1, i + 1):
-            # Calculate absolute deviation
-            if tp[j] >= sma:
-                sum_diff += tp[j] - sma
+
+    order = np.argsort(tp)
+    sorted_tp = tp[order]
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = np.arange(n)
+    counts = np.zeros(n + 1, dtype=np.int64)
+    sums = np.zeros(n + 1)
+
+    total = 0.0
+    # a window containing NaNs is NaN
+    nans = 0
+    for i in range(n):
+        if np.isnan(tp[i]):
+            nans += 1
+        else:
+            _fenwick_add(counts, sums, ranks[i], 1, tp[i])
+        if i >= period:
+            if np.isnan(tp[i - period]):
+                nans -= 1
             else:
-                sum_diff += sma - tp[j]
-        md = sum_diff / period
-        if md == 0.0:
+                _fenwick_add(counts, sums, ranks[i - period], -1, -tp[i - period])
+        if i < period - 1:
+            continue
+
+        # the running sum is recomputed every `period` values so that the rounding errors don't add up
+        if (i - period + 1) % period == 0:
+            total = 0.0
+            for j in range(i - period + 1, i + 1):
+                if not np.isnan(tp[j]):
+                    total += tp[j]
+        else:
+            if not np.isnan(tp[i]):
+                total += tp[i]
+            if not np.isnan(tp[i - period]):
+                total -= tp[i - period]
+        if nans:
+            continue
+
+        sma = total / period
+        count_below, sum_below = _fenwick_prefix(counts, sums, np.searchsorted(sorted_tp, sma))
+        md = (total - 2 * sum_below + sma * (2 * count_below - period)) / period
+        # the formula above cancels badly when the window is (nearly) flat, so then it's computed directly
+        if md <= 1e-6 * abs(sma):
+            md = 0.0
+            for j in range(i - period + 1, i + 1):
+                md += abs(tp[j] - sma)
+            md /= period
+        # a flat window, apart from the rounding errors of its mean
+        if md <= 1e-12 * abs(sma):
             result[i] = 0.0
         else:
             result[i] = (tp[i] - sma) / (0.015 * md)
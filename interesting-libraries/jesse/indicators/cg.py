@@ -26,7 +26,7 @@ def cg(candles: np.ndarray, period: int = 10, source_type: str = "close", sequen
     return same_length(candles, res) if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def go_fast(source, period):  # Function is compiled to machine code when called the first time
     res = np.full_like(source, fill_value=np.nan)
     for i in range(source.size):
@@ -4,7 +4,7 @@ from numba import njit
 
 from jesse.helpers import get_candle_source, slice_candles
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _cmo_numba(source: np.ndarray, period: int) -> np.ndarray:
     n = source.shape[0]
     result = np.empty(n, dtype=np.float64)
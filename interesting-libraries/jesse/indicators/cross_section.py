@@ -0,0 +1,261 @@
+from collections import namedtuple
+
+import numpy as np
+from numba import njit
+
+from jesse.helpers import get_candle_source, get_config
+from jesse.indicators.batch import _indicator
+
+# starts: the first index of each symbol's candles inside the stack (the rows before it are NaN padding)
+_Stack = namedtuple('_Stack', ['candles', 'starts'])
+
+
+def _source(stack: _Stack, source_type: str) -> np.ndarray:
+    candles = stack.candles
+    return get_candle_source(candles.reshape(-1, 6), source_type).reshape(candles.shape[:2])
+
+
+@njit(cache=True, nogil=True)
+def _sma_2d(source, starts, period):
+    n, t = source.shape
+    res = np.full((n, t), np.nan)
+    for s in range(n):
+        total = 0.0
+        for i in range(starts[s] + period - 1, t):
+            # the running sum is recomputed every `period` values so that the rounding errors don't add up
+            if (i - starts[s] - period + 1) % period == 0:
+                total = 0.0
+                for j in range(i - period + 1, i + 1):
+                    total += source[s, j]
+            else:
+                total += source[s, i] - source[s, i - period]
+            res[s, i] = total / period
+    return res
+
+
+@njit(cache=True, nogil=True)
+def _std_2d(source, starts, period):
+    # population standard deviation of each window, with a rolling update of the mean and of
+    # the sum of the squared deviations (recomputed every `period` values)
+    n, t = source.shape
+    res = np.full((n, t), np.nan)
+    for s in range(n):
+        mean = 0.0
+        m2 = 0.0
+        for i in range(starts[s] + period - 1, t):
+            if (i - starts[s] - period + 1) % period == 0:
+                mean = 0.0
+                for j in range(i - period + 1, i + 1):
+                    mean += source[s, j]
+                mean /= period
+                m2 = 0.0
+                for j in range(i - period + 1, i + 1):
+                    m2 += (source[s, j] - mean) ** 2
+            else:
+                new = source[s, i]
+                old = source[s, i - period]
+                previous_mean = mean
+                mean += (new - old) / period
+                m2 += (new - old) * (new - mean + old - previous_mean)
+            res[s, i] = np.sqrt(max(m2, 0.0) / period)
+    return res
+
+
+@njit(cache=True, nogil=True)
+def _ema_2d(source, starts, period):
+    n, t = source.shape
+    res = np.full((n, t), np.nan)
+    alpha = 2.0 / (period + 1)
+    for s in range(n):
+        if t - starts[s] < period:
+            continue
+        value = source[s, starts[s]]
+        res[s, starts[s]] = value
+        for i in range(starts[s] + 1, t):
+            value = alpha * source[s, i] + (1 - alpha) * value
+            res[s, i] = value
+    return res
+
+
+@njit(cache=True, nogil=True)
+def _rsi_2d(source, starts, period):
+    n, t = source.shape
+    res = np.full((n, t), np.nan)
+    for s in range(n):
+        start = starts[s]
+        if t - start <= period:
+            continue
+        gain = 0.0
+        loss = 0.0
+        for i in range(start + 1, start + period + 1):
+            change = source[s, i] - source[s, i - 1]
+            if change > 0:
+                gain += change
+            else:
+                loss -= change
+        gain /= period
+        loss /= period
+        for i in range(start + period, t):
+            if i > start + period:
+                change = source[s, i] - source[s, i - 1]
+                gain = (gain * (period - 1) + max(change, 0.0)) / period
+                loss = (loss * (period - 1) + max(-change, 0.0)) / period
+            res[s, i] = 100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)
+    return res
+
+
+@njit(cache=True, nogil=True)
+def _atr_2d(candles, starts, period):
+    n, t = candles.shape[0], candles.shape[1]
+    res = np.full((n, t), np.nan)
+    for s in range(n):
+        start = starts[s]
+        if t - start < period:
+            continue
+        value = 0.0
+        for i in range(start, t):
+            high = candles[s, i, 3]
+            low = candles[s, i, 4]
+            if i == start:
+                tr = high - low
+            else:
+                close = candles[s, i - 1, 2]
+                tr = max(high - low, abs(high - close), abs(low - close))
+            if i < start + period:
+                value += tr
+                if i == start + period - 1:
+                    value /= period
+                    res[s, i] = value
+            else:
+                value = (value * (period - 1) + tr) / period
+                res[s, i] = value
+    return res
+
+
+def _sma(stack: _Stack, period: int, source_type: str):
+    return _sma_2d(_source(stack, source_type), stack.starts, period)
+
+
+def _ema(stack: _Stack, period: int, source_type: str):
+    return _ema_2d(_source(stack, source_type), stack.starts, period)
+
+
+def _rsi(stack: _Stack, period: int, source_type: str):
+    return _rsi_2d(_source(stack, source_type), stack.starts, period)
+
+
+def _atr(stack: _Stack, period: int):
+    return _atr_2d(stack.candles, stack.starts, period)
+
+
+def _stddev(stack: _Stack, period: int, nbdev: float, source_type: str):
+    return _std_2d(_source(stack, source_type), stack.starts, period) * nbdev
+
+
+def _roc(stack: _Stack, period: int, source_type: str):
+    source = _source(stack, source_type)
+    res = np.full(source.shape, np.nan)
+    res[:, period:] = (source[:, period:] / source[:, :-period] - 1) * 100
+    return res
+
+
+def _bollinger_bands(stack: _Stack, period: int, devup: float, devdn: float, matype: int, devtype: int,
+                     source_type: str):
+    from jesse.indicators.bollinger_bands import BollingerBands
+
+    if matype != 0 or devtype != 0:
+        return None
+    source = _source(stack, source_type)
+    middlebands = _sma_2d(source, stack.starts, period)
+    dev = _std_2d(source, stack.starts, period)
+    return BollingerBands(middlebands + devup * dev, middlebands, middlebands - devdn * dev)
+
+
+def _macd(stack: _Stack, fast_period: int, slow_period: int, signal_period: int, source_type: str):
+    from jesse.indicators.macd import MACD
+
+    source = _source(stack, source_type)
+    macd_line = _ema_2d(source, stack.starts, fast_period) - _ema_2d(source, stack.starts, slow_period)
+    signal_line = _ema_2d(macd_line, stack.starts, signal_period)
+    return MACD(macd_line, signal_line, macd_line - signal_line)
+
+
+# indicators computed for all of the symbols in one call; the others are called for each symbol
+_VECTORIZED = {
+    'sma': _sma,
+    'ema': _ema,
+    'rsi': _rsi,
+    'atr': _atr,
+    'stddev': _stddev,
+    'roc': _roc,
+    'bollinger_bands': _bollinger_bands,
+    'macd': _macd,
+}
+
+
+def _starts(candles: np.ndarray) -> np.ndarray:
+    has_candle = ~np.isnan(candles[:, :, 2])
+    starts = np.argmax(has_candle, axis=1)
+    starts[~has_candle.any(axis=1)] = candles.shape[1]
+    return starts
+
+
+def _pad(result, length: int):
+    # left pads the result of one symbol with NaNs to the length of the stack
+    if isinstance(result, tuple):
+        return type(result)(*(_pad(r, length) for r in result))
+    return np.concatenate((np.full(length - len(result), np.nan), result))
+
+
+def _split(result, sequential: bool) -> list:
+    # (symbols, length) arrays into the result of each symbol
+    if isinstance(result, tuple):
+        return [type(result)(*fields) for fields in zip(*(_split(r, sequential) for r in result))]
+    return [row if sequential else row[-1] for row in result]
+
+
+def cross_section(candles: np.ndarray, name: str, sequential: bool = False, **kwargs) -> list:
+    """
+    Computes an indicator for several symbols at once, from their candles stacked into a
+    (symbols, candles, 6) array such as the one that Strategy.get_candles_stack() returns.
+
+    sma, ema, rsi, atr, stddev, roc, bollinger_bands (with the default matype and devtype)
+    and macd are computed for all of the symbols in one call. The other indicators are
+    called for each symbol.
+
+    Example:
+        stack = self.get_candles_stack(self.exchange, symbols, '1h')
+        for symbol, rsi in zip(symbols, ta.cross_section(stack, 'rsi', period=14)):
+            ...
+
+    :param candles: np.ndarray - (symbols, candles, 6)
+    :param name: str - the indicator's name
+    :param sequential: bool - default: False
+    :param kwargs: the indicator's parameters
+
+    :return: list of the results of each symbol, in the order of the stack
+    """
+    if len(candles.shape) != 3:
+        raise ValueError('candles must be a (symbols, candles, 6) array')
+    indicator, defaults, has_sequential = _indicator(name)
+    unknown = kwargs.keys() - defaults.keys()
+    if unknown:
+        raise TypeError(f"{name}() got unexpected arguments: {', '.join(sorted(unknown))}")
+
+    if not sequential:
+        candles = candles[:, -get_config('env.data.warmup_candles_num', 240):]
+    stack = _Stack(candles, _starts(candles))
+
+    result = _VECTORIZED[name](stack, **{**defaults, **kwargs}) if name in _VECTORIZED else None
+    if result is not None:
+        return _split(result, sequential)
+
+    results = []
+    for symbol_candles, start in zip(candles, stack.starts):
+        symbol_candles = symbol_candles[start:]
+        # indicators without the sequential parameter (such as hurst_exponent) only return the latest value
+        if sequential and has_sequential:
+            results.append(_pad(indicator(symbol_candles, **kwargs, sequential=True), candles.shape[1]))
+        else:
+            results.append(indicator(symbol_candles, **kwargs))
+    return results
@@ -31,15 +31,51 @@ def cwma(candles: np.ndarray, period: int = 14, source_type: str = "close", sequ
     return res if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def vpwma_fast(source, period):
+    """
+    The weight of each value of the window is (e + 2) ** 3 = e ** 3 + 6 * e ** 2 + 12 * e + 8,
+    where e is its position in the window (0 for the oldest one). So the weighted sum comes
+    from the running sums of the values times e ** 0..3 (n0..n3). When the window moves
+    forward every e decreases by one, which updates them in O(1). They are recomputed from
+    scratch every `length` values so that the rounding errors don't add up.
+    """
     newseries = np.copy(source)
+    length = period - 1
+    weightSum = 0.0
+    for e in range(length):
+        weightSum += (e + 2) ** 3
+
+    n0 = n1 = n2 = n3 = 0.0
+    # NaNs are added as zeros and counted; a window containing any of them is NaN
+    nans = 0
     for j in range(period + 1, source.shape[0]):
-        my_sum = 0.0
-        weightSum = 0.0
-        for i in range(period - 1):
-            weight = np.power(period - i, 3)
-            my_sum += (source[j - i] * weight)
-            weightSum += weight
-        newseries[j] = my_sum / weightSum
+        if (j - period - 1) % length == 0:
+            n0 = n1 = n2 = n3 = 0.0
+            nans = 0
+            for e in range(length):
+                value = source[j - length + 1 + e]
+                if np.isnan(value):
+                    nans += 1
+                else:
+                    n0 += value
+                    n1 += e * value
+                    n2 += e * e * value
+                    n3 += e * e * e * value
+        else:
+            new = source[j]
+            old = source[j - length]
+            if np.isnan(new):
+                nans += 1
+                new = 0.0
+            if np.isnan(old):
+                nans -= 1
+                old = 0.0
+            n0 -= old
+            n3 = n3 - 3 * n2 + 3 * n1 - n0 + (length - 1) ** 3 * new
+            n2 = n2 - 2 * n1 + n0 + (length - 1) ** 2 * new
+            n1 = n1 - n0 + (length - 1) * new
+            n0 += new
+
+        newseries[j] = np.nan if nans else (n3 + 6 * n2 + 12 * n1 + 8 * n0) / weightSum
     return newseries
@@ -12,7 +12,7 @@ except ImportError:  # pragma: no cover
     dema_rust = None  # type: ignore
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _ema(x: np.ndarray, period: int) -> np.ndarray:
     alpha = 2.0 / (period + 1)
     n = len(x)
@@ -5,7 +5,7 @@ from jesse.helpers import get_candle_source, same_length, slice_candles
 from jesse.indicators.sma import sma
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _dpo(source, period, sma):
     # Calculate the X/2 + 1 shift
     shift = period // 2 + 1
@@ -8,7 +8,7 @@ from jesse.helpers import slice_candles
 import jesse_rust as jr
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _ema(arr: np.ndarray, period: int) -> np.ndarray:
     """
     Compute the exponential moving average (EMA) using a simple for loop, accelerated with numba.
@@ -9,7 +9,7 @@ from numba import njit
 
 DX = namedtuple('DX', ['adx', 'plusDI', 'minusDI'])
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _fast_dm_tr(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> tuple:
     n = len(high)
     up = np.zeros(n)
@@ -30,7 +30,7 @@ def efi(candles: np.ndarray, period: int = 13, source_type: str = "close", seque
     return res_with_nan if sequential else res_with_nan[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def efi_fast(source, volume):
     dif = np.zeros(source.size - 1)
     for i in range(1, source.size):
@@ -38,7 +38,7 @@ def efi_fast(source, volume):
     return dif
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def ema(data: np.ndarray, period: int) -> np.ndarray:
     n = data.shape[0]
     # Initialize output array and fill with NaN
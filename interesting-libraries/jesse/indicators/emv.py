@@ -5,7 +5,7 @@ from jesse.helpers import same_length, slice_candles
 from jesse.indicators import sma
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _emv(high: np.ndarray, low: np.ndarray, volume: np.ndarray, length, div) -> np.ndarray:
     hl2 = (high + low) / 2
 
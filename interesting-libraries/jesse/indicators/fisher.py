@@ -6,7 +6,7 @@ from jesse.helpers import same_length, slice_candles
 FisherTransform = namedtuple('FisherTransform', ['fisher', 'signal'])
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _fisher_transform(high: np.ndarray, low: np.ndarray, period: int) -> tuple:
     """
     Numba-optimized implementation of Fisher Transform
@@ -4,7 +4,7 @@ from jesse.helpers import get_candle_source, same_length, slice_candles
 from numba import njit
 
 
-@njit
+@njit(cache=True, nogil=True)
 def linear_regression_line(x, y):
     n = len(x)
     sum_x = np.sum(x)
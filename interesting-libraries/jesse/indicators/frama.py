@@ -36,7 +36,7 @@ def frama(candles: np.ndarray, window: int = 10, FC: int = 1, SC: int = 300, seq
         return res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def frame_fast(candles, n, SC, FC):
     w = np.log(2.0 / (SC + 1))
 
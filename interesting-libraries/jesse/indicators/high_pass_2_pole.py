@@ -34,7 +34,7 @@ def high_pass_2_pole(candles: np.ndarray, period: int = 48, source_type: str = "
         return None if np.isnan(hpf[-1]) else hpf[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def high_pass_2_pole_fast(source, period, K=0.707):  # Function is compiled to machine code when called the first time
     alpha = 1 + (np.sin(2 * np.pi * K / period) - 1) / np.cos(2 * np.pi * K / period)
     newseries = np.copy(source)
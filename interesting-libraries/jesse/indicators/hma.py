@@ -4,16 +4,50 @@ from numba import njit
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _wma(arr: np.ndarray, period: int) -> np.ndarray:
     """
     Weighted Moving Average - optimized with Numba
+
+    Uses running sums: when the window moves forward, the weighted sum loses the plain sum of
+    the previous window and gains period * the new value. Both sums are recomputed from scratch
+    every `period` values so that the rounding errors don't add up.
     """
-    weights = np.arange(1, period + 1)
+    n = len(arr)
     wma = np.zeros_like(arr)
+    weights_sum = period * (period + 1) / 2
+
+    total = 0.0
+    weighted = 0.0
+    # NaNs are added as zeros and counted; a window containing any of them is NaN
+    nans = 0
+    for i in range(period - 1, n):
+        if (i - period + 1) % period == 0:
+            total = 0.0
+            weighted = 0.0
+            nans = 0
+            for k in range(period):
+                value = arr[i - period + 1 + k]
+                if np.isnan(value):
+                    nans += 1
+                else:
+                    total += value
+                    weighted += (k + 1) * value
+        else:
+            new = arr[i]
+            old = arr[i - period]
+            weighted -= total
+            if np.isnan(new):
+                nans += 1
+            else:
+                weighted += period * new
+                total += new
+            if np.isnan(old):
+                nans -= 1
+            else:
+                total -= old
 
-    for i in range(period - 1, len(arr)):
-        wma[i] = np.sum(arr[i - period + 1:i + 1] * weights) / np.sum(weights)
+        wma[i] = np.nan if nans else weighted / weights_sum
 
     return wma
 
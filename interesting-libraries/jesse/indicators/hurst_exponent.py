@@ -1,6 +1,5 @@
 import numpy as np
 from numba import njit
-from scipy import signal
 
 from jesse.helpers import get_candle_source, slice_candles
 
@@ -37,7 +36,7 @@ def hurst_exponent(candles: np.ndarray, min_chunksize: int = 8, max_chunksize: i
     return None if np.isnan(h) else h
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def hurst_rs(x, min_chunksize, max_chunksize, num_chunksize):
     """Estimate the Hurst exponent using R/S method.
     Estimates the Hurst (H) exponent using the R/S method from the time series.
@@ -141,6 +140,8 @@ def hurst_dma(prices, min_chunksize=8, max_chunksize=200, num_chunksize=5):
     197. https://dx.doi.org/10.1140/epjb/e20020150
 
     """
+    from scipy import signal
+
     max_chunksize += 1
     N = len(prices)
     n_list = np.arange(min_chunksize, max_chunksize, num_chunksize, dtype=np.int64)
@@ -188,6 +189,8 @@ def hurst_dsod(x):
     This hurst_ets is data literal traduction of wfbmesti.m of waveleet toolbox
     from matlab.
     """
+    from scipy import signal
+
     y = np.cumsum(np.diff(x, axis=0), axis=0)
 
     # second order derivative
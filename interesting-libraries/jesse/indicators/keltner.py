@@ -7,7 +7,7 @@ from jesse.indicators.ma import ma
 KeltnerChannel = namedtuple('KeltnerChannel', ['upperband', 'middleband', 'lowerband'])
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
     """
     Calculate ATR using Numba
@@ -37,7 +37,7 @@ def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> n
     return atr_vals
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _calculate_keltner(source: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, 
                       ma_values: np.ndarray, period: int, multiplier: float) -> tuple:
     """
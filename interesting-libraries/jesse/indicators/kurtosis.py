@@ -2,7 +2,6 @@ from typing import Union
 
 import numpy as np
 from numpy.lib.stride_tricks import sliding_window_view
-from scipy import stats
 
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
@@ -22,6 +21,7 @@ def kurtosis(candles: np.ndarray, period: int = 5, source_type: str = "hl2", seq
     candles = slice_candles(candles, sequential)
 
     source = get_candle_source(candles, source_type=source_type)
+    from scipy import stats
     swv = sliding_window_view(source, window_shape=period)
     kurtosis_val = stats.kurtosis(swv, axis=-1)
     res = same_length(source, kurtosis_val)
@@ -6,20 +6,61 @@ from numba import njit
 from jesse.helpers import get_candle_source, slice_candles
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _fast_linearreg(source: np.ndarray, period: int) -> np.ndarray:
+    """
+    The end point of the least squares line of each window, from the running sums of the
+    window's values (S_y) and of its values weighted by their index (S_iy):
+
+        S_xy = S_iy - mean_x * S_y
+
+    When the window moves forward, S_iy loses S_y without the dropped value and gains
+    (period - 1) * the new value. Both sums are recomputed from scratch every `period`
+    values so that the rounding errors don't add up.
+    """
     n = len(source)
     result = np.full(n, np.nan)
-    x = np.arange(period)
+    if period < 2:
+        return result
+
     mean_x = (period - 1) / 2.0
-    S_xx = np.sum((x - mean_x) ** 2)
-    
-    for i in range(n - period + 1):
-        window = source[i:i+period]
-        mean_y = np.mean(window)
-        S_xy = np.sum((window - mean_y) * (x - mean_x))
-        result[i + period - 1] = mean_y + ((period - 1) / 2.0) * (S_xy / S_xx)
-    
+    S_xx = period * (period * period - 1) / 12.0
+
+    S_y = 0.0
+    S_iy = 0.0
+    # NaNs are added as zeros and counted; a window containing any of them is NaN
+    nans = 0
+    for i in range(period - 1, n):
+        if (i - period + 1) % period == 0:
+            S_y = 0.0
+            S_iy = 0.0
+            nans = 0
+            for k in range(period):
+                value = source[i - period + 1 + k]
+                if np.isnan(value):
+                    nans += 1
+                else:
+                    S_y += value
+                    S_iy += k * value
+        else:
+            new = source[i]
+            old = source[i - period]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                S_y -= old
+            S_iy -= S_y
+            if np.isnan(new):
+                nans += 1
+            else:
+                S_iy += (period - 1) * new
+                S_y += new
+
+        if nans == 0:
+            mean_y = S_y / period
+            S_xy = S_iy - mean_x * S_y
+            result[i] = mean_y + mean_x * (S_xy / S_xx)
+
     return result
 
 
@@ -41,21 +82,6 @@ def linearreg(candles: np.ndarray, period: int = 14, source_type: str = "close",
         candles = slice_candles(candles, sequential)
         source = get_candle_source(candles, source_type=source_type)
 
-    n = len(source)
-    if n >= period:
-        try:
-            from numpy.lib.stride_tricks import sliding_window_view
-            windows = sliding_window_view(source, window_shape=period)  # shape (n - period + 1, period)
-            mean_y = np.mean(windows, axis=1)
-            x = np.arange(period)
-            mean_x = (period - 1) / 2.0
-            S_xx = np.sum((x - mean_x) ** 2)
-            S_xy = np.sum((windows - mean_y[:, None]) * (x - mean_x), axis=1)
-            result = np.full(n, np.nan)
-            result[period-1:] = mean_y + ((period - 1) / 2.0) * (S_xy / S_xx)
-        except ImportError:
-            result = _fast_linearreg(source, period)
-    else:
-        result = np.full(n, np.nan)
+    result = _fast_linearreg(source, period)
 
     return result if sequential else result[-1]
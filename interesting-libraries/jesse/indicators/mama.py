@@ -43,7 +43,7 @@ def mama(candles: np.ndarray, fastlimit: float = 0.5, slowlimit: float = 0.05, s
     else:
         return MAMA(mama_arr[-1], fama_arr[-1])
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def fast_mama(source, fastlimit, slowlimit):
     n = len(source)
     sp = np.zeros(n)
@@ -39,7 +39,7 @@ def mass(candles: np.ndarray, period: int = 5, sequential: bool = False) -> Unio
     return same_length(candles, res) if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def mass_sum(ratio: np.ndarray, period: int) -> np.ndarray:
     """Calculate the sum of the ratio over the specified period"""
     result = np.zeros_like(ratio)
@@ -48,7 +48,7 @@ def mass_sum(ratio: np.ndarray, period: int) -> np.ndarray:
     return result
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def calc_ema(data, n):
     alpha = 2.0 / (n + 1)
     result = np.empty(data.shape[0])
@@ -33,7 +33,7 @@ def mcginley_dynamic(candles: np.ndarray, period: int = 10, k: float = 0.6, sour
     return mg if sequential else mg[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def md_fast(source, k, period):
     mg = np.full_like(source, np.nan)
     for i in range(source.size):
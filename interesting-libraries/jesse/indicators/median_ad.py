@@ -2,7 +2,6 @@ from typing import Union
 
 import numpy as np
 from numpy.lib.stride_tricks import sliding_window_view
-from scipy import stats
 
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
@@ -26,6 +25,7 @@ def median_ad(candles: np.ndarray, period: int = 5, source_type: str = "hl2", se
       candles = slice_candles(candles, sequential)
       source = get_candle_source(candles, source_type=source_type)
 
+    from scipy import stats
     swv = sliding_window_view(source, window_shape=period)
     median_abs_deviation = stats.median_abs_deviation(swv, axis=-1)
     res = same_length(source, median_abs_deviation)
@@ -1,7 +1,6 @@
 from collections import namedtuple
 
 import numpy as np
-from scipy.signal import argrelextrema
 
 from jesse.helpers import np_ffill, slice_candles
 
@@ -23,6 +22,7 @@ def minmax(candles: np.ndarray, order: int = 3, sequential: bool = False) -> EXT
     low = candles[:, 4]
     high = candles[:, 3]
 
+    from scipy.signal import argrelextrema
     minimaIdxs = argrelextrema(low, np.less, order=order, axis=0)
     maximaIdxs = argrelextrema(high, np.greater, order=order, axis=0)
 
@@ -6,7 +6,7 @@ from numba import njit
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _nvi_fast(source: np.ndarray, volume: np.ndarray) -> np.ndarray:
     res = np.ones_like(source)
     res[0] = 1000  # Starting value (conventional)
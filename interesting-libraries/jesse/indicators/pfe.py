@@ -5,7 +5,7 @@ import numpy as np
 from numba import njit
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def numpy_ema(data: np.ndarray, period: int) -> np.ndarray:
     alpha = 2 / (period + 1)
     # Initialize the EMA with the first value
@@ -3,7 +3,7 @@ from operator import mul
 from typing import Union
 
 import numpy as np
-from numpy.lib.stride_tricks import sliding_window_view
+from numba import njit
 
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
@@ -29,12 +29,25 @@ def pwma(candles: np.ndarray, period: int = 5, source_type: str = "close", seque
         source = get_candle_source(candles, source_type=source_type)
 
     triangle = pascals_triangle(n=period - 1)
-    swv = sliding_window_view(source, window_shape=period)
-    res = np.average(swv, weights=triangle, axis=-1)
+    res = pwma_fast(source, triangle.astype(np.float64))
 
     return same_length(candles, res) if sequential else res[-1]
 
 
+@njit(cache=True, nogil=True)
+def pwma_fast(source, weights):
+    # the binomial weights have no running-sum recurrence, but the loop over the windows
+    # doesn't allocate them the way np.average over a sliding_window_view does
+    period = weights.shape[0]
+    res = np.empty(source.shape[0] - period + 1)
+    for j in range(res.shape[0]):
+        my_sum = 0.0
+        for i in range(period):
+            my_sum += source[j + i] * weights[i]
+        res[j] = my_sum
+    return res
+
+
 def pascals_triangle(n: int = None) -> np.ndarray:
     """Pascal's Triangle
     Returns a numpy array of the nth row of Pascal's Triangle.
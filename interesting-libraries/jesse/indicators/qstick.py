@@ -6,7 +6,7 @@ from numba import njit
 from jesse.helpers import same_length, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _qstick_fast(open_prices: np.ndarray, close_prices: np.ndarray, period: int) -> np.ndarray:
     """
     Calculate QStick values using Numba for optimization
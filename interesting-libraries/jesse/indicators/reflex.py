@@ -37,7 +37,7 @@ def reflex(candles: np.ndarray, period: int = 20, source_type: str = "close", se
         return None if np.isnan(rf[-1]) else rf[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def reflex_fast(ssf, period):
     rf = np.full_like(ssf, 0)
     ms = np.full_like(ssf, 0)
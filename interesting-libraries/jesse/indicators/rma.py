@@ -34,7 +34,7 @@ def rma(candles: np.ndarray, length: int = 14, source_type="close", sequential=F
     return res if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def rma_fast(source, _length):
     alpha = 1 / _length
     newseries = np.copy(source)
@@ -4,7 +4,7 @@ import numpy as np
 from numba import njit
 from jesse.helpers import np_shift, slice_candles
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def wilder_smoothing_numba(raw: np.ndarray, period: int) -> np.ndarray:
     smoothed = np.zeros_like(raw)
     alpha = 1 - 1/period
@@ -13,7 +13,7 @@ def wilder_smoothing_numba(raw: np.ndarray, period: int) -> np.ndarray:
         smoothed[i] = alpha * smoothed[i-1] + raw[i]
     return smoothed
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def rolling_max_numba(arr: np.ndarray, window: int) -> np.ndarray:
     n = len(arr)
     result = np.empty_like(arr)
@@ -28,7 +28,7 @@ def rolling_max_numba(arr: np.ndarray, window: int) -> np.ndarray:
     
     return result
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def rolling_min_numba(arr: np.ndarray, window: int) -> np.ndarray:
     n = len(arr)
     result = np.empty_like(arr)
@@ -32,7 +32,7 @@ def sar(candles: np.ndarray, acceleration: float = 0.02, maximum: float = 0.2, s
     return sar_values if sequential else sar_values[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def _fast_sar(high, low, acceleration, maximum, n):
     sar_values = np.zeros(n)
     if high[1] > high[0]:
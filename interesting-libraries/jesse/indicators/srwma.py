@@ -31,15 +31,16 @@ def srwma(candles: np.ndarray, period: int = 14, source_type: str = "close", seq
     return res if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def srwma_fast(source, period):
+    # the square roots have no running-sum recurrence like the integer powers of cwma and
+    # sqwma, so only the weights are computed once instead of for each window
     newseries = np.copy(source)
+    weights = np.sqrt(period - np.arange(period - 1))
+    weightSum = np.sum(weights)
     for j in range(period + 1, source.shape[0]):
         my_sum = 0.0
-        weightSum = 0.0
         for i in range(period - 1):
-            weight = np.power(period - i, 0.5)
-            my_sum += (source[j - i] * weight)
-            weightSum += weight
+            my_sum += source[j - i] * weights[i]
         newseries[j] = my_sum / weightSum
     return newseries
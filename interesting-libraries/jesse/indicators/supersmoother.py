@@ -33,7 +33,7 @@ def supersmoother(candles: np.ndarray, period: int = 14, source_type: str = "clo
     return res if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def supersmoother_fast(source, period):
     a = np.exp(-1.414 * np.pi / period)
     b = 2 * a * np.cos(1.414 * np.pi / period)
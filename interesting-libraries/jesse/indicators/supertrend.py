@@ -26,7 +26,7 @@ def supertrend(candles: np.ndarray, period: int = 10, factor: float = 3, sequent
         return SuperTrend(super_trend[-1], changed[-1])
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def atr_loop(high, low, close, period):
     n = len(close)
     tr = np.empty(n, dtype=np.float64)
@@ -58,7 +58,7 @@ def atr_loop(high, low, close, period):
     return atr
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def supertrend_fast(candles, atr, factor, period):
     n = len(candles)
     super_trend = np.zeros(n, dtype=np.float64)
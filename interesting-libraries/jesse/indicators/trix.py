@@ -6,7 +6,7 @@ from numba import njit
 from jesse.helpers import get_candle_source, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _ema_numba(data, period):
     N = len(data)
     result = np.empty(N, dtype=np.float64)
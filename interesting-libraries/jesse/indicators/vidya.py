@@ -4,7 +4,7 @@ from numba import njit
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def vidya_numba(source: np.ndarray, length: int, fix_cmo: bool, select: bool) -> np.ndarray:
     alpha = 2 / (length + 1)
     momm = np.zeros_like(source)
@@ -32,7 +32,7 @@ def vpwma(candles: np.ndarray, period: int = 14, power: float = 0.382, source_ty
     return res if sequential else res[-1]
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def vpwma_fast(source, period, power):
     newseries = np.copy(source)
     for j in range(period + 1, source.shape[0]):
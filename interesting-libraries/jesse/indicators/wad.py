@@ -6,7 +6,7 @@ from numba import njit
 from jesse.helpers import same_length, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _wad_numba(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
     n = len(close)
     ad = np.zeros(n, dtype=np.float64)
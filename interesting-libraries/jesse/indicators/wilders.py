@@ -6,7 +6,7 @@ from numba import njit
 from jesse.helpers import get_candle_source, same_length, slice_candles
 
 
-@njit
+@njit(cache=True, nogil=True)
 def _wilders_fast(source: np.ndarray, period: int) -> np.ndarray:
     # Pre-allocate the output array
     res = np.zeros_like(source)
@@ -1 +1,2 @@
 from .dynamic_numpy_array import DynamicNumpyArray
+from .trade_aggregator import TradeAggregator
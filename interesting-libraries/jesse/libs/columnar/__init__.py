@@ -0,0 +1,95 @@
+"""
+A small binary format for sending typed arrays (candles, line charts, ...) to
+the dashboard without turning every value into JSON text:
+
+    b'JCOL' | uint32 header length | JSON header | buffers
+
+The header is the original object in which every numpy array has been replaced
+by {"__array__": offset, "dtype": "<f8", "shape": [n]}. The offset points to the
+array's raw little-endian bytes inside the buffers section. The header and every
+buffer are padded to 8 bytes, so a JavaScript client can create TypedArray
+views (Float64Array, Uint32Array, ...) on the received ArrayBuffer without copying.
+"""
+import struct
+
+import numpy as np
+import simplejson as json
+
+from jesse.libs.custom_json import NpEncoder
+
+MAGIC = b'JCOL'
+_PREFIX = struct.Struct('<4sI')
+
+
+def _padding(n: int) -> int:
+    return -n % 8
+
+
+def encode(obj) -> bytes:
+    buffers = []
+    offset = 0
+
+    def replace_arrays(o):
+        nonlocal offset
+        if isinstance(o, np.ndarray):
+            arr = np.ascontiguousarray(o)
+            arr = arr.astype(arr.dtype.newbyteorder('<'), copy=False)
+            ref = {'__array__': offset, 'dtype': arr.dtype.str, 'shape': list(arr.shape)}
+            data = arr.tobytes()
+            buffers.append(data)
+            buffers.append(b'\0' * _padding(len(data)))
+            offset += len(data) + _padding(len(data))
+            return ref
+        if isinstance(o, dict):
+            return {k: replace_arrays(v) for k, v in o.items()}
+        if isinstance(o, (list, tuple)):
+            return [replace_arrays(v) for v in o]
+        return o
+
+    header = json.dumps(replace_arrays(obj), ignore_nan=True, cls=NpEncoder).encode('utf-8')
+    # pad the header with spaces which are valid JSON whitespace
+    header += b' ' * _padding(_PREFIX.size + len(header))
+    return b''.join([_PREFIX.pack(MAGIC, len(header)), header, *buffers])
+
+
+def is_encoded(message) -> bool:
+    return isinstance(message, (bytes, bytearray, memoryview)) and bytes(message[:4]) == MAGIC
+
+
+def decode_header(message: bytes) -> tuple:
+    """
+    Returns (header, buffers) without touching the arrays' data
+    """
+    magic, header_length = _PREFIX.unpack_from(message)
+    if magic != MAGIC:
+        raise ValueError('Not a columnar message')
+    start = _PREFIX.size
+    header = json.loads(bytes(message[start:start + header_length]).decode('utf-8'))
+    return header, memoryview(message)[start + header_length:]
+
+
+def encode_with_header(header, buffers) -> bytes:
+    """
+    Re-encodes a message returned by decode_header() after its header has been
+    modified (without re-encoding the arrays)
+    """
+    header = json.dumps(header, ignore_nan=True, cls=NpEncoder).encode('utf-8')
+    header += b' ' * _padding(_PREFIX.size + len(header))
+    return b''.join([_PREFIX.pack(MAGIC, len(header)), header, buffers])
+
+
+def decode(message: bytes):
+    header, buffers = decode_header(message)
+
+    def restore_arrays(o):
+        if isinstance(o, dict):
+            if '__array__' in o:
+                dtype = np.dtype(o['dtype'])
+                count = int(np.prod(o['shape']))
+                return np.frombuffer(buffers, dtype, count, o['__array__']).reshape(o['shape'])
+            return {k: restore_arrays(v) for k, v in o.items()}
+        if isinstance(o, list):
+            return [restore_arrays(v) for v in o]
+        return o
+
+    return restore_arrays(header)
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class TradeAggregator:
+    """
+    Running aggregates of a stream of trades, kept in plain scalars so that adding
+    a trade doesn't allocate any arrays: OHLCV, VWAP, and buy/sell quantities and counts.
+
+    It can continue an existing candle (for example the forming candle of the store) in
+    which case the candle's open, high, low and volume are the starting values.
+    """
+    __slots__ = (
+        'timestamp', 'open', 'close', 'high', 'low', 'volume', 'price_volume', 'qty',
+        'buy_qty', 'sell_qty', 'buy_count', 'sell_count'
+    )
+
+    def __init__(self, candle: np.ndarray = None) -> None:
+        self.reset(candle)
+
+    def reset(self, candle: np.ndarray = None) -> None:
+        if candle is None:
+            self.timestamp = None
+            self.open = self.close = np.nan
+            self.high = -np.inf
+            self.low = np.inf
+            self.volume = 0.0
+        else:
+            self.timestamp, self.open, self.close, self.high, self.low, self.volume = (float(v) for v in candle)
+
+        self.price_volume = 0.0
+        self.qty = 0.0
+        self.buy_qty = 0.0
+        self.sell_qty = 0.0
+        self.buy_count = 0
+        self.sell_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.buy_count + self.sell_count
+
+    @property
+    def vwap(self) -> float:
+        return self.price_volume / self.qty if self.qty else np.nan
+
+    def add(self, timestamp: float, price: float, qty: float, is_buy: bool = True) -> None:
+        if self.timestamp is None:
+            self.timestamp = timestamp
+        # the first trade of a new aggregation (NaN != NaN)
+        if self.open != self.open:
+            self.open = price
+
+        self.close = price
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.volume += qty
+        self.price_volume += price * qty
+        self.qty += qty
+
+        if is_buy:
+            self.buy_qty += qty
+            self.buy_count += 1
+        else:
+            self.sell_qty += qty
+            self.sell_count += 1
+
+    def to_trade(self) -> np.ndarray:
+        """
+        [timestamp, price (VWAP), buy_qty, sell_qty, buy_count, sell_count]
+        """
+        return np.array([
+            self.timestamp, self.vwap, self.buy_qty, self.sell_qty, self.buy_count, self.sell_count
+        ])
+
+    def to_candle(self) -> np.ndarray:
+        """
+        [timestamp, open, close, high, low, volume]
+        """
+        return np.array([self.timestamp, self.open, self.close, self.high, self.low, self.volume])
@@ -77,6 +77,50 @@ def store_candle_into_db(exchange: str, symbol: str, timeframe: str, candle: np.
     else:
         raise Exception(f'Unknown on_conflict value: {on_conflict}')
 
+    # keep the materialized hourly and daily candles up to date
+    if timeframe == '1m':
+        from jesse.models.CandleAggregate import refresh_candle_aggregates
+        refresh_candle_aggregates(exchange, symbol, candle[0], candle[0])
+
+
+def store_candle_updates_into_db(candles: list) -> None:
+    """
+    Upserts a batch of (exchange, symbol, timeframe, candle) with one query. Used by the
+    write-behind buffer of live sessions (see jesse/services/candle_writer.py).
+    """
+    if not candles:
+        return
+
+    candles_list = [{
+        'id': jh.generate_unique_id(),
+        'exchange': exchange,
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'timestamp': candle[0],
+        'open': candle[1],
+        'high': candle[3],
+        'low': candle[4],
+        'close': candle[2],
+        'volume': candle[5]
+    } for exchange, symbol, timeframe, candle in candles]
+
+    Candle.insert_many(candles_list).on_conflict(
+        conflict_target=['exchange', 'symbol', 'timeframe', 'timestamp'],
+        preserve=(Candle.open, Candle.high, Candle.low, Candle.close, Candle.volume),
+    ).execute()
+
+    # keep the materialized hourly and daily candles up to date
+    from jesse.models.CandleAggregate import refresh_candle_aggregates
+    # (exchange, symbol) => the first and the last timestamps of the updated 1m candles
+    updated = {}
+    for exchange, symbol, timeframe, candle in candles:
+        if timeframe != '1m':
+            continue
+        first, last = updated.get((exchange, symbol), (candle[0], candle[0]))
+        updated[(exchange, symbol)] = (min(first, candle[0]), max(last, candle[0]))
+    for (exchange, symbol), (first, last) in updated.items():
+        refresh_candle_aggregates(exchange, symbol, first, last)
+
 
 def store_candles_into_db(exchange: str, symbol: str, timeframe: str, candles: np.ndarray, on_conflict='ignore') -> None:
     # make sure the number of candles is more than 0
@@ -112,6 +156,11 @@ def store_candles_into_db(exchange: str, symbol: str, timeframe: str, candles: n
     else:
         raise Exception(f'Unknown on_conflict value: {on_conflict}')
 
+    # keep the materialized hourly and daily candles up to date
+    if timeframe == '1m':
+        from jesse.models.CandleAggregate import refresh_candle_aggregates
+        refresh_candle_aggregates(exchange, symbol, candles[0][0], candles[-1][0])
+
 
 def fetch_candles_from_db(exchange: str, symbol: str, timeframe: str, start_date: int, finish_date: int) -> tuple:
     res = tuple(
@@ -0,0 +1,180 @@
+import arrow
+import numpy as np
+import peewee
+
+import jesse.helpers as jh
+from jesse.services.db import database
+
+
+if database.is_closed():
+    database.open_connection()
+
+# timeframes which are materialized from the stored 1m candles
+CANDLE_AGGREGATE_TIMEFRAMES = ('1h', '1D')
+
+
+class CandleAggregate(peewee.Model):
+    """
+    Materialized hourly and daily candles, generated from the stored 1m candles. Only
+    complete candles (made of all of their 1m candles) are stored.
+    """
+    id = peewee.UUIDField(primary_key=True)
+    timestamp = peewee.BigIntegerField()
+    open = peewee.FloatField()
+    close = peewee.FloatField()
+    high = peewee.FloatField()
+    low = peewee.FloatField()
+    volume = peewee.FloatField()
+    exchange = peewee.CharField()
+    symbol = peewee.CharField()
+    timeframe = peewee.CharField()
+
+    class Meta:
+        from jesse.services.db import database
+
+        database = database.db
+        indexes = (
+            (('exchange', 'symbol', 'timeframe', 'timestamp'), True),
+        )
+
+    def __init__(self, attributes: dict = None, **kwargs) -> None:
+        peewee.Model.__init__(self, attributes=attributes, **kwargs)
+
+        if attributes is None:
+            attributes = {}
+
+        for a, value in attributes.items():
+            setattr(self, a, value)
+
+
+# if database is open, create the table
+if database.is_open():
+    CandleAggregate.create_table()
+
+
+def aggregate_one_minute_candles(candles: np.ndarray, timeframe: str) -> np.ndarray:
+    """
+    Generates the candles of `timeframe` from sorted 1m candles. Buckets which
+    are not complete (at the edges, or because of missing 1m candles) are left out.
+    """
+    from jesse.services.candle import _resample_by_timestamp
+
+    aggregated, counts = _resample_by_timestamp(candles, timeframe)
+    return aggregated[counts == jh.timeframe_to_one_minutes(timeframe)]
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # #
+# # # # # # # # # DB FUNCTIONS # # # # # # # # #
+# # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+def store_candle_aggregates(exchange: str, symbol: str, timeframe: str, candles: np.ndarray) -> None:
+    # a candle of the current hour/day can't be complete yet (its last 1m candle might still be forming)
+    duration = jh.timeframe_to_one_minutes(timeframe) * 60_000
+    candles = candles[candles[:, 0] + duration <= arrow.utcnow().int_timestamp * 1000]
+    if len(candles) == 0:
+        return
+
+    candles_list = [{
+        'id': jh.generate_unique_id(),
+        'exchange': exchange,
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'timestamp': int(c[0]),
+        'open': c[1],
+        'close': c[2],
+        'high': c[3],
+        'low': c[4],
+        'volume': c[5],
+    } for c in candles.tolist()]
+
+    CandleAggregate.insert_many(candles_list).on_conflict(
+        conflict_target=['exchange', 'symbol', 'timeframe', 'timestamp'],
+        preserve=(
+            CandleAggregate.open, CandleAggregate.high, CandleAggregate.low, CandleAggregate.close,
+            CandleAggregate.volume
+        ),
+    ).execute()
+
+
+def fetch_candle_aggregates_from_db(exchange: str, symbol: str, timeframe: str, start_date: int, finish_date: int) -> np.ndarray:
+    res = tuple(
+        CandleAggregate.select(
+            CandleAggregate.timestamp, CandleAggregate.open, CandleAggregate.close, CandleAggregate.high,
+            CandleAggregate.low, CandleAggregate.volume
+        ).where(
+            CandleAggregate.exchange == exchange,
+            CandleAggregate.symbol == symbol,
+            CandleAggregate.timeframe == timeframe,
+            CandleAggregate.timestamp.between(start_date, finish_date)
+        ).order_by(CandleAggregate.timestamp.asc()).tuples()
+    )
+
+    return np.array(res, dtype=np.float64).reshape(len(res), 6)
+
+
+def refresh_candle_aggregates(exchange: str, symbol: str, start_date: int, finish_date: int) -> None:
+    """
+    Regenerates the aggregated candles which include any 1m candle between
+    start_date and finish_date. Called after storing 1m candles.
+    """
+    from jesse.models.Candle import fetch_candles_from_db
+
+    now = arrow.utcnow().int_timestamp * 1000
+    for timeframe in CANDLE_AGGREGATE_TIMEFRAMES:
+        duration = jh.timeframe_to_one_minutes(timeframe) * 60_000
+        first_bucket = int(start_date - start_date % duration)
+        # the buckets which haven't ended yet aren't stored anyway (which saves a query
+        # on most of the candle updates of live sessions)
+        last_bucket = int(min(finish_date, now - duration))
+        last_bucket -= last_bucket % duration
+        if last_bucket < first_bucket:
+            continue
+        candles = np.array(fetch_candles_from_db(exchange, symbol, '1m', first_bucket, last_bucket + duration - 60_000))
+        store_candle_aggregates(exchange, symbol, timeframe, aggregate_one_minute_candles(candles, timeframe))
+
+
+def get_candle_aggregates(exchange: str, symbol: str, timeframe: str, start_date: int, finish_date: int) -> np.ndarray:
+    """
+    Returns the aggregated candles of the buckets that lie entirely between start_date
+    and finish_date. Buckets that haven't been materialized yet are generated from
+    the stored 1m candles (and stored for the next time). Buckets without all of their
+    1m candles are left out.
+
+    A generated bucket is only stored once the 1m candle after it is in the table as
+    well. Until then, the final update of its last 1m candle might not have been
+    written yet (see jesse/services/candle_writer.py).
+    """
+    from jesse.models.Candle import fetch_candles_from_db
+
+    duration = jh.timeframe_to_one_minutes(timeframe) * 60_000
+    first_bucket = -(-start_date // duration) * duration
+    expected = np.arange(first_bucket, finish_date - duration + 60_000 + 1, duration)
+    if len(expected) == 0:
+        return np.empty((0, 6))
+
+    stored = fetch_candle_aggregates_from_db(exchange, symbol, timeframe, int(expected[0]), int(expected[-1]))
+    if len(stored) == len(expected):
+        return stored
+
+    missing = np.setdiff1d(expected, stored[:, 0])
+    # including the 1m candle after the last missing bucket
+    one_minute_candles = np.array(fetch_candles_from_db(
+        exchange, symbol, '1m', int(missing[0]), int(missing[-1] + duration)
+    )).reshape(-1, 6)
+    generated = aggregate_one_minute_candles(one_minute_candles, timeframe)
+    generated = generated[np.isin(generated[:, 0], missing)]
+    if len(one_minute_candles):
+        store_candle_aggregates(
+            exchange, symbol, timeframe, generated[generated[:, 0] + duration <= one_minute_candles[-1][0]]
+        )
+
+    candles = np.concatenate((stored, generated))
+    return candles[np.argsort(candles[:, 0], kind='stable')]
+
+
+def delete_candle_aggregates(exchange: str, symbol: str) -> None:
+    CandleAggregate.delete().where(
+        CandleAggregate.exchange == exchange,
+        CandleAggregate.symbol == symbol
+    ).execute()
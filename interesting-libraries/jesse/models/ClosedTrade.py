@@ -122,7 +122,11 @@ class ClosedTrade(peewee.Model):
         Return on Investment in percentage
         More at: https://www.binance.com/en/support/faq/5b9ad93cb4854f5990b9fb97c03cfbeb
         """
-        return self.pnl / self.total_cost * 100
+        total_cost = self.total_cost
+        # a trade without a cost (such as one of zero qty) has no return
+        if not total_cost:
+            return 0
+        return self.pnl / total_cost * 100
 
     @property
     def total_cost(self) -> float:
@@ -176,7 +176,7 @@ class FuturesExchange(Exchange):
             self._started_balance = self._wallet_balance
 
 
-@njit(cache=True)
+@njit(cache=True, nogil=True)
 def find_order_index(orders, order_array):
     for i in range(len(orders)):
         if np.all(orders[i] == order_array):
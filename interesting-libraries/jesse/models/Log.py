@@ -57,3 +57,28 @@ def store_log_into_db(log: dict, log_type: str) -> None:
     }
 
     Log.insert(**d).execute()
+
+
+def store_logs_into_db(logs: list) -> None:
+    """
+    Same as store_log_into_db() for a batch of (log, log_type) tuples in one query
+    """
+    rows = []
+    for log, log_type in logs:
+        if log_type == 'info':
+            log_type = 1
+        elif log_type == 'error':
+            log_type = 2
+        else:
+            raise ValueError(f"Unsupported log_type value: {log_type}")
+
+        rows.append({
+            'id': log['id'],
+            'session_id': log['session_id'],
+            'type': log_type,
+            'timestamp': log['timestamp'],
+            'message': log['message']
+        })
+
+    if rows:
+        Log.insert_many(rows).execute()
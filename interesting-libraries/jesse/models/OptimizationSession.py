@@ -210,7 +210,40 @@ def update_optimization_session_trials(
         d['objective_curve'] = json.dumps(objective_curve)
 
     OptimizationSession.update(**d).where(OptimizationSession.id == id).execute()
-    
+
+
+def append_optimization_session_trials(
+    id: str,
+    completed_trials: int,
+    new_objective_curve_points: list,
+    best_trials: list = None,
+    total_trials: int = None
+) -> None:
+    """
+    Same as update_optimization_session_trials() but only sends the new points of the
+    objective curve which are appended to the stored JSON array inside the database.
+    """
+    d = {
+        'completed_trials': completed_trials,
+        'total_trials': total_trials,
+        'updated_at': jh.now_to_timestamp(True)
+    }
+
+    if best_trials is not None:
+        d['best_trials'] = json.dumps(best_trials)
+
+    if new_objective_curve_points:
+        new_points = json.dumps(new_objective_curve_points)
+        column = OptimizationSession.objective_curve
+        # "[a,b]" + ",c,d]" => "[a,b,c,d]"
+        d['objective_curve'] = peewee.Case(
+            None,
+            [((column.is_null()) | (column == '[]'), new_points)],
+            peewee.fn.CONCAT(peewee.fn.LEFT(column, -1), ',' + new_points[1:])
+        )
+
+    OptimizationSession.update(**d).where(OptimizationSession.id == id).execute()
+
 
 def get_optimization_session(id: str) -> dict:
     session = OptimizationSession.get(OptimizationSession.id == id)
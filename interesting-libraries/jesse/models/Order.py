@@ -251,6 +251,9 @@ class Order(Model):
         if p:
             p._on_executed_order(self)
 
+        if store.app.equity_recorder is not None:
+            store.app.equity_recorder.record()
+
     def execute_partially(self, silent=False) -> None:
         self.executed_at = jh.now_to_timestamp()
         self.status = order_statuses.PARTIALLY_FILLED
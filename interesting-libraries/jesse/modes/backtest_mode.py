@@ -16,6 +16,7 @@ from jesse.services import report
 from jesse.services.candle import generate_candle_from_one_minutes, print_candle, candle_includes_price, split_candle, \
     get_candles, inject_warmup_candles_to_store
 from jesse.services.file import store_logs
+from jesse.services.intraday_equity import IntradayEquityRecorder, max_drawdown as intraday_max_drawdown
 from jesse.services.validators import validate_routes
 from jesse.store import store
 from jesse.services import logger
@@ -158,6 +159,7 @@ def _execute_backtest(
             benchmark=benchmark,
             generate_hyperparameters=True,
             fast_mode=fast_mode,
+            intraday_equity_curve=True,
         )
     except exceptions.RouteNotFound as e:
         # Extract exchange, symbol, and timeframe using regular expressions
@@ -196,14 +198,16 @@ def _execute_backtest(
         sync_publish('equity_curve', result['equity_curve'], compression=True)
         sync_publish('trades', result['trades'], compression=True)
         if chart:
-            sync_publish('candles_chart', _get_formatted_candles_for_frontend(), compression=True)
-            sync_publish('orders_chart', _get_formatted_orders_for_frontend(), compression=True)
-            sync_publish('add_line_to_candle_chart', _get_add_line_to_candle_chart(), compression=True)
-            sync_publish('add_extra_line_chart', _get_add_extra_line_chart(), compression=True)
+            # charts are sent as columns of typed arrays instead of one JSON object per candle
+            sync_publish('candles_chart', _get_formatted_candles_for_frontend(), binary=True)
+            sync_publish('orders_chart', _get_formatted_orders_for_frontend(), binary=True)
+            sync_publish('add_line_to_candle_chart', _get_add_line_to_candle_chart(), binary=True)
+            sync_publish('add_extra_line_chart', _get_add_extra_line_chart(), binary=True)
             sync_publish('add_horizontal_line_to_candle_chart', _get_add_horizontal_line_to_candle_chart(), compression=True)
             sync_publish('add_horizontal_line_to_extra_chart', _get_add_horizontal_line_to_extra_chart(), compression=True)
 
-    # close database connection
+    # write the remaining logs before closing the database connection
+    logger.flush()
     from jesse.services.db import database
     database.close_connection()
 
@@ -213,25 +217,23 @@ def _get_formatted_candles_for_frontend():
     for r in router.routes:
         candles_arr = store.candles.get_candles(r.exchange, r.symbol, r.timeframe)
         # Find the index where the starting time actually begins.
-        starting_index = 0
-        for i, c in enumerate(candles_arr):
-            if c[0] >= store.app.starting_time:
-                starting_index = i
-                break
-
-        candles = [{
-            'time': int(c[0]/1000),
-            'open': c[1],
-            'close': c[2],
-            'high': c[3],
-            'low': c[4],
-            'volume': c[5]
-        } for c in candles_arr[starting_index:]]
+        starting_index = np.searchsorted(candles_arr[:, 0], store.app.starting_time)
+        if starting_index == len(candles_arr):
+            starting_index = 0
+        candles_arr = candles_arr[starting_index:]
+
         arr.append({
             'exchange': r.exchange,
             'symbol': r.symbol,
             'timeframe': r.timeframe,
-            'candles': candles
+            'candles': {
+                'time': (candles_arr[:, 0] // 1000).astype(np.uint32),
+                'open': candles_arr[:, 1],
+                'close': candles_arr[:, 2],
+                'high': candles_arr[:, 3],
+                'low': candles_arr[:, 4],
+                'volume': candles_arr[:, 5],
+            }
         })
     return arr
 
@@ -239,15 +241,34 @@ def _get_formatted_candles_for_frontend():
 def _get_formatted_orders_for_frontend():
     arr = []
     for r in router.routes:
+        orders = r.strategy._executed_orders
         arr.append({
             'exchange': r.exchange,
             'symbol': r.symbol,
             'timeframe': r.timeframe,
-            'orders': r.strategy._executed_orders
+            'orders': {
+                'time': np.array([o['time'] for o in orders], dtype=np.uint32),
+                **{k: [o[k] for o in orders] for k in ['position', 'color', 'shape', 'text', 'order_id']}
+            }
         })
     return arr
 
 
+def _columnar_line(line: dict) -> dict:
+    """
+    {'color': ..., 'data': [{'time', 'value', 'color'}, ...]} => parallel time and value arrays.
+    The colors of the points are only included if any of them differs from the line's color.
+    """
+    points = line['data']
+    colors = [p['color'] for p in points]
+    return {
+        'color': line['color'],
+        'time': np.array([p['time'] for p in points], dtype=np.uint32),
+        'value': np.array([p['value'] for p in points], dtype=np.float64),
+        'colors': colors if any(c != line['color'] for c in colors) else None,
+    }
+
+
 def _get_add_line_to_candle_chart():
     arr = []
     for r in router.routes:
@@ -255,7 +276,9 @@ def _get_add_line_to_candle_chart():
             'exchange': r.exchange,
             'symbol': r.symbol,
             'timeframe': r.timeframe,
-            'lines': r.strategy._add_line_to_candle_chart_values
+            'lines': {
+                title: _columnar_line(line) for title, line in r.strategy._add_line_to_candle_chart_values.items()
+            }
         })
     return arr
 
@@ -267,7 +290,10 @@ def _get_add_extra_line_chart():
             'exchange': r.exchange,
             'symbol': r.symbol,
             'timeframe': r.timeframe,
-            'charts': r.strategy._add_extra_line_chart_values
+            'charts': {
+                chart_name: {title: _columnar_line(line) for title, line in lines.items()}
+                for chart_name, lines in r.strategy._add_extra_line_chart_values.items()
+            }
         })
     return arr
 
@@ -432,6 +458,8 @@ def _step_simulator(
         benchmark: bool = False,
         generate_hyperparameters: bool = False,
         generate_logs: bool = False,
+        intraday_equity_curve: bool = False,
+        parallel_routes: int = 0,
 ) -> dict:
     # In case generating logs is specifically demanded, the debug mode must be enabled.
     if generate_logs:
@@ -448,8 +476,11 @@ def _step_simulator(
 
     # add initial balance
     save_daily_portfolio_balance(is_initial=True)
+    if intraday_equity_curve:
+        store.app.equity_recorder = IntradayEquityRecorder(candles)
 
     progressbar = Progressbar(length, step=420)
+    executor = _routes_executor(parallel_routes)
     last_update_time = None
     for i in range(length):
         # update time
@@ -494,6 +525,9 @@ def _step_simulator(
         last_update_time = _update_progress_bar(progressbar, run_silently, i, candle_step=420,
                                                 last_update_time=last_update_time)
 
+        if executor is not None:
+            _prepare_routes_in_parallel(executor, i + 1)
+
         # now that all new generated candles are ready, execute
         for r in router.routes:
             count = TIMEFRAME_TO_ONE_MINUTES[r.timeframe]
@@ -516,6 +550,8 @@ def _step_simulator(
             save_daily_portfolio_balance()
 
     _finish_progress_bar(progressbar, run_silently)
+    if executor is not None:
+        executor.shutdown()
 
     execution_duration = 0
     if not run_silently:
@@ -542,6 +578,7 @@ def _step_simulator(
         benchmark=benchmark,
         generate_hyperparameters=generate_hyperparameters,
         generate_logs=generate_logs,
+        intraday_equity_curve=intraday_equity_curve,
     )
     result['execution_duration'] = execution_duration
     return result
@@ -766,6 +803,7 @@ def _generate_outputs(
         benchmark: bool = False,
         generate_hyperparameters: bool = False,
         generate_logs: bool = False,
+        intraday_equity_curve: bool = False,
 ):
     result = {}
     if generate_hyperparameters:
@@ -780,9 +818,16 @@ def _generate_outputs(
         result["tradingview"] = logs_path["tradingview"]
     if generate_csv:
         result["csv"] = logs_path["csv"]
+    intraday_equity = store.app.equity_recorder.equity_curve() if intraday_equity_curve else None
+    if intraday_equity is not None and result["metrics"] and result["metrics"].get('total'):
+        result["metrics"]["intraday_max_drawdown"] = intraday_max_drawdown(intraday_equity[1])
+    if intraday_equity is not None:
+        result["intraday_equity"] = intraday_equity
     if generate_equity_curve:
-        result["equity_curve"] = charts.equity_curve(benchmark)
+        result["equity_curve"] = charts.equity_curve(benchmark, intraday_equity)
     if generate_logs:
+        # the log file is written in the background
+        logger.flush()
         result["logs"] = f"storage/logs/backtest-mode/{jh.get_session_id()}.txt"
     return result
 
@@ -798,6 +843,8 @@ def _skip_simulator(
         benchmark: bool = False,
         generate_hyperparameters: bool = False,
         generate_logs: bool = False,
+        intraday_equity_curve: bool = False,
+        parallel_routes: int = 0,
 ) -> dict:
     # In case generating logs is specifically demanded, the debug mode must be enabled.
     if generate_logs:
@@ -811,9 +858,12 @@ def _skip_simulator(
 
     # add initial balance
     save_daily_portfolio_balance(is_initial=True)
+    if intraday_equity_curve:
+        store.app.equity_recorder = IntradayEquityRecorder(candles)
 
     candles_step = _calculate_minimum_candle_step()
     progressbar = Progressbar(length, step=candles_step)
+    executor = _routes_executor(parallel_routes)
     last_update_time = None
     for i in range(0, length, candles_step):
         # update time moved to _simulate_price_change_effect__multiple_candles
@@ -823,6 +873,8 @@ def _skip_simulator(
         last_update_time = _update_progress_bar(progressbar, run_silently, i, candles_step,
                                                 last_update_time=last_update_time)
 
+        if executor is not None:
+            _prepare_routes_in_parallel(executor, i + candles_step)
         _execute_routes(i, candles_step)
 
         # now check to see if there's any MARKET orders waiting to be executed
@@ -832,6 +884,8 @@ def _skip_simulator(
             save_daily_portfolio_balance()
 
     _finish_progress_bar(progressbar, run_silently)
+    if executor is not None:
+        executor.shutdown()
 
     execution_duration = 0
     if not run_silently:
@@ -858,6 +912,7 @@ def _skip_simulator(
         benchmark=benchmark,
         generate_hyperparameters=generate_hyperparameters,
         generate_logs=generate_logs,
+        intraday_equity_curve=intraday_equity_curve,
     )
     result['execution_duration'] = execution_duration
     return result
@@ -1050,6 +1105,30 @@ def _update_all_routes_a_partial_candle(
         )
 
 
+def _routes_executor(parallel_routes: int):
+    if parallel_routes < 2 or len(router.routes) < 2:
+        return None
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=parallel_routes, thread_name_prefix='jesse-route')
+
+
+def _prepare_routes_in_parallel(executor, elapsed_minutes: int) -> None:
+    """
+    Evaluates the cached properties (usually the indicators) of the routes which are about to
+    execute on the worker threads. The routes are then executed one after another in their
+    usual order, so orders and balances are updated exactly like in the sequential simulation.
+    Much of the indicators' time is spent in numba kernels and numpy, which release the GIL.
+    """
+    strategies = [
+        r.strategy for r in router.routes
+        if r.timeframe == timeframes.MINUTE_1 or elapsed_minutes % TIMEFRAME_TO_ONE_MINUTES[r.timeframe] == 0
+    ]
+    if len(strategies) < 2:
+        return
+    # list() waits for all of them
+    list(executor.map(lambda strategy: strategy._prepare(), strategies))
+
+
 def _execute_routes(candle_index: int, candles_step: int) -> None:
     # now that all new generated candles are ready, execute
     for r in router.routes:
@@ -11,8 +11,9 @@ def get_candles(exchange: str, symbol: str, timeframe: str):
     from jesse.services.db import database
     database.open_connection()
 
-    from jesse.services.candle import generate_candle_from_one_minutes
+    from jesse.services.candle import resample
     from jesse.models.Candle import fetch_candles_from_db
+    from jesse.models.CandleAggregate import CANDLE_AGGREGATE_TIMEFRAMES, get_candle_aggregates
 
     if 'hyperliquid' not in exchange.lower():
         symbol = symbol.upper()
@@ -37,9 +38,14 @@ def get_candles(exchange: str, symbol: str, timeframe: str):
     else:
         timeframe_to_fetch = timeframe
 
-    candles = np.array(
-        fetch_candles_from_db(exchange, symbol, timeframe_to_fetch, start_date, finish_date)
-    )
+    # hourly and daily candles are materialized, no need to generate them from 1m candles
+    if generate_candles_from_1m and timeframe in CANDLE_AGGREGATE_TIMEFRAMES:
+        candles = get_candle_aggregates(exchange, symbol, timeframe, start_date, finish_date)
+        generate_candles_from_1m = False
+    else:
+        candles = np.array(
+            fetch_candles_from_db(exchange, symbol, timeframe_to_fetch, start_date, finish_date)
+        )
 
     # if there are no candles in the database, return []
     if candles.size == 0:
@@ -49,22 +55,12 @@ def get_candles(exchange: str, symbol: str, timeframe: str):
     if generate_candles_from_1m:
         # leave out first candles until the timestamp of the first candle is the beginning of the timeframe
         timeframe_duration = one_min_count * 60_000
-        while candles[0][0] % timeframe_duration != 0:
-            candles = candles[1:]
+        aligned = np.flatnonzero(candles[:, 0] % timeframe_duration == 0)
+        candles = candles[aligned[0]:] if len(aligned) else candles[:0]
 
         # generate bigger candles from 1m candles
         if timeframe != '1m':
-            generated_candles = []
-            for i in range(len(candles)):
-                if (i + 1) % one_min_count == 0:
-                    bigger_candle = generate_candle_from_one_minutes(
-                        timeframe,
-                        candles[(i - (one_min_count - 1)):(i + 1)],
-                        True
-                    )
-                    generated_candles.append(bigger_candle)
-
-            candles = generated_candles
+            candles = resample(candles, timeframe)
 
     database.close_connection()
 
@@ -395,3 +395,12 @@ def store_candles_list(candles: List[Dict]) -> None:
         if 'timeframe' not in c:
             raise Exception('Candle has no timeframe')
     Candle.insert_many(candles).on_conflict_ignore().execute()
+
+    # keep the materialized hourly and daily candles up to date
+    from jesse.models.CandleAggregate import refresh_candle_aggregates
+    one_minute_candles = [c for c in candles if c['timeframe'] == '1m']
+    if one_minute_candles:
+        refresh_candle_aggregates(
+            one_minute_candles[0]['exchange'], one_minute_candles[0]['symbol'],
+            min(c['timestamp'] for c in one_minute_candles), max(c['timestamp'] for c in one_minute_candles)
+        )
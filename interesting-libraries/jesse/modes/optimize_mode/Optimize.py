@@ -1,78 +1,148 @@
 import os
 import json
 import base64
+from time import monotonic
 from datetime import timedelta
 from multiprocessing import cpu_count
-import optuna
-import ray
 import numpy as np
 import jesse.helpers as jh
 import jesse.services.logger as logger
 from jesse import exceptions
 from jesse.services.redis import sync_publish
-from jesse.modes.optimize_mode.fitness import get_fitness
+from jesse.modes.optimize_mode.fitness import get_fitness, _formatted_inputs_for_isolated_backtest
+from jesse.research.backtest import WarmBacktest
 from jesse.routes import router
+from jesse.services.indicator_kernels import warmup_routes_kernels
 from jesse.services.progressbar import Progressbar
+from jesse.services.throttled_publisher import ThrottledPublisher
 from jesse.services.redis import is_process_active
-from jesse.models.OptimizationSession import update_optimization_session_status, update_optimization_session_trials, get_optimization_session, get_optimization_session_by_id
+from jesse.models.OptimizationSession import update_optimization_session_status, update_optimization_session_trials, append_optimization_session_trials, get_optimization_session, get_optimization_session_by_id
 import traceback
+from typing import TYPE_CHECKING
 
-# Define a Ray-compatible remote function
-
-
-@ray.remote
-def ray_evaluate_trial(
-    user_config,
-    formatted_routes,
-    formatted_data_routes,
-    strategy_hp,
-    hp,
-    training_warmup_candles,
-    training_candles,
-    testing_warmup_candles,
-    testing_candles,
-    optimal_total,
-    fast_mode,
-    trial_number
-):
-    """Ray remote function to evaluate a trial"""
-    try:
-        # Calculate the fitness score using the provided hyperparameters
-        score, training_metrics, testing_metrics = get_fitness(
-            user_config,
-            formatted_routes,
-            formatted_data_routes,
-            strategy_hp,
-            hp,
-            training_warmup_candles,
-            training_candles,
-            testing_warmup_candles,
-            testing_candles,
-            optimal_total,
-            fast_mode
+# optuna and ray take long to import, so they are imported by the methods which run the optimization
+if TYPE_CHECKING:
+    import optuna
+
+# Dashboard updates are coalesced into one message per event per window
+PUBLISH_INTERVAL_SECONDS = 0.5
+# Progress is written to the database at most this often
+PERSIST_INTERVAL_SECONDS = 5
+
+
+class OptimizationWorker:
+    """
+    A long-lived Ray actor (wrapped with ray.remote() when the optimization runs) that sets
+    up the training and testing backtests once (routes, strategy class, warmup candles and
+    the generated bigger timeframes) and between trials only resets the trading state and
+    swaps the hyperparameters.
+    """
+    def __init__(
+        self,
+        user_config,
+        formatted_routes,
+        formatted_data_routes,
+        strategy_hp,
+        training_warmup_candles,
+        training_candles,
+        testing_warmup_candles,
+        testing_candles,
+        optimal_total,
+        fast_mode
+    ):
+        self.user_config = user_config
+        self.formatted_routes = formatted_routes
+        self.formatted_data_routes = formatted_data_routes
+        self.strategy_hp = strategy_hp
+        self.optimal_total = optimal_total
+        self.fast_mode = fast_mode
+
+        inputs = _formatted_inputs_for_isolated_backtest(user_config, formatted_routes)
+        self.training_backtest = WarmBacktest(
+            inputs, formatted_routes, formatted_data_routes, training_candles, training_warmup_candles, fast_mode
+        )
+        self.testing_backtest = WarmBacktest(
+            inputs, formatted_routes, formatted_data_routes, testing_candles, testing_warmup_candles, fast_mode
         )
 
-        # Log the trial details if debugging is enabled
-        if jh.is_debugging():
-            logger.log_optimize_mode(f"Ray Trial {trial_number}: Score={score}, Params={hp}")
+    def evaluate_trial(self, hp, trial_number):
+        """Evaluates a trial on the warm backtests"""
+        try:
+            # Calculate the fitness score using the provided hyperparameters
+            score, training_metrics, testing_metrics = get_fitness(
+                self.user_config,
+                self.formatted_routes,
+                self.formatted_data_routes,
+                self.strategy_hp,
+                hp,
+                None,
+                None,
+                None,
+                None,
+                self.optimal_total,
+                self.fast_mode,
+                training_backtest=self.training_backtest,
+                testing_backtest=self.testing_backtest
+            )
+
+            # Log the trial details if debugging is enabled
+            if jh.is_debugging():
+                logger.log_optimize_mode(f"Ray Trial {trial_number}: Score={score}, Params={hp}")
+
+            return {
+                'trial_number': trial_number,
+                'score': score,
+                'params': hp,
+                'training_metrics': training_metrics,
+                'testing_metrics': testing_metrics
+            }
+        except exceptions.RouteNotFound as e:
+            # Convert RouteNotFound to a standard RuntimeError to avoid serialization issues
+            error_msg = str(e)
+            logger.log_optimize_mode(f"Ray Trial {trial_number} failed with RouteNotFound: {error_msg}")
+            logger.log_optimize_mode(f"Trial {trial_number} hyperparameters: {hp}")
+            raise RuntimeError(f"RouteNotFound: {error_msg}")
+        except Exception as e:
+            # Log and re-raise other exceptions
+            logger.log_optimize_mode(f"Ray Trial {trial_number} failed with exception: {str(e)}")
+            raise
+
+
+def generate_trial_params(strategy_hp: list) -> dict:
+    """Generate random hyperparameters for a trial"""
+    hp = {}
+    for param in strategy_hp:
+        param_name = str(param['name'])
+        param_type = param['type']
+        # Convert to string whether input is type class or string
+        if isinstance(param_type, type):
+            param_type = param_type.__name__
+        else:
+            # Remove quotes if they exist
+            param_type = param_type.strip("'").strip('"')
+
+        if param_type == 'int':
+            if 'step' in param and param['step'] is not None:
+                steps = (param['max'] - param['min']) // param['step'] + 1
+                value = param['min'] + np.random.randint(0, steps) * param['step']
+            else:
+                value = np.random.randint(param['min'], param['max'] + 1)
+            hp[param_name] = value
+        elif param_type == 'float':
+            if 'step' in param and param['step'] is not None:
+                steps = int((param['max'] - param['min']) / param['step']) + 1
+                value = param['min'] + np.random.randint(0, steps) * param['step']
+            else:
+                value = np.random.uniform(param['min'], param['max'])
+            hp[param_name] = value
+        elif param_type == 'categorical':
+            options = param['options']
+            hp[param_name] = options[np.random.randint(0, len(options))]
+        else:
+            raise ValueError(f"Unsupported hyperparameter type: {param_type}")
+
+    return hp
 
-        return {
-            'trial_number': trial_number,
-            'score': score,
-            'params': hp,
-            'training_metrics': training_metrics,
-            'testing_metrics': testing_metrics
-        }
-    except exceptions.RouteNotFound as e:
-        # Convert RouteNotFound to a standard RuntimeError to avoid serialization issues
-        error_msg = str(e)
-        logger.log_optimize_mode(f"Ray Trial {trial_number} failed with RouteNotFound: {error_msg}")
-        logger.log_optimize_mode(f"Trial {trial_number} hyperparameters: {hp}")
-        raise RuntimeError(f"RouteNotFound: {error_msg}")
-    except Exception as e:
-        # Log and re-raise other exceptions
-        logger.log_optimize_mode(f"Ray Trial {trial_number} failed with exception: {str(e)}")
-        raise
 
 # Optimizer class that uses Ray for hyperparameter optimization
 
@@ -98,7 +168,13 @@ class Optimizer:
         self.session_id = session_id
 
         # Retrieve the target strategy and its hyperparameter configuration
-        strategy_class = jh.get_strategy_class(router.routes[0].strategy_name)
+        strategy_name = router.routes[0].strategy_name
+        # (the strategy can also be passed as a class, such as in benchmarks)
+        if isinstance(strategy_name, str):
+            strategy_class = jh.get_strategy_class(strategy_name)
+        else:
+            strategy_class = strategy_name
+            strategy_name = strategy_class.__name__
 
         self.strategy_hp = strategy_class.hyperparameters(None)
 
@@ -110,7 +186,7 @@ class Optimizer:
         os.makedirs('./storage/temp/optuna', exist_ok=True)
         self.storage_url = f"sqlite:///./storage/temp/optuna/optuna_study.db"
         # The study_name uniquely identifies the optimization session - changing it will create a new session
-        self.study_name = f"{router.routes[0].strategy_name}_optuna_ray_{self.session_id}"
+        self.study_name = f"{strategy_name}_optuna_ray_{self.session_id}"
 
         self.solution_len = len(self.strategy_hp)
         self.start_time = jh.now_to_timestamp()
@@ -142,6 +218,7 @@ class Optimizer:
         self.completed_trials = 0
 
         # Create or load the Optuna study for persistence
+        import optuna
         self.study = optuna.create_study(
             direction='maximize',
             storage=self.storage_url,
@@ -149,11 +226,17 @@ class Optimizer:
             load_if_exists=True
         )
 
-        # Buffer to accumulate objective curve data points (one point per trial)
-        self.objective_curve_buffer = []
+        # All objective curve data points (one point per trial) and how many of them are already in the database
         self.total_objective_curve_buffer = []
+        self.persisted_objective_curve_len = 0
+        self.best_trials_changed = False
+        self.last_persisted_at = monotonic()
+
+        # Coalesces the dashboard updates of fast trials into one message per event per window
+        self.publisher = ThrottledPublisher(PUBLISH_INTERVAL_SECONDS)
 
         # Initialize Ray if not already
+        import ray
         if not ray.is_initialized():
             try:
                 ray.init(num_cpus=self.cpu_cores, ignore_reinit_error=True)
@@ -221,6 +304,7 @@ class Optimizer:
                 self.total_objective_curve_buffer,
                 self.n_trials
             )
+            self.persisted_objective_curve_len = len(self.total_objective_curve_buffer)
 
         except Exception as e:
             logger.log_optimize_mode(f"Error loading previous trials: {e}")
@@ -230,41 +314,12 @@ class Optimizer:
 
     def _generate_trial_params(self):
         """Generate random hyperparameters for a trial"""
-        hp = {}
-        for param in self.strategy_hp:
-            param_name = str(param['name'])
-            param_type = param['type']
-            # Convert to string whether input is type class or string
-            if isinstance(param_type, type):
-                param_type = param_type.__name__
-            else:
-                # Remove quotes if they exist
-                param_type = param_type.strip("'").strip('"')
-
-            if param_type == 'int':
-                if 'step' in param and param['step'] is not None:
-                    steps = (param['max'] - param['min']) // param['step'] + 1
-                    value = param['min'] + np.random.randint(0, steps) * param['step']
-                else:
-                    value = np.random.randint(param['min'], param['max'] + 1)
-                hp[param_name] = value
-            elif param_type == 'float':
-                if 'step' in param and param['step'] is not None:
-                    steps = int((param['max'] - param['min']) / param['step']) + 1
-                    value = param['min'] + np.random.randint(0, steps) * param['step']
-                else:
-                    value = np.random.uniform(param['min'], param['max'])
-                hp[param_name] = value
-            elif param_type == 'categorical':
-                options = param['options']
-                hp[param_name] = options[np.random.randint(0, len(options))]
-            else:
-                raise ValueError(f"Unsupported hyperparameter type: {param_type}")
-
-        return hp
+        return generate_trial_params(self.strategy_hp)
 
     def _create_optuna_trial(self, trial_number, params, score, training_metrics, testing_metrics):
         """Create and store an Optuna trial for persistence"""
+        import optuna
+
         try:
             # Create distributions for the parameters
             distributions = {}
@@ -337,23 +392,10 @@ class Optimizer:
         # Store trial in Optuna for persistence
         self._create_optuna_trial(trial_number, params, score, training_metrics, testing_metrics)
 
-        # Update the dashboard with general information about the progress
-        general_info = {
-            'started_at': jh.timestamp_to_arrow(self.start_time).humanize(),
-            'trial': f'{self.completed_trials}/{self.n_trials}',
-            'objective_function': jh.get_config('env.optimization.objective_function', 'sharpe'),
-            'exchange_type': self.user_config['exchange']['type'],
-            'leverage_mode': self.user_config['exchange']['futures_leverage_mode'],
-            'leverage': self.user_config['exchange']['futures_leverage'],
-            'cpu_cores': self.cpu_cores,
-        }
-        sync_publish('general_info', general_info)
-
-        # Update the progress bar and publish the current progress to the dashboard
-        sync_publish('progressbar', {
-            'current': self.progressbar.current,
-            'estimated_remaining_seconds': self.progressbar.estimated_remaining_seconds
-        })
+        # Update the dashboard with general information and the progress. The payloads
+        # are built when the publisher flushes so only the latest state is sent.
+        self.publisher.set('general_info', self._general_info)
+        self.publisher.set('progressbar', self._progressbar_info)
 
         # Process trial metrics for objective curve
         self._process_trial_metrics(trial_number, training_metrics, testing_metrics)
@@ -395,23 +437,54 @@ class Optimizer:
                 # Keep only top 20
                 self.best_trials = self.best_trials[:20]
 
-            # Update best candidates table
-            self._update_best_candidates()
+                self.best_trials_changed = True
 
-            # Update the database with the latest trials data
-            # We do this every 5 trials to avoid too many database writes
-            if self.completed_trials % 5 == 0:
+                # Update best candidates table
+                self._update_best_candidates()
 
-                update_optimization_session_trials(
-                    self.session_id,
-                    self.completed_trials,
-                    self.best_trials,
-                    self.total_objective_curve_buffer,
-                    self.n_trials
-                )
+    def _general_info(self) -> dict:
+        return {
+            'started_at': jh.timestamp_to_arrow(self.start_time).humanize(),
+            'trial': f'{self.completed_trials}/{self.n_trials}',
+            'objective_function': jh.get_config('env.optimization.objective_function', 'sharpe'),
+            'exchange_type': self.user_config['exchange']['type'],
+            'leverage_mode': self.user_config['exchange']['futures_leverage_mode'],
+            'leverage': self.user_config['exchange']['futures_leverage'],
+            'cpu_cores': self.cpu_cores,
+        }
+
+    def _progressbar_info(self) -> dict:
+        return {
+            'current': self.progressbar.current,
+            'estimated_remaining_seconds': self.progressbar.estimated_remaining_seconds
+        }
+
+    def _persist_progress(self, force: bool = False) -> None:
+        """
+        Periodically writes the progress to the database. Only the objective curve
+        points that were added since the last write are sent, and best trials only
+        when they have changed.
+        """
+        if not force and monotonic() - self.last_persisted_at < PERSIST_INTERVAL_SECONDS:
+            return
+
+        append_optimization_session_trials(
+            self.session_id,
+            self.completed_trials,
+            self.total_objective_curve_buffer[self.persisted_objective_curve_len:],
+            self.best_trials if self.best_trials_changed else None,
+            self.n_trials
+        )
+        self.persisted_objective_curve_len = len(self.total_objective_curve_buffer)
+        self.best_trials_changed = False
+        self.last_persisted_at = monotonic()
 
     def _update_best_candidates(self):
         """Update the best candidates table in the dashboard"""
+        self.publisher.set('best_candidates', self._best_candidates)
+
+    def _best_candidates(self) -> list:
+        """Build the best candidates table of the dashboard"""
         # Get the objective function configuration
         objective_function_config = jh.get_config('env.optimization.objective_function', 'sharpe').lower()
         mapping = {
@@ -451,8 +524,7 @@ class Optimizer:
                 'objective_metric': candidate_objective_metric
             })
 
-        # Send top candidates to the dashboard
-        sync_publish('best_candidates', best_candidates)
+        return best_candidates
 
     def _process_trial_metrics(self, trial_number, training_metrics, testing_metrics):
         """Process metrics from a completed trial to update objective curve"""
@@ -463,7 +535,9 @@ class Optimizer:
                 'training': training_metrics,
                 'testing': testing_metrics
             }
-            self.objective_curve_buffer.append(data_point)
+            self.total_objective_curve_buffer.append(data_point)
+            # Points are published in batches by the throttled publisher
+            self.publisher.extend('objective_curve', [data_point])
 
             if jh.is_debugging():
                 jh.debug(f"Added trial {trial_number + 1} to objective curve buffer with metrics")
@@ -471,31 +545,16 @@ class Optimizer:
             if jh.is_debugging():
                 jh.debug(f"Skipped trial {trial_number + 1} - missing metrics. Training: {bool(training_metrics)}, Testing: {bool(testing_metrics)}")
 
-        # Publish a batch every 5 trials or when buffer reaches 10 items
-        buffer_size = len(self.objective_curve_buffer)
-        if buffer_size >= 10 or (buffer_size > 0 and self.completed_trials % 5 == 0):
-            if jh.is_debugging():
-                jh.debug(f"Publishing objective curve LEN: {len(self.objective_curve_buffer)}")
-            sync_publish('objective_curve', self.objective_curve_buffer)
-
-            if len(self.objective_curve_buffer) > 0 and len(self.total_objective_curve_buffer) > 0:
-                if self.objective_curve_buffer[0]['trial'] > self.total_objective_curve_buffer[-1]['trial']:
-                    self.total_objective_curve_buffer.extend(self.objective_curve_buffer)
-            else:
-                self.total_objective_curve_buffer.extend(self.objective_curve_buffer)
-
-            self.objective_curve_buffer = []
-
     def _set_progressbar_index(self, index):
         """Manually set the progressbar index for resuming sessions efficiently"""
         self.progressbar.index = index
         # Update UI to reflect progress
-        sync_publish('progressbar', {
-            'current': self.progressbar.current,
-            'estimated_remaining_seconds': self.progressbar.estimated_remaining_seconds
-        })
+        self.publisher.set('progressbar', self._progressbar_info)
+
+    def run(self) -> 'optuna.trial.FrozenTrial':
+        import optuna
+        import ray
 
-    def run(self) -> optuna.trial.FrozenTrial:
         # Log the start of the optimization session
         logger.log_optimize_mode(f"Optimization session started with {self.cpu_cores} CPU cores")
 
@@ -513,45 +572,60 @@ class Optimizer:
             best_trial_value = 0.0
             best_trial_params = None
 
-        try:
-            # Maximum number of active workers (slightly higher than CPU cores to keep CPUs busy)
-            max_workers = min(self.cpu_cores * 2, self.n_trials - self.completed_trials)
+        warmup_routes_kernels(router.formatted_routes, logger.log_optimize_mode)
 
-            # Dictionary to keep track of active workers
+        try:
+            # Start one long-lived worker per CPU core. The candles are put into Ray's object
+            # store once and shared by all workers instead of being sent along with every trial.
+            candles_refs = [
+                ray.put(c) for c in (
+                    self.training_warmup_candles, self.training_candles,
+                    self.testing_warmup_candles, self.testing_candles
+                )
+            ]
+            worker_actor = ray.remote(OptimizationWorker)
+            workers = [
+                worker_actor.options(num_cpus=1).remote(
+                    self.user_config,
+                    router.formatted_routes,
+                    router.formatted_data_routes,
+                    self.strategy_hp,
+                    *candles_refs,
+                    self.optimal_total,
+                    self.fast_mode
+                ) for _ in range(self.cpu_cores)
+            ]
+            # Keep two trials queued per worker so that workers never wait for the next trial
+            trials_per_worker = 2
+
+            # Dictionary to keep track of active trials and the worker running each of them
             active_refs = {}
+            idle_slots = workers * trials_per_worker
+
+            if self.completed_trials == 0:
+                update_optimization_session_trials(
+                    self.session_id,
+                    0,
+                    [],
+                    [],
+                    self.n_trials
+                )
+            # Publish the loaded state of a resumed session right away
+            self.publisher.flush()
+
             # Begin optimization loop
             while self.completed_trials < self.n_trials:
-                if self.completed_trials == 0:
-                    update_optimization_session_trials(
-                        self.session_id,
-                        0,
-                        [],
-                        [],
-                        self.n_trials
-                    )
                 # Launch new trials if we have capacity
-                while len(active_refs) < max_workers and self.trial_counter < self.n_trials:
+                while idle_slots and self.trial_counter < self.n_trials:
+                    worker = idle_slots.pop()
                     # Generate parameters for this trial
                     hp = self._generate_trial_params()
 
                     # Launch the trial evaluation
-                    ref = ray_evaluate_trial.options(num_cpus=1).remote(
-                        self.user_config,
-                        router.formatted_routes,
-                        router.formatted_data_routes,
-                        self.strategy_hp,
-                        hp,
-                        self.training_warmup_candles,
-                        self.training_candles,
-                        self.testing_warmup_candles,
-                        self.testing_candles,
-                        self.optimal_total,
-                        self.fast_mode,
-                        self.trial_counter
-                    )
+                    ref = worker.evaluate_trial.remote(hp, self.trial_counter)
 
                     # Store the reference
-                    active_refs[ref] = self.trial_counter
+                    active_refs[ref] = (self.trial_counter, worker)
                     self.trial_counter += 1
 
                 # No more workers to launch, wait for results
@@ -563,7 +637,8 @@ class Optimizer:
 
                 # Process completed trials
                 for ref in done_refs:
-                    trial_number = active_refs.pop(ref)
+                    trial_number, worker = active_refs.pop(ref)
+                    idle_slots.append(worker)
                     try:
                         result = ray.get(ref)
                         # Process the result
@@ -579,17 +654,16 @@ class Optimizer:
                             raise e.cause
                         else:
                             jh.debug(f'Ray task error for trial {trial_number}: {e}')
-                            original_exception = e.cause
                             raise
                     except Exception as e:
                         jh.debug(f'Exception raised in the ray method for trial {trial_number}: {e}')
                         raise e
 
+                self.publisher.maybe_flush()
+                self._persist_progress()
+
             # Publish any remaining data in the buffer
-            if self.objective_curve_buffer:
-                jh.debug(f"Publishing remaining {len(self.objective_curve_buffer)} data points in buffer")
-                sync_publish('objective_curve', self.objective_curve_buffer)
-                self.objective_curve_buffer = []
+            self.publisher.flush()
 
             # Get the best trial from the study
             try:
@@ -600,13 +674,7 @@ class Optimizer:
                 best_trial = None
 
             # Update the database with final results
-            update_optimization_session_trials(
-                self.session_id,
-                self.completed_trials,
-                self.best_trials,
-                self.total_objective_curve_buffer,
-                self.n_trials
-            )
+            self._persist_progress(force=True)
 
             # Update session status to 'finished'
             update_optimization_session_status(self.session_id, 'finished')
@@ -620,6 +688,8 @@ class Optimizer:
         except exceptions.Termination:
             # Handle user-initiated termination
             logger.log_optimize_mode("Optimization terminated by user")
+            # Keep the progress made since the last periodic write
+            self._persist_progress(force=True)
             # Update session status to 'stopped'
             update_optimization_session_status(self.session_id, 'stopped')
             raise
@@ -637,8 +707,7 @@ class Optimizer:
         # Create an empty FrozenTrial if best_trial is None
         if best_trial is None:
             logger.log_optimize_mode("No best trial found. Returning empty result.")
-            from optuna.trial import FrozenTrial
-            return FrozenTrial(
+            return optuna.trial.FrozenTrial(
                 number=0,
                 trial_id=0,
                 state=optuna.trial.TrialState.COMPLETE,
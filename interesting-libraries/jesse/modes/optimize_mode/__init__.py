@@ -2,10 +2,13 @@ from multiprocessing import cpu_count
 from typing import Dict, List, Tuple
 import arrow
 import jesse.helpers as jh
+import numpy as np
 from jesse.modes.backtest_mode import load_candles
 from jesse.services.validators import validate_routes
 from jesse.store import store
 from .Optimize import Optimizer
+from .walk_forward import WalkForwardOptimizer, get_folds
+from jesse.constants import TIMEFRAME_TO_ONE_MINUTES
 from jesse.services.failure import register_custom_exception_handler
 from jesse.routes import router
 from jesse.models.OptimizationSession import store_optimization_session, get_optimization_session_by_id, update_optimization_session_status, update_optimization_session_state
@@ -116,3 +119,93 @@ def _get_training_and_testing_candles(
     testing_warmup_candles, testing_candles = load_candles(testing_start_date_timestamp, testing_finish_date_timestamp)
 
     return training_warmup_candles, training_candles, testing_warmup_candles, testing_candles
+
+
+def run_walk_forward(
+        session_id: str,
+        user_config: dict,
+        exchange: str,
+        routes: List[Dict[str, str]],
+        data_routes: List[Dict[str, str]],
+        start_date: str,
+        finish_date: str,
+        folds: int,
+        anchored: bool,
+        optimal_total: int,
+        fast_mode: bool,
+        cpu_cores: int,
+        state: dict,
+) -> dict:
+    """
+    Splits the period into `folds` rolling (or anchored) walk-forward folds, optimizes the training
+    segment of each fold, and evaluates its best hyperparameters on the segment that follows it.
+    """
+    if jh.python_version() == (3, 13):
+        raise ValueError(
+            'Optimization is not supported on Python 3.13. The "Ray" library used for optimization does not support Python 3.13 yet. Please use Python 3.12 or lower.')
+
+    from jesse.config import config, set_config
+    config['app']['trading_mode'] = 'optimize'
+
+    # validate cpu_cores
+    if cpu_cores < 1:
+        raise ValueError('cpu_cores must be an integer value greater than 0. Please check your settings page for optimization.')
+    max_cpu_cores = cpu_count()
+    if cpu_cores > max_cpu_cores:
+        raise ValueError(f'cpu_cores must be less than or equal to {max_cpu_cores} which is the number of cores on your machine.')
+
+    set_config(user_config)
+    for r in routes:
+        r['exchange'] = exchange
+    for r in data_routes:
+        r['exchange'] = exchange
+    router.initiate(routes, data_routes)
+    store.app.set_session_id(session_id)
+    register_custom_exception_handler()
+    validate_routes(router)
+
+    start_timestamp = jh.arrow_to_timestamp(arrow.get(start_date, 'YYYY-MM-DD'))
+    finish_timestamp = jh.arrow_to_timestamp(arrow.get(finish_date, 'YYYY-MM-DD'))
+    walk_forward_folds = get_folds(start_timestamp, finish_timestamp, folds, anchored)
+
+    # load the candles of the whole period once; every fold is sliced out of them
+    candles = _get_walk_forward_candles(start_timestamp, finish_timestamp)
+    warmup_length = jh.get_config('env.data.warmup_candles_num', 210) * TIMEFRAME_TO_ONE_MINUTES[
+        jh.max_timeframe(config['app']['considering_timeframes'])
+    ]
+
+    if get_optimization_session_by_id(session_id):
+        update_optimization_session_status(session_id, 'running')
+    else:
+        store_optimization_session(id=session_id, status='running')
+    update_optimization_session_state(session_id, state)
+
+    optimizer = WalkForwardOptimizer(
+        session_id,
+        user_config,
+        candles,
+        walk_forward_folds,
+        warmup_length,
+        fast_mode,
+        optimal_total,
+        cpu_cores
+    )
+
+    return optimizer.run()
+
+
+def _get_walk_forward_candles(start_date_timestamp: int, finish_date_timestamp: int) -> dict:
+    """
+    Loads the candles of the whole walk-forward period (prefixed with the warmup candles of the first fold)
+    """
+    warmup_candles, trading_candles = load_candles(start_date_timestamp, finish_date_timestamp)
+
+    candles = {}
+    for key, value in trading_candles.items():
+        warmup_arr = warmup_candles[key]['candles']
+        candles[key] = {
+            'exchange': value['exchange'],
+            'symbol': value['symbol'],
+            'candles': value['candles'] if warmup_arr is None else np.concatenate((warmup_arr, value['candles'])),
+        }
+    return candles
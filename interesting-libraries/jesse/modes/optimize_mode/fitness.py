@@ -1,7 +1,7 @@
 import sys
 from math import log10
 import jesse.helpers as jh
-from jesse.research.backtest import _isolated_backtest as isolated_backtest
+from jesse.research.backtest import _isolated_backtest as isolated_backtest, WarmBacktest
 from jesse.services import logger
 import numpy as np
 from jesse import exceptions
@@ -23,24 +23,31 @@ def _formatted_inputs_for_isolated_backtest(user_config, routes):
 def get_fitness(
         user_config: dict, routes: list, data_routes: list, strategy_hp, hp: dict,
         training_warmup_candles: dict, training_candles: dict,
-        testing_warmup_candles: dict, testing_candles: dict, optimal_total: int, fast_mode: bool
+        testing_warmup_candles: dict, testing_candles: dict, optimal_total: int, fast_mode: bool,
+        training_backtest: WarmBacktest = None, testing_backtest: WarmBacktest = None
 ) -> tuple:
     """
     Evaluates the fitness (i.e. backtest performance) of the strategy
     using the given hyperparameters (hp). The fitness score is calculated based on the backtest results.
+
+    If warm backtests are passed (as long-lived optimization workers do), they are used instead
+    of setting up an isolated backtest from scratch for the training and testing periods.
     """
     try:
         inputs = _formatted_inputs_for_isolated_backtest(user_config, routes)
         # Run backtest simulation for the training data using the suggested hyperparameters
-        training_metrics = isolated_backtest(
-            inputs,
-            routes,
-            data_routes,
-            candles=training_candles,
-            warmup_candles=training_warmup_candles,
-            hyperparameters=hp,
-            fast_mode=fast_mode
-        )['metrics']
+        if training_backtest is not None:
+            training_metrics = training_backtest.run(hp)['metrics']
+        else:
+            training_metrics = isolated_backtest(
+                inputs,
+                routes,
+                data_routes,
+                candles=training_candles,
+                warmup_candles=training_warmup_candles,
+                hyperparameters=hp,
+                fast_mode=fast_mode
+            )['metrics']
 
         # Calculate fitness score
         if training_metrics['total'] > 5:
@@ -82,16 +89,21 @@ def get_fitness(
                 logger.log_optimize_mode(f"NEGATIVE RATIO: hp is not usable => {objective_function_config}: {ratio}, total: {training_metrics['total']}")
                 return score, training_metrics, {}
 
-            # Run backtest for testing period
-            testing_metrics = isolated_backtest(
-                inputs,
-                routes,
-                data_routes,
-                candles=testing_candles,
-                warmup_candles=testing_warmup_candles,
-                hyperparameters=hp,
-                fast_mode=fast_mode
-            )['metrics']
+            # Run backtest for testing period (skipped when the caller evaluates the testing period itself)
+            if testing_backtest is not None:
+                testing_metrics = testing_backtest.run(hp)['metrics']
+            elif testing_candles is None:
+                testing_metrics = {}
+            else:
+                testing_metrics = isolated_backtest(
+                    inputs,
+                    routes,
+                    data_routes,
+                    candles=testing_candles,
+                    warmup_candles=testing_warmup_candles,
+                    hyperparameters=hp,
+                    fast_mode=fast_mode
+                )['metrics']
 
             # Calculate fitness score
             score = total_effect_rate * ratio_normalized
@@ -0,0 +1,459 @@
+import json
+import base64
+from datetime import timedelta
+from multiprocessing import cpu_count
+from typing import List, Tuple
+import numpy as np
+import jesse.helpers as jh
+import jesse.services.logger as logger
+from jesse import exceptions
+from jesse.modes.optimize_mode.fitness import get_fitness, _formatted_inputs_for_isolated_backtest
+from jesse.modes.optimize_mode.Optimize import generate_trial_params
+from jesse.research.backtest import _isolated_backtest as isolated_backtest
+from jesse.routes import router
+from jesse.services.indicator_kernels import warmup_routes_kernels
+from jesse.services.progressbar import Progressbar
+from jesse.services.redis import sync_publish, is_process_active
+from jesse.models.OptimizationSession import update_optimization_session_status, update_optimization_session_trials, get_optimization_session
+import traceback
+
+ONE_DAY_IN_MILLISECONDS = 86_400_000
+
+# metrics that are averaged across folds when aggregating the out-of-sample results
+RATIO_METRICS = (
+    'sharpe_ratio', 'calmar_ratio', 'sortino_ratio', 'omega_ratio', 'serenity_index', 'smart_sharpe', 'smart_sortino'
+)
+
+
+def get_folds(start_timestamp: int, finish_timestamp: int, folds: int, anchored: bool = False) -> List[dict]:
+    """
+    Splits the [start_timestamp, finish_timestamp) range into `folds + 1` equal, day-aligned segments.
+    Fold i is trained on segment i (or on segments 0 to i when anchored) and tested on segment i + 1.
+    The days that don't fit into an equal split are added to the testing segment of the last fold.
+    """
+    if folds < 1:
+        raise ValueError('folds must be an integer value greater than 0.')
+
+    days = (finish_timestamp - start_timestamp) // ONE_DAY_IN_MILLISECONDS
+    segment_days = days // (folds + 1)
+    if segment_days < 1:
+        raise exceptions.InvalidConfig(
+            f'The selected period is {days} days long which is not enough for {folds} walk-forward folds. '
+            f'At least {folds + 1} days are required.'
+        )
+    segment = segment_days * ONE_DAY_IN_MILLISECONDS
+
+    arr = []
+    for i in range(folds):
+        arr.append({
+            'index': i,
+            'training_start': start_timestamp if anchored else start_timestamp + i * segment,
+            'training_finish': start_timestamp + (i + 1) * segment,
+            'testing_start': start_timestamp + (i + 1) * segment,
+            'testing_finish': finish_timestamp if i == folds - 1 else start_timestamp + (i + 2) * segment,
+        })
+    return arr
+
+
+def slice_fold_candles(candles: dict, start_timestamp: int, finish_timestamp: int, warmup_length: int) -> Tuple[dict, dict]:
+    """
+    Slices the warmup and trading candles of a fold segment out of the shared candles (which
+    contain the warmup candles of the first fold followed by the candles of the whole period).
+    The warmup candles of a segment are simply the `warmup_length` 1m candles that precede it.
+    """
+    warmup_candles = {}
+    trading_candles = {}
+    for key, value in candles.items():
+        arr = value['candles']
+        start_index, finish_index = np.searchsorted(arr[:, 0], [start_timestamp, finish_timestamp])
+
+        if start_index < warmup_length:
+            raise exceptions.CandlesNotFound(
+                f'Not enough warmup candles for {value["symbol"]} on {value["exchange"]} '
+                f'before {jh.timestamp_to_date(start_timestamp)}'
+            )
+
+        trading_candles[key] = {
+            'exchange': value['exchange'],
+            'symbol': value['symbol'],
+            'candles': arr[start_index:finish_index],
+        }
+        warmup_candles[key] = {
+            'exchange': value['exchange'],
+            'symbol': value['symbol'],
+            'candles': arr[start_index - warmup_length:start_index],
+        }
+
+    if warmup_length == 0:
+        return None, trading_candles
+
+    return warmup_candles, trading_candles
+
+
+def aggregate_out_of_sample_metrics(folds_metrics: List[dict]) -> dict:
+    """
+    Combines the testing (out-of-sample) metrics of all folds into one set of metrics
+    """
+    traded = [m for m in folds_metrics if m and m.get('total', 0) > 0]
+    total = sum(m['total'] for m in traded)
+
+    result = {
+        'folds': len(folds_metrics),
+        'profitable_folds': sum(1 for m in traded if m['net_profit_percentage'] > 0),
+        'total': total,
+        # each fold starts over with the starting balance, hence compounding the fold returns
+        'net_profit_percentage': (np.prod([1 + m['net_profit_percentage'] / 100 for m in traded]) - 1) * 100,
+        'win_rate': 0 if total == 0 else sum(m['win_rate'] * m['total'] for m in traded) / total,
+        'max_drawdown': np.nan,
+    }
+
+    drawdowns = [m['max_drawdown'] for m in traded if _is_finite(m.get('max_drawdown'))]
+    if drawdowns:
+        result['max_drawdown'] = min(drawdowns)
+
+    for metric in RATIO_METRICS:
+        values = [m[metric] for m in traded if _is_finite(m.get(metric))]
+        result[metric] = np.mean(values) if values else np.nan
+
+    return result
+
+
+def _is_finite(value) -> bool:
+    return isinstance(value, (int, float)) and np.isfinite(value)
+
+
+# ray takes long to import, so the functions which run on it are wrapped with ray.remote() in run()
+def evaluate_fold_trial(
+    user_config,
+    formatted_routes,
+    formatted_data_routes,
+    strategy_hp,
+    hp,
+    candles,
+    fold,
+    warmup_length,
+    optimal_total,
+    fast_mode,
+    trial_number
+):
+    """Ray task which evaluates a trial on the training segment of a fold"""
+    try:
+        warmup_candles, training_candles = slice_fold_candles(
+            candles, fold['training_start'], fold['training_finish'], warmup_length
+        )
+        score, training_metrics, _ = get_fitness(
+            user_config,
+            formatted_routes,
+            formatted_data_routes,
+            strategy_hp,
+            hp,
+            warmup_candles,
+            training_candles,
+            None,
+            None,
+            optimal_total,
+            fast_mode
+        )
+
+        if jh.is_debugging():
+            logger.log_optimize_mode(f"Ray Fold {fold['index']} Trial {trial_number}: Score={score}, Params={hp}")
+
+        return {
+            'fold': fold['index'],
+            'trial_number': trial_number,
+            'score': score,
+            'params': hp,
+            'training_metrics': training_metrics,
+        }
+    except exceptions.RouteNotFound as e:
+        # Convert RouteNotFound to a standard RuntimeError to avoid serialization issues
+        error_msg = str(e)
+        logger.log_optimize_mode(f"Ray Fold {fold['index']} Trial {trial_number} failed with RouteNotFound: {error_msg}")
+        raise RuntimeError(f"RouteNotFound: {error_msg}")
+    except Exception as e:
+        logger.log_optimize_mode(f"Ray Fold {fold['index']} Trial {trial_number} failed with exception: {str(e)}")
+        raise
+
+
+def evaluate_fold_testing(
+    user_config,
+    formatted_routes,
+    formatted_data_routes,
+    hp,
+    candles,
+    fold,
+    warmup_length,
+    fast_mode
+):
+    """Ray task which backtests the best hyperparameters of a fold on its testing segment"""
+    warmup_candles, testing_candles = slice_fold_candles(
+        candles, fold['testing_start'], fold['testing_finish'], warmup_length
+    )
+    return isolated_backtest(
+        _formatted_inputs_for_isolated_backtest(user_config, formatted_routes),
+        formatted_routes,
+        formatted_data_routes,
+        candles=testing_candles,
+        warmup_candles=warmup_candles,
+        hyperparameters=hp,
+        fast_mode=fast_mode
+    )['metrics']
+
+
+class WalkForwardOptimizer:
+    """
+    Optimizes the training segment of every fold in parallel and evaluates the best
+    hyperparameters of each fold on the segment that follows it (out-of-sample).
+    """
+    def __init__(
+            self,
+            session_id: str,
+            user_config: dict,
+            candles: dict,
+            folds: List[dict],
+            warmup_length: int,
+            fast_mode: bool,
+            optimal_total: int,
+            cpu_cores: int,
+    ) -> None:
+        if jh.python_version() == (3, 13):
+            raise ValueError(
+                'Optimization is not supported on Python 3.13. The Ray library used for optimization does not support Python 3.13 yet. Please use Python 3.12 or lower.')
+
+        self.session_id = session_id
+
+        strategy_class = jh.get_strategy_class(router.routes[0].strategy_name)
+        self.strategy_hp = strategy_class.hyperparameters(None)
+
+        if not self.strategy_hp:
+            update_optimization_session_status(self.session_id, 'stopped')
+            raise exceptions.InvalidStrategy('Targeted strategy does not implement a valid hyperparameters() method.')
+
+        self.start_time = jh.now_to_timestamp()
+        self.user_config = user_config
+        self.candles = candles
+        self.folds = folds
+        self.warmup_length = warmup_length
+        self.fast_mode = fast_mode
+        self.optimal_total = optimal_total
+
+        if cpu_cores < 1:
+            raise ValueError('cpu_cores must be an integer value greater than 0.')
+        available = cpu_count()
+        self.cpu_cores = cpu_cores if cpu_cores <= available else available
+
+        # number of trials for each fold
+        self.n_trials = len(self.strategy_hp) * jh.get_config('env.optimization.trials', 200)
+        self.total_trials = self.n_trials * len(self.folds)
+        self.completed_trials = 0
+        self.progressbar = Progressbar(self.total_trials)
+
+        # per fold state
+        self.launched_trials = [0] * len(self.folds)
+        self.finished_trials = [0] * len(self.folds)
+        self.best_trials = [None] * len(self.folds)
+        self.fold_results = [None] * len(self.folds)
+
+        import ray
+        if not ray.is_initialized():
+            try:
+                ray.init(num_cpus=self.cpu_cores, ignore_reinit_error=True)
+                logger.log_optimize_mode(f"Successfully started walk-forward optimization session with {self.cpu_cores} CPU cores")
+            except Exception as e:
+                logger.log_optimize_mode(f"Error initializing Ray: {e}. Falling back to 1 CPU.")
+                self.cpu_cores = 1
+                ray.init(num_cpus=1, ignore_reinit_error=True)
+
+        # Setup a periodic termination check in case the user ends the session
+        client_id = jh.get_session_id()
+        from timeloop import Timeloop
+        self.tl = Timeloop()
+
+        @self.tl.job(interval=timedelta(seconds=1))
+        def check_for_termination():
+            if is_process_active(client_id) is False:
+                if get_optimization_session(self.session_id)['status'] != 'terminated':
+                    update_optimization_session_status(self.session_id, 'stopped')
+                raise exceptions.Termination
+        self.tl.start()
+
+    def _next_fold_to_launch(self):
+        """Picks the fold with the fewest launched trials so that all folds progress together"""
+        fold_index = int(np.argmin(self.launched_trials))
+        if self.launched_trials[fold_index] >= self.n_trials:
+            return None
+        return fold_index
+
+    def _process_trial_result(self, result: dict) -> bool:
+        """
+        Keeps track of the best trial of the fold. Returns True if this was the fold's last trial.
+        """
+        fold_index = result['fold']
+        self.completed_trials += 1
+        self.finished_trials[fold_index] += 1
+        self.progressbar.update()
+
+        best = self.best_trials[fold_index]
+        if result['score'] > 0.0001 and (best is None or result['score'] > best['score']):
+            self.best_trials[fold_index] = result
+
+        sync_publish('general_info', {
+            'started_at': jh.timestamp_to_arrow(self.start_time).humanize(),
+            'trial': f'{self.completed_trials}/{self.total_trials}',
+            'folds': len(self.folds),
+            'objective_function': jh.get_config('env.optimization.objective_function', 'sharpe'),
+            'exchange_type': self.user_config['exchange']['type'],
+            'leverage_mode': self.user_config['exchange']['futures_leverage_mode'],
+            'leverage': self.user_config['exchange']['futures_leverage'],
+            'cpu_cores': self.cpu_cores,
+        })
+        sync_publish('progressbar', {
+            'current': self.progressbar.current,
+            'estimated_remaining_seconds': self.progressbar.estimated_remaining_seconds
+        })
+
+        return self.finished_trials[fold_index] == self.n_trials
+
+    def _process_fold_result(self, fold_index: int, testing_metrics: dict) -> None:
+        fold = self.folds[fold_index]
+        best = self.best_trials[fold_index]
+        params = best['params'] if best else {}
+
+        self.fold_results[fold_index] = {
+            'fold': fold_index,
+            'trial': best['trial_number'] if best else None,
+            'params': params,
+            'fitness': round(best['score'], 4) if best else 0,
+            'dna': base64.b64encode(json.dumps(params, sort_keys=True).encode()).decode(),
+            'training_period': f"{jh.timestamp_to_date(fold['training_start'])} - {jh.timestamp_to_date(fold['training_finish'])}",
+            'testing_period': f"{jh.timestamp_to_date(fold['testing_start'])} - {jh.timestamp_to_date(fold['testing_finish'])}",
+            'training_metrics': best['training_metrics'] if best else {},
+            'testing_metrics': testing_metrics,
+        }
+
+        finished_folds = [r for r in self.fold_results if r is not None]
+        sync_publish('walk_forward_folds', finished_folds)
+        update_optimization_session_trials(
+            self.session_id,
+            self.completed_trials,
+            finished_folds,
+            None,
+            self.total_trials
+        )
+
+    def run(self) -> dict:
+        import ray
+        ray_evaluate_fold_trial = ray.remote(evaluate_fold_trial)
+        ray_evaluate_fold_testing = ray.remote(evaluate_fold_testing)
+
+        logger.log_optimize_mode(
+            f"Walk-forward optimization session started with {len(self.folds)} folds and {self.cpu_cores} CPU cores"
+        )
+
+        try:
+            update_optimization_session_trials(self.session_id, 0, [], [], self.total_trials)
+            warmup_routes_kernels(router.formatted_routes, logger.log_optimize_mode)
+
+            # put the shared candles into Ray's object store once instead of sending them with every trial
+            candles_ref = ray.put(self.candles)
+            max_workers = self.cpu_cores * 2
+            # maps each active ref to its kind ('trial' or 'testing') and fold index
+            active_refs = {}
+
+            while any(r is None for r in self.fold_results):
+                while len(active_refs) < max_workers:
+                    fold_index = self._next_fold_to_launch()
+                    if fold_index is None:
+                        break
+
+                    ref = ray_evaluate_fold_trial.options(num_cpus=1).remote(
+                        self.user_config,
+                        router.formatted_routes,
+                        router.formatted_data_routes,
+                        self.strategy_hp,
+                        generate_trial_params(self.strategy_hp),
+                        candles_ref,
+                        self.folds[fold_index],
+                        self.warmup_length,
+                        self.optimal_total,
+                        self.fast_mode,
+                        self.launched_trials[fold_index]
+                    )
+                    active_refs[ref] = ('trial', fold_index)
+                    self.launched_trials[fold_index] += 1
+
+                if not active_refs:
+                    break
+
+                done_refs, _ = ray.wait(list(active_refs.keys()), num_returns=1, timeout=0.5)
+
+                for ref in done_refs:
+                    kind, fold_index = active_refs.pop(ref)
+                    try:
+                        result = ray.get(ref)
+                    except ray.exceptions.RayTaskError as e:
+                        if hasattr(e, 'cause') and isinstance(e.cause, RuntimeError) and 'RouteNotFound:' in str(e.cause):
+                            raise e.cause
+                        jh.debug(f'Ray task error for fold {fold_index}: {e}')
+                        raise
+
+                    if kind == 'testing':
+                        self._process_fold_result(fold_index, result)
+                        continue
+
+                    is_fold_finished = self._process_trial_result(result)
+                    if not is_fold_finished:
+                        continue
+
+                    best = self.best_trials[fold_index]
+                    if best is None:
+                        logger.log_optimize_mode(f"Fold {fold_index} found no usable hyperparameters")
+                        self._process_fold_result(fold_index, {})
+                        continue
+
+                    testing_ref = ray_evaluate_fold_testing.options(num_cpus=1).remote(
+                        self.user_config,
+                        router.formatted_routes,
+                        router.formatted_data_routes,
+                        best['params'],
+                        candles_ref,
+                        self.folds[fold_index],
+                        self.warmup_length,
+                        self.fast_mode
+                    )
+                    active_refs[testing_ref] = ('testing', fold_index)
+
+            out_of_sample = aggregate_out_of_sample_metrics([r['testing_metrics'] for r in self.fold_results])
+            sync_publish('walk_forward_summary', out_of_sample)
+
+            update_optimization_session_trials(
+                self.session_id,
+                self.completed_trials,
+                self.fold_results,
+                None,
+                self.total_trials
+            )
+            update_optimization_session_status(self.session_id, 'finished')
+
+            sync_publish('alert', {
+                'message': f"Finished {len(self.folds)} walk-forward folds. Out-of-sample net profit: {round(out_of_sample['net_profit_percentage'], 2)}%",
+                'type': 'success'
+            })
+
+        except exceptions.Termination:
+            logger.log_optimize_mode("Walk-forward optimization terminated by user")
+            update_optimization_session_status(self.session_id, 'stopped')
+            raise
+        except Exception as e:
+            logger.log_optimize_mode(f"Error during walk-forward optimization: {e}")
+            update_optimization_session_status(self.session_id, 'stopped')
+            from jesse.models.OptimizationSession import add_session_exception
+            add_session_exception(self.session_id, str(e), str(traceback.format_exc()))
+            raise
+        finally:
+            ray.shutdown()
+
+        return {
+            'folds': self.fold_results,
+            'out_of_sample': out_of_sample,
+        }
@@ -20,13 +20,28 @@ def save_daily_portfolio_balance(is_initial=False) -> None:
     #             'asset': asset_key,
     #             'balance': asset_value,
     #         })
+    total_balances = portfolio_value()
+
+    store.app.daily_balance.append(total_balances)
+
+    if not jh.is_livetrading():
+        logger.info(f'Saved daily portfolio balance: {round(total_balances, 2)}')
+
+
+def portfolio_value() -> float:
+    """
+    The current value of the portfolio: the wallet balance plus the PNL of open
+    positions for futures, and the cash plus the value of the assets for spot.
+    """
+    from jesse.store import store
+
     total_balances = 0
     # select the first item in store.exchanges.storage.items()
     try:
         e, = store.exchanges.storage.values()
     except ValueError:
         raise ValueError('Multiple exchange support is not supported at the moment')
-    
+
     if e.type == 'futures':
         # For futures, add wallet balance and sum of all PNLs
         total_balances = e.assets[jh.app_currency()]
@@ -40,10 +55,7 @@ def save_daily_portfolio_balance(is_initial=False) -> None:
             total_balances = pos.strategy.portfolio_value
             break
 
-    store.app.daily_balance.append(total_balances)
-
-    if not jh.is_livetrading():
-        logger.info(f'Saved daily portfolio balance: {round(total_balances, 2)}')
+    return total_balances
 
 
 def get_exchange_type(exchange_name: str) -> str:
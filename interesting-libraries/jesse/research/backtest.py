@@ -16,7 +16,9 @@ def backtest(
         generate_json: bool = False,
         generate_logs: bool = False,
         hyperparameters: dict = None,
-        fast_mode: bool = False
+        fast_mode: bool = False,
+        intraday_equity_curve: bool = False,
+        parallel_routes: int = 0,
 ) -> dict:
     """
     An isolated backtest() function which is perfect for using in research, and AI training
@@ -48,6 +50,11 @@ def backtest(
             'candles': np.array([]),
         },
     }
+
+    `parallel_routes` (experimental) is the number of threads which evaluate the strategies'
+    @cached properties (such as their indicators) before the routes are executed in their
+    usual order. It is only worth it with many routes, and it requires those properties to
+    depend on nothing but the candles. 0 or 1 disables it.
     """
     return _isolated_backtest(
         config,
@@ -65,6 +72,8 @@ def backtest(
         generate_hyperparameters=generate_hyperparameters,
         generate_logs=generate_logs,
         fast_mode=fast_mode,
+        intraday_equity_curve=intraday_equity_curve,
+        parallel_routes=parallel_routes,
     )
 
 
@@ -84,13 +93,80 @@ def _isolated_backtest(
         generate_hyperparameters: bool = False,
         generate_logs: bool = False,
         fast_mode: bool = False,
+        intraday_equity_curve: bool = False,
+        parallel_routes: int = 0,
 ) -> dict:
-    from jesse.services.validators import validate_routes
     from jesse.modes.backtest_mode import simulator
-    from jesse.config import config as jesse_config, reset_config
+    from jesse.config import reset_config
+    from jesse.store import store
+
+    trading_candles_dict = _prepare_isolated_backtest(config, routes, data_routes, candles, warmup_candles)
+
+    # run backtest simulation
+    backtest_result = simulator(
+        trading_candles_dict,
+        run_silently,
+        hyperparameters=hyperparameters,
+        generate_tradingview=generate_tradingview,
+        generate_csv=generate_csv,
+        generate_json=generate_json,
+        generate_equity_curve=generate_equity_curve,
+        benchmark=benchmark,
+        generate_hyperparameters=generate_hyperparameters,
+        generate_logs=generate_logs,
+        fast_mode=fast_mode,
+        intraday_equity_curve=intraday_equity_curve,
+        parallel_routes=parallel_routes,
+    )
+
+    result = {
+        'metrics': {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0},
+        'logs': None,
+    }
+
+    if backtest_result['metrics'] is None:
+        result['metrics'] = {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}
+    else:
+        result['metrics'] = backtest_result['metrics']
+
+    if generate_tradingview:
+        result['tradingview'] = backtest_result['tradingview']
+    if generate_csv:
+        result['csv'] = backtest_result['csv']
+    if generate_json:
+        result['json'] = backtest_result['json']
+    if generate_equity_curve:
+        result['equity_curve'] = backtest_result['equity_curve']
+    if generate_hyperparameters:
+        result['hyperparameters'] = backtest_result['hyperparameters']
+    if generate_logs:
+        result['logs'] = backtest_result['logs']
+    if intraday_equity_curve:
+        # (timestamps, equity) of every 1m candle
+        result['intraday_equity_curve'] = backtest_result['intraday_equity']
+
+    # reset store and config so rerunning would be flawlessly possible
+    reset_config()
+    store.reset()
+
+    return result
+
+
+def _prepare_isolated_backtest(
+        config: dict,
+        routes: List[Dict[str, str]],
+        data_routes: List[Dict[str, str]],
+        candles: dict,
+        warmup_candles: dict = None,
+) -> dict:
+    """
+    Injects the config, routes and warmup candles into the store and returns
+    a copy of the trading candles that is safe to be used by the simulator.
+    """
+    from jesse.services.validators import validate_routes
+    from jesse.config import config as jesse_config, set_config
     from jesse.routes import router
     from jesse.store import store
-    from jesse.config import set_config
     from jesse.services.candle import inject_warmup_candles_to_store
     import jesse.helpers as jh
 
@@ -104,6 +180,11 @@ def _isolated_backtest(
 
     validate_routes(router)
 
+    # the exchange drivers are created when the API is first imported, so the exchanges
+    # of a previous backtest in this process might not include the ones of this backtest
+    from jesse.services.api import api
+    api.initiate_drivers()
+
     # initiate candle store
     store.candles.init_storage(5000)
 
@@ -121,62 +202,69 @@ def _isolated_backtest(
 
     # make a copy to make sure we don't mutate the past data causing some issues for multiprocessing tasks
     trading_candles_dict = copy.deepcopy(candles)
-    warmup_candles_dict = copy.deepcopy(warmup_candles)
 
     # if warmup_candles is passed, use it
     if warmup_candles:
         for c in jesse_config['app']['considering_candles']:
             key = jh.key(c[0], c[1])
-            # inject warm-up candles
+            # inject warm-up candles (they are copied into the store, so no need to deepcopy them)
             inject_warmup_candles_to_store(
-                warmup_candles_dict[key]['candles'],
+                warmup_candles[key]['candles'],
                 c[0],
                 c[1]
             )
 
-    # run backtest simulation
-    backtest_result = simulator(
-        trading_candles_dict,
-        run_silently,
-        hyperparameters=hyperparameters,
-        generate_tradingview=generate_tradingview,
-        generate_csv=generate_csv,
-        generate_json=generate_json,
-        generate_equity_curve=generate_equity_curve,
-        benchmark=benchmark,
-        generate_hyperparameters=generate_hyperparameters,
-        generate_logs=generate_logs,
-        fast_mode=fast_mode,
-    )
+    return trading_candles_dict
 
-    result = {
-        'metrics': {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0},
-        'logs': None,
-    }
 
-    if backtest_result['metrics'] is None:
-        result['metrics'] = {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}
-    else:
-        result['metrics'] = backtest_result['metrics']
+class WarmBacktest:
+    """
+    Same as _isolated_backtest() but meant for running many backtests on the same candles with
+    different hyperparameters (such as in the optimize mode). The config, routes, warmup candles and
+    their generated bigger timeframes are loaded only once; between runs only the trading state is reset.
 
-    if generate_tradingview:
-        result['tradingview'] = backtest_result['tradingview']
-    if generate_csv:
-        result['csv'] = backtest_result['csv']
-    if generate_json:
-        result['json'] = backtest_result['json']
-    if generate_equity_curve:
-        result['equity_curve'] = backtest_result['equity_curve']
-    if generate_hyperparameters:
-        result['hyperparameters'] = backtest_result['hyperparameters']
-    if generate_logs:
-        result['logs'] = backtest_result['logs']
+    Since the store is global, all instances living in the same process must share the same routes.
+    """
+    def __init__(
+            self,
+            config: dict,
+            routes: List[Dict[str, str]],
+            data_routes: List[Dict[str, str]],
+            candles: dict,
+            warmup_candles: dict = None,
+            fast_mode: bool = False,
+    ) -> None:
+        from jesse.store import store
 
-    # reset store and config so rerunning would be flawlessly possible
-    reset_config()
-    store.reset()
+        self.config = config
+        self.fast_mode = fast_mode
+        self.candles = _prepare_isolated_backtest(config, routes, data_routes, candles, warmup_candles)
+        self._candles_state = store.candles
+        self._snapshot = store.candles.snapshot()
 
-    return result
+    def run(self, hyperparameters: dict = None) -> dict:
+        from jesse.modes.backtest_mode import simulator
+        from jesse.config import config as jesse_config, set_config
+        from jesse.store import store
+
+        jesse_config['app']['trading_mode'] = 'backtest'
+        set_config(_format_config(self.config))
+
+        store.candles = self._candles_state
+        store.candles.restore_snapshot(self._snapshot)
+        store.reset_trading_state()
+
+        backtest_result = simulator(
+            self.candles,
+            run_silently=True,
+            hyperparameters=hyperparameters,
+            fast_mode=self.fast_mode,
+        )
+
+        if backtest_result['metrics'] is None:
+            return {'metrics': {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}}
+
+        return {'metrics': backtest_result['metrics']}
 
 
 def _format_config(config):
@@ -0,0 +1,191 @@
+from multiprocessing import cpu_count, get_context
+from typing import List, Dict
+
+import numpy as np
+
+import jesse.helpers as jh
+
+
+def portfolio_backtest(
+        configs: Dict[str, dict],
+        routes: List[Dict[str, str]],
+        data_routes: List[Dict[str, str]],
+        candles: dict,
+        warmup_candles: dict = None,
+        group_by: str = 'symbol',
+        cores: int = None,
+        hyperparameters: dict = None,
+        fast_mode: bool = False,
+        generate_equity_curve: bool = False,
+) -> dict:
+    """
+    Backtests a portfolio of routes, possibly on several exchanges, by splitting it into shards
+    which are backtested in parallel processes, and merges their daily balances and trades
+    into portfolio-level metrics.
+
+    A shard is either the routes of one (exchange, symbol) when group_by is 'symbol', or the
+    routes of one exchange when it's 'exchange'. The starting balance of an exchange is divided
+    equally between its shards, so with group_by='symbol' the routes of the same exchange don't
+    share their margin anymore. Use it for routes that don't depend on each other; group_by='exchange'
+    gives the same results as backtesting each exchange on its own.
+
+    Example `configs` (the same format as the `config` of backtest(), by exchange):
+    {
+        'Binance Perpetual Futures': {
+            'starting_balance': 10_000,
+            'fee': 0.0004,
+            'type': 'futures',
+            'futures_leverage': 2,
+            'futures_leverage_mode': 'cross',
+            'warm_up_candles': 210
+        },
+    }
+
+    `routes`, `data_routes`, `candles` and `warmup_candles` are the same as for backtest(). Since the
+    shards run in spawned processes, strategies that are passed as classes must be importable.
+    cores=1 runs the shards one after another in this process.
+    """
+    if group_by not in ('symbol', 'exchange'):
+        raise ValueError(f'group_by must be either "symbol" or "exchange". You passed: {group_by}')
+
+    shards = split_routes(configs, routes, data_routes, candles, warmup_candles, group_by)
+    cores = min(cores or cpu_count(), len(shards))
+
+    kwargs = {'hyperparameters': hyperparameters, 'fast_mode': fast_mode}
+    if cores == 1:
+        results = [_backtest_shard(shard, **kwargs) for shard in shards]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=cores, mp_context=get_context('spawn')) as executor:
+            futures = [executor.submit(_backtest_shard, shard, **kwargs) for shard in shards]
+            results = [f.result() for f in futures]
+
+    return merge_shards(shards, results, generate_equity_curve)
+
+
+def split_routes(
+        configs: Dict[str, dict],
+        routes: List[Dict[str, str]],
+        data_routes: List[Dict[str, str]],
+        candles: dict,
+        warmup_candles: dict = None,
+        group_by: str = 'symbol',
+) -> List[dict]:
+    """
+    Splits the routes into shards (in the order of the routes) that can be passed to backtest().
+    The data routes of a shard's symbols go with it; the other data routes of the same
+    exchange are added to every shard of that exchange.
+    """
+    groups = {}
+    for r in routes:
+        if r['exchange'] not in configs:
+            raise ValueError(f'No config is passed for the "{r["exchange"]}" exchange')
+        key = (r['exchange'], r['symbol']) if group_by == 'symbol' else (r['exchange'],)
+        groups.setdefault(key, []).append(r)
+
+    shards_per_exchange = {}
+    for key in groups:
+        shards_per_exchange[key[0]] = shards_per_exchange.get(key[0], 0) + 1
+
+    shards = []
+    for key, shard_routes in groups.items():
+        exchange = key[0]
+        traded_symbols = {r['symbol'] for r in routes if r['exchange'] == exchange}
+        symbols = {r['symbol'] for r in shard_routes}
+        shard_data_routes = [
+            d for d in data_routes
+            if d['exchange'] == exchange and (d['symbol'] in symbols or d['symbol'] not in traded_symbols)
+        ]
+        keys = {jh.key(exchange, s) for s in symbols | {d['symbol'] for d in shard_data_routes}}
+
+        config = {**configs[exchange], 'exchange': exchange}
+        if shards_per_exchange[exchange] > 1:
+            config['starting_balance'] = configs[exchange]['starting_balance'] / shards_per_exchange[exchange]
+
+        shards.append({
+            'name': ' '.join(key),
+            'config': config,
+            'routes': shard_routes,
+            'data_routes': shard_data_routes,
+            # in the passed order, which is the order that the symbols are simulated in
+            'candles': {k: v for k, v in candles.items() if k in keys},
+            'warmup_candles': {k: v for k, v in warmup_candles.items() if k in keys} if warmup_candles else None,
+        })
+
+    return shards
+
+
+def _backtest_shard(shard: dict, hyperparameters: dict = None, fast_mode: bool = False) -> dict:
+    from jesse.config import reset_config
+    from jesse.modes.backtest_mode import simulator
+    from jesse.research.backtest import _prepare_isolated_backtest
+    from jesse.services import metrics
+    from jesse.store import store
+
+    trading_candles_dict = _prepare_isolated_backtest(
+        shard['config'], shard['routes'], shard['data_routes'], shard['candles'], shard['warmup_candles']
+    )
+    backtest_result = simulator(
+        trading_candles_dict, run_silently=True, hyperparameters=hyperparameters, fast_mode=fast_mode
+    )
+
+    result = {
+        'metrics': backtest_result['metrics'] or {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0},
+        'trades': [t.to_dict for t in store.completed_trades.trades],
+        'daily_balance': list(store.app.daily_balance),
+        'balances': metrics._balances(),
+        'open_trades': (store.app.total_open_trades, store.app.total_open_pl),
+        'starting_time': store.app.starting_time,
+    }
+
+    # reset store and config so rerunning would be flawlessly possible
+    reset_config()
+    store.reset()
+
+    return result
+
+
+def merge_shards(shards: List[dict], results: List[dict], generate_equity_curve: bool = False) -> dict:
+    """
+    Merges the results of the shards into the portfolio's metrics, trades and daily balance.
+    """
+    from jesse.services import metrics
+
+    lengths = {len(r['daily_balance']) for r in results}
+    if len(lengths) != 1:
+        raise ValueError('All the shards must be backtested on the same period of candles')
+
+    daily_balance = np.sum([r['daily_balance'] for r in results], axis=0).tolist()
+    # closed trades in the order that they were closed in (and in the order of the routes when at the same time)
+    trades = [t for r in results for t in r['trades']]
+    order = np.argsort([t['closed_at'] for t in trades], kind='stable')
+    trades = [trades[i] for i in order]
+
+    trades_arr = np.empty(len(trades), dtype=metrics.TRADES_DTYPE)
+    for i, t in enumerate(trades):
+        trades_arr[i] = (t['PNL'], t['PNL_percentage'], t['fee'], t['holding_period'], t['type'] == 'long')
+
+    balances = tuple(sum(r['balances'][i] for r in results) for i in range(2))
+    open_trades = tuple(sum(r['open_trades'][i] for r in results) for i in range(2))
+
+    result = {
+        'metrics': metrics.trades(trades_arr, daily_balance, balances=balances, open_trades=open_trades),
+        'trades': trades,
+        'daily_balance': daily_balance,
+        'shards': [
+            {
+                'name': shard['name'],
+                'routes': shard['routes'],
+                'metrics': r['metrics'],
+                'daily_balance': r['daily_balance'],
+            }
+            for shard, r in zip(shards, results)
+        ],
+    }
+    if generate_equity_curve:
+        from jesse.services.charts import sharded_equity_curve
+        result['equity_curve'] = sharded_equity_curve(
+            results[0]['starting_time'], daily_balance, {s['name']: r['daily_balance'] for s, r in zip(shards, results)}
+        ) if len(trades) else None
+
+    return result
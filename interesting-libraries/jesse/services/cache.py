@@ -127,4 +127,6 @@ def cached(method):
             self._cached_methods[method] = cached_method
         return cached_method(self, *args, **kwargs)
 
+    # lets Strategy._prepare() find the cached properties
+    decorated.is_cached = True
     return decorated
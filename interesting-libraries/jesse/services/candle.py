@@ -5,7 +5,8 @@ from jesse.exceptions import CandleNotFoundInDatabase, InvalidDateRange
 import jesse.helpers as jh
 from jesse.services import logger
 from jesse.models import Candle
-from typing import List, Dict
+from jesse.models.CandleAggregate import CANDLE_AGGREGATE_TIMEFRAMES, delete_candle_aggregates
+from typing import List, Dict, Union
 
 
 def generate_candle_from_one_minutes(
@@ -31,6 +32,78 @@ def generate_candle_from_one_minutes(
     ])
 
 
+def resample(
+        candles: np.ndarray,
+        timeframe: str,
+        keep_partial: bool = False,
+        anchored: bool = False
+) -> np.ndarray:
+    """
+    Generates all the candles of `timeframe` from an array of 1m candles at once.
+
+    By default, every `timeframe_to_one_minutes(timeframe)` consecutive 1m candles make
+    one candle (the same as calling generate_candle_from_one_minutes() on each chunk).
+    With anchored=True, the 1m candles are bucketed by their timestamps instead (bucket
+    starts are multiples of the timeframe's duration), so gaps in the data don't shift
+    the following candles.
+
+    The trailing partial (still forming) candle is left out unless keep_partial is True.
+    """
+    if anchored:
+        resampled, counts = _resample_by_timestamp(candles, timeframe)
+        if not keep_partial and len(resampled) and counts[-1] != jh.timeframe_to_one_minutes(timeframe):
+            duration = jh.timeframe_to_one_minutes(timeframe) * 60_000
+            # the last bucket isn't partial if it's only missing candles in the middle
+            if candles[-1][0] != resampled[-1][0] + duration - 60_000:
+                resampled = resampled[:-1]
+        return resampled
+
+    num = jh.timeframe_to_one_minutes(timeframe)
+    complete_count = len(candles) // num
+
+    body = candles[:complete_count * num].reshape(complete_count, num, 6)
+    resampled = np.column_stack((
+        body[:, 0, 0],
+        body[:, 0, 1],
+        body[:, -1, 2],
+        body[:, :, 3].max(axis=1),
+        body[:, :, 4].min(axis=1),
+        body[:, :, 5].sum(axis=1),
+    ))
+
+    if keep_partial and len(candles) % num:
+        partial = generate_candle_from_one_minutes(timeframe, candles[complete_count * num:], True)
+        resampled = np.vstack((resampled, partial))
+
+    return resampled
+
+
+def _resample_by_timestamp(candles: np.ndarray, timeframe: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the candles of `timeframe` bucketed by timestamp, and the number
+    of 1m candles in each bucket
+    """
+    if len(candles) == 0:
+        return np.empty((0, 6)), np.empty(0, dtype=int)
+
+    duration = jh.timeframe_to_one_minutes(timeframe) * 60_000
+    starts = candles[:, 0] - candles[:, 0] % duration
+
+    firsts = np.concatenate(([0], np.flatnonzero(np.diff(starts)) + 1))
+    lasts = np.append(firsts[1:], len(candles)) - 1
+
+    resampled = np.column_stack((
+        starts[firsts],
+        candles[firsts, 1],
+        candles[lasts, 2],
+        np.maximum.reduceat(candles[:, 3], firsts),
+        np.minimum.reduceat(candles[:, 4], firsts),
+        np.add.reduceat(candles[:, 5], firsts),
+    ))
+
+    return resampled, lasts - firsts + 1
+
+
 def candle_dict_to_np_array(candle: dict) -> np.ndarray:
     return np.array([
         candle['timestamp'],
@@ -165,6 +238,33 @@ def split_candle(candle: np.ndarray, price: float) -> tuple:
         ])
 
 
+def stack_candles(candles_list: List[np.ndarray], length: int = None) -> np.ndarray:
+    """
+    Stacks the candles of several symbols into a (symbols, length, 6) array, aligned on
+    their last candle. Symbols with fewer candles (such as a recent listing) are padded
+    with NaN rows at the beginning. The length defaults to that of the longest one.
+    """
+    if length is None:
+        length = max((len(c) for c in candles_list), default=0)
+
+    stacked = np.full((len(candles_list), length, 6), np.nan)
+    last_timestamp = None
+    for i, candles in enumerate(candles_list):
+        if len(candles) == 0 or length == 0:
+            continue
+        if last_timestamp is None:
+            last_timestamp = candles[-1, 0]
+        elif candles[-1, 0] != last_timestamp:
+            raise ValueError(
+                f'Candles are not aligned: the last candle of #{i} is at {jh.timestamp_to_time(candles[-1, 0])} '
+                f'instead of {jh.timestamp_to_time(last_timestamp)}'
+            )
+        candles = candles[-length:]
+        stacked[i, length - len(candles):] = candles
+
+    return stacked
+
+
 def inject_warmup_candles_to_store(candles: np.ndarray, exchange: str, symbol: str) -> None:
     if candles is None or candles.size == 0:
         raise ValueError(f'Could not inject warmup candles because the passed candles are empty. Have you imported enough warmup candles for {exchange}/{symbol}?')
@@ -172,33 +272,12 @@ def inject_warmup_candles_to_store(candles: np.ndarray, exchange: str, symbol: s
     from jesse.config import config
     from jesse.store import store
 
-    # batch add 1m candles:
-    store.candles.batch_add_candle(candles, exchange, symbol, '1m', with_generation=False)
-
-    # loop to generate, and add candles (without execution)
-    for i in range(len(candles)):
-        for timeframe in config['app']['considering_timeframes']:
-            # skip 1m. already added
-            if timeframe == '1m':
-                continue
-
-            num = jh.timeframe_to_one_minutes(timeframe)
-
-            if (i + 1) % num == 0:
-                generated_candle = generate_candle_from_one_minutes(
-                    timeframe,
-                    candles[(i - (num - 1)):(i + 1)],
-                    True
-                )
-
-                store.candles.add_candle(
-                    generated_candle,
-                    exchange,
-                    symbol,
-                    timeframe,
-                    with_execution=False,
-                    with_generation=False
-                )
+    # generate candles of bigger timeframes, and add them with the 1m candles (without execution)
+    generated_by_timeframe = {
+        timeframe: resample(candles, timeframe)
+        for timeframe in config['app']['considering_timeframes'] if timeframe != '1m'
+    }
+    store.candles.bulk_load(exchange, symbol, candles, generated_by_timeframe)
 
 
 def get_candles(
@@ -225,6 +304,23 @@ def get_candles(
         warmup_start_timestamp = warmup_finish_timestamp - (
                 warmup_candles_num * jh.timeframe_to_one_minutes(timeframe) * 60_000)
         warmup_finish_timestamp -= 60_000
+
+    # hourly and daily candles are materialized, no need to load and regenerate the 1m candles
+    if not is_for_jesse and timeframe in CANDLE_AGGREGATE_TIMEFRAMES:
+        trading_candles = _get_aggregated_candles_from_db(
+            exchange, symbol, timeframe, trading_start_date_timestamp, trading_finish_date_timestamp
+        )
+        if warmup_candles_num > 0:
+            warmup_candles = _get_aggregated_candles_from_db(
+                exchange, symbol, timeframe, warmup_start_timestamp, warmup_finish_timestamp
+            )
+        else:
+            warmup_candles = None
+
+        if trading_candles is not None and (warmup_candles_num == 0 or warmup_candles is not None):
+            return warmup_candles, trading_candles
+
+    if warmup_candles_num > 0:
         warmup_candles = _get_candles_from_db(exchange, symbol, warmup_start_timestamp, warmup_finish_timestamp,
                                               caching=caching)
     else:
@@ -328,22 +424,32 @@ def _get_candles_from_db(
     return candles_array
 
 
+def _get_aggregated_candles_from_db(
+        exchange: str, symbol: str, timeframe: str, start_date_timestamp: int, finish_date_timestamp: int
+) -> Union[np.ndarray, None]:
+    """
+    Returns the materialized candles of the range, or None if some of them are
+    missing (for example because of missing 1m candles) in which case the caller
+    falls back to generating them from the 1m candles (and its validations).
+    """
+    from jesse.models.CandleAggregate import get_candle_aggregates
+
+    duration = jh.timeframe_to_one_minutes(timeframe) * 60_000
+    if finish_date_timestamp <= start_date_timestamp:
+        return None
+    if start_date_timestamp % duration != 0 or (finish_date_timestamp + 60_000) % duration != 0:
+        return None
+
+    candles = get_candle_aggregates(exchange, symbol, timeframe, start_date_timestamp, finish_date_timestamp)
+    if len(candles) != (finish_date_timestamp + 60_000 - start_date_timestamp) // duration:
+        return None
+
+    return candles
+
+
 def _get_generated_candles(timeframe, trading_candles) -> np.ndarray:
     # generate candles for the requested timeframe
-    generated_candles = []
-    for i in range(len(trading_candles)):
-        num = jh.timeframe_to_one_minutes(timeframe)
-
-        if (i + 1) % num == 0:
-            generated_candles.append(
-                generate_candle_from_one_minutes(
-                    timeframe,
-                    trading_candles[(i - (num - 1)):(i + 1)],
-                    True
-                )
-            )
-
-    return np.array(generated_candles)
+    return resample(trading_candles, timeframe)
 
 
 def get_existing_candles() -> List[Dict]:
@@ -396,3 +502,4 @@ def delete_candles(exchange: str, symbol: str) -> None:
         Candle.exchange == exchange,
         Candle.symbol == symbol
     ).execute()
+    delete_candle_aggregates(exchange, symbol)
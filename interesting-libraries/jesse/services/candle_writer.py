@@ -0,0 +1,104 @@
+import atexit
+import os
+import threading
+from typing import Callable
+
+import numpy as np
+
+
+class CandleWriteBuffer:
+    """
+    Write-behind buffer for the candles of live sessions. Instead of one upsert per candle
+    update on the trading thread, the updates are buffered and a background thread upserts
+    them in one batch every `interval` seconds. Repeated updates of the same candle (such as
+    the forming one) are coalesced into its latest value.
+
+    `write` receives the list of buffered (exchange, symbol, timeframe, candle) in the order
+    they were first added. If it fails, they are kept to be written on the next flush.
+    Batches are written one at a time, so an older snapshot of a candle can't be written
+    after a newer one. close() stops the thread and writes what's left, before shutting down.
+    """
+    def __init__(self, write: Callable[[list], None], interval: float = 1.0) -> None:
+        self.interval = interval
+        self._write = write
+        self._lock = threading.Lock()
+        # held while a batch is taken and written
+        self._write_lock = threading.Lock()
+        # (exchange, symbol, timeframe, timestamp) => candle
+        self._candles = {}
+        self._thread = None
+        self._stopped = threading.Event()
+        # a forked process starts with an empty buffer
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._candles = {}
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def add(self, exchange: str, symbol: str, timeframe: str, candle: np.ndarray) -> None:
+        # the candle is copied because the store keeps updating its arrays
+        candle = np.array(candle, dtype=np.float64)
+        with self._lock:
+            self._candles[(exchange, symbol, timeframe, int(candle[0]))] = candle
+
+        if self._thread is None:
+            self._start()
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._candles)
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                candles = self._candles
+                self._candles = {}
+
+            if not candles:
+                return
+
+            try:
+                self._write([(*key[:3], candle) for key, candle in candles.items()])
+            except Exception:
+                # keep them for the next flush, unless they have been updated in the meantime
+                with self._lock:
+                    self._candles = {**candles, **self._candles}
+                raise
+
+    def close(self) -> None:
+        """
+        Stops the background thread, waits for the batch it may be writing, and writes
+        the remaining candles. Call it before closing the database connection.
+        """
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='candle-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                import jesse.helpers as jh
+                print(jh.color(f'Failed to store the buffered candles: {e}', 'red'))
+
+
+def _store_candles(candles: list) -> None:
+    from jesse.models.Candle import store_candle_updates_into_db
+    store_candle_updates_into_db(candles)
+
+
+candle_writer = CandleWriteBuffer(_store_candles)
@@ -2,8 +2,12 @@ from datetime import datetime, timedelta
 from jesse.routes import router
 from jesse.store import store
 from jesse.services.candle import get_candles
+from jesse.services.intraday_equity import min_max_downsample
 from jesse.utils import prices_to_returns
 
+# the maximum number of points of an intraday equity curve sent to the dashboard
+INTRADAY_EQUITY_CURVE_POINTS = 2000
+
 
 def _calculate_equity_curve(daily_balance, start_date, name: str, color: str):
     date_list = [start_date + timedelta(days=x) for x in range(len(daily_balance))]
@@ -19,6 +23,32 @@ def _calculate_equity_curve(daily_balance, start_date, name: str, color: str):
     }
 
 
+def _calculate_intraday_equity_curve(intraday_equity: tuple, name: str, color: str):
+    timestamps, equity = min_max_downsample(*intraday_equity, INTRADAY_EQUITY_CURVE_POINTS)
+    # the value at the close of each 1m candle
+    times = (timestamps + 60_000) / 1000
+    return {
+        'name': name,
+        'data': [{'time': t, 'value': v, 'color': color} for t, v in zip(times.tolist(), equity.tolist())],
+        'color': color,
+    }
+
+
+def sharded_equity_curve(starting_time: int, daily_balance: list, shards_daily_balances: dict) -> list:
+    """
+    The equity curves of a sharded portfolio backtest: the merged portfolio
+    followed by each shard (by its name).
+    """
+    start_date = datetime.fromtimestamp(starting_time / 1000)
+    colors = ['#818CF8', '#fbbf24', '#fb7185', '#60A5FA', '#f472b6', '#A78BFA', '#f87171', '#6EE7B7', '#93C5FD', '#FCA5A5']
+    result = [_calculate_equity_curve(daily_balance, start_date, 'Portfolio', colors[0])]
+    for i, (name, balances) in enumerate(shards_daily_balances.items()):
+        if i + 1 >= 10:
+            colors.append(_generate_color(colors[-1]))
+        result.append(_calculate_equity_curve(balances, start_date, name, colors[(i + 1) % len(colors)]))
+    return result
+
+
 def _generate_color(previous_color):
     # Convert the previous color from hex to RGB
     previous_color = previous_color.lstrip('#')
@@ -35,7 +65,11 @@ def _generate_color(previous_color):
     return new_color
 
 
-def equity_curve(benchmark: bool = False) -> list:
+def equity_curve(benchmark: bool = False, intraday_equity: tuple = None) -> list:
+    """
+    intraday_equity is the (timestamps, equity) of IntradayEquityRecorder.equity_curve(). If
+    it's passed, the portfolio's curve is built from it (downsampled) instead of the daily balances.
+    """
     if store.completed_trades.count == 0:
         return None
 
@@ -46,7 +80,10 @@ def equity_curve(benchmark: bool = False) -> list:
     # Define the first 10 colors
     colors = ['#818CF8', '#fbbf24', '#fb7185', '#60A5FA', '#f472b6', '#A78BFA', '#f87171', '#6EE7B7', '#93C5FD', '#FCA5A5']
 
-    result.append(_calculate_equity_curve(daily_balance, start_date, 'Portfolio', colors[0]))
+    if intraday_equity is not None:
+        result.append(_calculate_intraday_equity_curve(intraday_equity, 'Portfolio', colors[0]))
+    else:
+        result.append(_calculate_equity_curve(daily_balance, start_date, 'Portfolio', colors[0]))
 
     if benchmark:
         initial_balance = daily_balance[0]
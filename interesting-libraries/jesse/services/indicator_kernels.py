@@ -0,0 +1,126 @@
+"""
+Ahead-of-time compilation of the numba kernels of jesse.indicators.
+
+Every kernel is compiled with `cache=True`, so compiling it once writes it to numba's
+on-disk cache (next to the indicator's module) and every later process (backtests,
+optimization workers, Ray actors) loads it from there instead of compiling it again.
+"""
+import ast
+import inspect
+from time import perf_counter
+from typing import Callable, Iterable, Set
+
+import numpy as np
+
+import jesse.helpers as jh
+
+# number of candles used to compile the kernels; big enough for the default periods
+WARMUP_CANDLES_COUNT = 500
+
+
+def indicator_names() -> list:
+    import jesse.indicators as ta
+    return sorted(
+        name for name, value in vars(ta).items()
+        # batch() and cross_section() aren't indicators but compute the others
+        if not name.startswith('_') and inspect.isfunction(value) and name not in ('batch', 'cross_section')
+    )
+
+
+def used_indicators(strategy) -> Set[str]:
+    """
+    Returns the names of the indicators which the strategy's module refers to,
+    through `import jesse.indicators as ta`-like imports or `from jesse.indicators import ...`.
+    """
+    try:
+        tree = ast.parse(inspect.getsource(inspect.getmodule(strategy)))
+    except (OSError, TypeError):
+        # the source isn't available (for example a class defined in a notebook)
+        return set()
+    all_names = set(indicator_names())
+
+    aliases = set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == 'jesse.indicators':
+                    aliases.add(alias.asname or alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module == 'jesse':
+                aliases.update(a.asname or a.name for a in node.names if a.name == 'indicators')
+            elif node.module == 'jesse.indicators':
+                names.update(a.name for a in node.names)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and ast.unparse(node.value) in aliases:
+            names.add(node.attr)
+
+    return names & all_names
+
+
+def _warmup_candles() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, WARMUP_CANDLES_COUNT))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + rng.uniform(0, 1, WARMUP_CANDLES_COUNT)
+    low = np.minimum(open_, close) - rng.uniform(0, 1, WARMUP_CANDLES_COUNT)
+    timestamps = 1_609_459_200_000 + np.arange(WARMUP_CANDLES_COUNT) * 60_000
+    volume = rng.uniform(1, 100, WARMUP_CANDLES_COUNT)
+    return np.column_stack((timestamps, open_, close, high, low, volume))
+
+
+def call_indicator(name: str, candles: np.ndarray, sequential: bool = True):
+    """
+    Calls the indicator with its default parameters. All of its required parameters
+    are candles, like in beta(candles, benchmark_candles).
+    """
+    import jesse.indicators as ta
+
+    indicator = getattr(ta, name)
+    parameters = inspect.signature(indicator).parameters
+    args = [candles for p in parameters.values() if p.default is p.empty]
+    kwargs = {'sequential': sequential} if 'sequential' in parameters else {}
+    return indicator(*args, **kwargs)
+
+
+def warmup_kernels(names: Iterable[str] = None) -> dict:
+    """
+    Calls each indicator (all of them by default) once on synthetic candles with its
+    default parameters, which compiles (or loads from the cache) its kernels.
+
+    Returns {name: seconds} of the successful ones, and {name: error} for those that failed.
+    """
+    candles = _warmup_candles()
+    durations, errors = {}, {}
+    for name in sorted(names if names is not None else indicator_names()):
+        start = perf_counter()
+        try:
+            call_indicator(name, candles)
+        except Exception as e:
+            errors[name] = str(e)
+            continue
+        durations[name] = perf_counter() - start
+
+    return {'durations': durations, 'errors': errors}
+
+
+def warmup_routes_kernels(routes: list, log: Callable[[str], None] = None) -> dict:
+    """
+    Compiles the kernels of the indicators which the routes' strategies use.
+
+    The optimize modes call it before starting their workers, so that each worker loads
+    the kernels from the cache instead of all of them compiling the same kernels at once.
+    """
+    start = perf_counter()
+    names = set()
+    for r in routes:
+        strategy = r['strategy']
+        if isinstance(strategy, str):
+            strategy = jh.get_strategy_class(strategy)
+        names |= used_indicators(strategy)
+
+    result = warmup_kernels(names)
+    if log is not None and result['durations']:
+        log(f"Compiled the kernels of {len(result['durations'])} indicators in {perf_counter() - start:.2f} seconds")
+    return result
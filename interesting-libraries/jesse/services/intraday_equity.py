@@ -0,0 +1,132 @@
+"""
+Per-minute equity curve of a backtest, without computing the portfolio value on every
+simulated minute.
+
+Between two order executions nothing changes but the prices, and the portfolio value is
+linear in each position's price:
+
+    equity(t) = constant + sum(slope[p] * close[p](t))
+
+where slope is the position's qty (its value for spot, its PNL for futures). So the
+recorder only snapshots (time, constant, slopes) after each executed order, and the
+whole curve is computed at the end with numpy from the 1m candles' close prices.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from jesse.store import store
+
+
+class IntradayEquityRecorder:
+    def __init__(self, candles: dict) -> None:
+        self._candles = candles
+        self._keys = [k for k in store.positions.storage if k in candles]
+        self._times = []
+        self._constants = []
+        self._slopes = []
+        self.record()
+
+    def record(self) -> None:
+        """
+        Snapshots the current state. Called after every executed order.
+        """
+        from jesse.modes.utils import portfolio_value
+
+        slopes = np.zeros(len(self._keys))
+        constant = portfolio_value()
+        for i, key in enumerate(self._keys):
+            p = store.positions.storage[key]
+            if p.is_close or p.current_price is None:
+                continue
+            slopes[i] = p.qty if p.exchange_type == 'futures' else abs(p.qty)
+            constant -= slopes[i] * p.current_price
+
+        self._times.append(store.app.time)
+        self._constants.append(constant)
+        self._slopes.append(slopes)
+
+    def equity_curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (timestamps, equity) of every 1m candle, where equity is the
+        portfolio value at the close of the candle
+        """
+        candles = self._candles[self._keys[0]]['candles'] if self._keys else next(iter(self._candles.values()))['candles']
+        timestamps = candles[:, 0]
+
+        # the latest snapshot taken before each candle's close
+        indexes = np.searchsorted(np.array(self._times), timestamps + 60_000, side='right') - 1
+        np.maximum(indexes, 0, out=indexes)
+
+        equity = np.array(self._constants, dtype=np.float64)[indexes]
+        slopes = np.array(self._slopes).reshape(len(self._slopes), len(self._keys))
+        for i, key in enumerate(self._keys):
+            equity += slopes[indexes, i] * self._candles[key]['candles'][:len(timestamps), 2]
+
+        return timestamps, equity
+
+
+def max_drawdown(equity: np.ndarray) -> float:
+    """
+    The maximum drawdown of the equity curve in percentage (a negative number)
+    """
+    if len(equity) == 0:
+        return 0
+    return (np.min(equity / np.maximum.accumulate(equity)) - 1) * 100
+
+
+def min_max_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Splits the series into n_out / 2 buckets and keeps the minimum and the maximum
+    point of each bucket (in their original order), so that the extremes such as
+    the drawdowns stay visible.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 2:
+        return x, y
+
+    bucket_count = n_out // 2
+    starts = np.linspace(0, n, bucket_count + 1).astype(int)[:-1]
+    bucket_ids = np.repeat(np.arange(bucket_count), np.diff(np.append(starts, n)))
+    # index of the minimum/maximum inside each bucket: sort by (bucket, value)
+    order = np.lexsort((y, bucket_ids))
+    ends = np.append(starts[1:], n)
+    min_indexes = order[starts]
+    max_indexes = order[ends - 1]
+
+    indexes = np.sort(np.concatenate([min_indexes, max_indexes]))
+    indexes = indexes[np.append(True, np.diff(indexes) != 0)]
+    return x[indexes], y[indexes]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling: keeps the first and the last points, and
+    from each bucket in between the point which forms the largest triangle with the point
+    kept from the previous bucket and the average of the next bucket.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indexes = np.empty(n_out, dtype=int)
+    indexes[0] = 0
+    indexes[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indexes[i + 1] = a
+
+    return x[indexes], y[indexes]
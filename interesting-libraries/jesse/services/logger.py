@@ -1,13 +1,101 @@
 import jesse.helpers as jh
 from jesse.services.notifier import notify
 from jesse.services.redis import sync_publish
+import atexit
 import logging
 import os
+import queue
+import threading
 
 # store loggers in the dict because we might want to add more later
 LOGGERS = {}
 
 
+class LogSink:
+    """
+    Writes logs to the log files, Redis and the database on a background
+    thread and in batches, so that logging doesn't slow down the trading loop.
+    Lines of the log files are only formatted on that thread.
+    """
+    def __init__(self) -> None:
+        self._queue = queue.Queue()
+        self._thread = None
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def put(
+            self, log: dict, file_logger: str = None, line_format: str = None, event: str = None, db_type: str = None
+    ) -> None:
+        """
+        line_format is formatted with the log's time and message, e.g. '[INFO | {time}] {message}'
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='log-sink', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+        self._queue.put((log, file_logger, line_format, event, db_type))
+
+    def flush(self) -> None:
+        """
+        Blocks until all the logs that have been put so far are written
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(items)
+            except Exception as e:
+                print(jh.color(f'Failed to write logs: {e}', 'red'))
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _write(items: list) -> None:
+        lines = {}
+        db_logs = []
+        for log, file_logger, line_format, event, db_type in items:
+            if event is not None:
+                sync_publish(event, log)
+            if file_logger is not None:
+                time = jh.timestamp_to_time(log['timestamp'])[:19]
+                lines.setdefault(file_logger, []).append(line_format.format(time=time, message=log['message']))
+            if db_type is not None:
+                db_logs.append((log, db_type))
+
+        # one write per file
+        for name, file_lines in lines.items():
+            # the loggers might have been reset since the logs were put, but the
+            # logging module still has them (with their file handlers)
+            file_logger = LOGGERS.get(name) or logging.getLogger(name)
+            if not file_logger.handlers:
+                continue
+            file_logger.info('\n'.join(file_lines))
+
+        if db_logs:
+            from jesse.models.Log import store_logs_into_db
+            store_logs_into_db(db_logs)
+
+
+sink = LogSink()
+
+
+def flush() -> None:
+    sink.flush()
+
+
 def _init_main_logger():
     session_id = jh.get_session_id()
     jh.make_directory('storage/logs/live-mode')
@@ -41,6 +129,8 @@ def create_logger_file(name):
 
 
 def reset():
+    # write the logs of the previous session before its loggers are forgotten
+    flush()
     LOGGERS.clear()
 
 
@@ -61,19 +151,20 @@ def info(msg: str, send_notification=False, webhook=None) -> None:
 
     store.logs.info.append(log_dict)
 
-    if jh.is_live():
-        sync_publish('info_log', log_dict)
-
-    if jh.is_live() or (jh.is_backtesting() and jh.is_debugging()):
-        msg = f"[INFO | {jh.timestamp_to_time(jh.now_to_timestamp())[:19]}] {msg}"
-        logger = LOGGERS[jh.app_mode()]
-        logger.info(msg)
-
-    if jh.is_live():
-        from jesse.models.Log import store_log_into_db
-        store_log_into_db(log_dict, 'info')
+    is_live = jh.is_live()
+    writes_file = is_live or (jh.is_backtesting() and jh.is_debugging())
+    if writes_file:
+        sink.put(
+            log_dict,
+            file_logger=jh.app_mode(),
+            line_format='[INFO | {time}] {message}',
+            event='info_log' if is_live else None,
+            db_type='info' if is_live else None
+        )
 
     if send_notification:
+        if writes_file:
+            msg = f"[INFO | {jh.timestamp_to_time(log_dict['timestamp'])[:19]}] {msg}"
         notify(msg, webhook=webhook)
 
 
@@ -95,21 +186,22 @@ def error(msg: str, send_notification=True) -> None:
         'message': msg
     }
 
-    if jh.is_live() and jh.get_config('env.notifications.events.errors', True) and send_notification:
+    is_live = jh.is_live()
+    if is_live and jh.get_config('env.notifications.events.errors', True) and send_notification:
         notify(f'ERROR:\n{msg}')
-    if (jh.is_backtesting() and jh.is_debugging()) or jh.is_live():
-        sync_publish('error_log', log_dict)
 
     store.logs.errors.append(log_dict)
 
-    if jh.is_live() or jh.is_optimizing():
-        msg = f"[ERROR | {jh.timestamp_to_time(jh.now_to_timestamp())[:19]}] {msg}"
-        logger = LOGGERS[jh.app_mode()]
-        logger.error(msg)
-
-    if jh.is_live():
-        from jesse.models.Log import store_log_into_db
-        store_log_into_db(log_dict, 'error')
+    publishes = (jh.is_backtesting() and jh.is_debugging()) or is_live
+    writes_file = is_live or jh.is_optimizing()
+    if publishes or writes_file:
+        sink.put(
+            log_dict,
+            file_logger=jh.app_mode() if writes_file else None,
+            line_format='[ERROR | {time}] {message}',
+            event='error_log' if publishes else None,
+            db_type='error' if is_live else None
+        )
 
 
 def log_exchange_message(exchange, message):
@@ -117,9 +209,6 @@ def log_exchange_message(exchange, message):
     if not isinstance(message, str):
         message = str(message)
 
-    formatted_time = jh.timestamp_to_time(jh.now())[:19]
-    message = f'[{formatted_time} - {exchange}]: ' + message
-
     session_id = jh.get_session_id()
     logger_name = f'live-mode/{session_id}-raw-exchange-logs'
 
@@ -132,7 +221,11 @@ def log_exchange_message(exchange, message):
         new_logger.addHandler(logging.FileHandler(log_file, mode='w'))
         LOGGERS[logger_name] = new_logger
 
-    LOGGERS[logger_name].info(message)
+    sink.put(
+        {'timestamp': jh.now(), 'message': message},
+        file_logger=logger_name,
+        line_format=f'[{{time}} - {exchange}]: {{message}}'
+    )
 
 
 def log_optimize_mode(message):
@@ -0,0 +1,155 @@
+"""
+Encoding of the messages which are published to Redis and forwarded to the
+dashboard's websocket connections.
+
+Processes publish msgpack-encoded envelopes ({'id', 'event', 'is_compressed', 'data'})
+to Redis. numpy arrays inside the data are packed as msgpack extension type 1
+([dtype, shape, raw bytes]) instead of being converted to lists of Python numbers.
+
+The websocket manager decodes each envelope once and renders it once per
+encoding that its clients have asked for:
+
+- 'json' (the default): the same JSON text messages as before; compressed data
+  is gzipped and base64'd.
+- 'msgpack': binary frames; compressed data is gzipped msgpack (no base64).
+
+Messages which are already JSON text (published by older code) are still accepted.
+
+The backtest charts are published as columnar binary messages (see jesse.libs.columnar).
+They are forwarded as they are only to the clients which have asked for them in the
+handshake; the other clients get them as legacy envelopes (see from_columnar()) with
+the shapes of the candles, orders and lines that the dashboard has always used.
+"""
+import base64
+import gzip
+
+import msgpack
+import numpy as np
+import simplejson as json
+
+from jesse.libs import columnar
+from jesse.libs.custom_json import NpEncoder
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+ENCODINGS = (JSON, MSGPACK)
+
+NDARRAY_EXT_TYPE = 1
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        arr = arr.astype(arr.dtype.newbyteorder('<'), copy=False)
+        return msgpack.ExtType(NDARRAY_EXT_TYPE, msgpack.packb([arr.dtype.str, list(arr.shape), arr.tobytes()]))
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not msgpack serializable')
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == NDARRAY_EXT_TYPE:
+        dtype, shape, buffer = msgpack.unpackb(data)
+        return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape)
+    return msgpack.ExtType(code, data)
+
+
+def pack(obj) -> bytes:
+    return msgpack.packb(obj, default=_default)
+
+
+def unpack(message: bytes):
+    return msgpack.unpackb(message, ext_hook=_ext_hook, strict_map_key=False)
+
+
+def decode(message) -> dict:
+    """
+    Decodes a message received from Redis (msgpack or JSON text)
+    """
+    if isinstance(message, str) or message[:1] in (b'{', b' '):
+        return json.loads(message)
+    return unpack(message)
+
+
+def render(envelope: dict, encoding: str):
+    """
+    Returns what should be sent to a websocket client which uses `encoding`: a
+    str for JSON clients and bytes for msgpack clients.
+    """
+    if encoding == MSGPACK:
+        if envelope.get('is_compressed'):
+            envelope = dict(envelope, data=gzip.compress(pack(envelope['data'])))
+        return pack(envelope)
+
+    if envelope.get('is_compressed') and not isinstance(envelope['data'], str):
+        compressed = gzip.compress(json.dumps(envelope['data'], ignore_nan=True, cls=NpEncoder).encode('utf-8'))
+        envelope = dict(envelope, data=base64.b64encode(compressed).decode('utf-8'))
+    return json.dumps(envelope, ignore_nan=True, cls=NpEncoder)
+
+
+def _legacy_candles(route: dict) -> dict:
+    c = route['candles']
+    candles = [
+        {'time': int(t), 'open': o, 'close': cl, 'high': h, 'low': lo, 'volume': v}
+        for t, o, cl, h, lo, v in zip(
+            c['time'], c['open'].tolist(), c['close'].tolist(), c['high'].tolist(), c['low'].tolist(),
+            c['volume'].tolist()
+        )
+    ]
+    return dict(route, candles=candles)
+
+
+def _legacy_orders(route: dict) -> dict:
+    columns = route['orders']
+    keys = list(columns)
+    orders = [
+        dict(zip(keys, values))
+        for values in zip(*(columns[k].tolist() if isinstance(columns[k], np.ndarray) else columns[k] for k in keys))
+    ]
+    return dict(route, orders=orders)
+
+
+def _legacy_line(line: dict) -> dict:
+    colors = line['colors'] or [line['color']] * len(line['time'])
+    return {
+        'data': [
+            {'time': int(t), 'value': v, 'color': c}
+            for t, v, c in zip(line['time'], line['value'].tolist(), colors)
+        ],
+        'color': line['color'],
+    }
+
+
+def _legacy_lines(route: dict) -> dict:
+    return dict(route, lines={title: _legacy_line(line) for title, line in route['lines'].items()})
+
+
+def _legacy_extra_lines(route: dict) -> dict:
+    return dict(route, charts={
+        chart_name: {title: _legacy_line(line) for title, line in lines.items()}
+        for chart_name, lines in route['charts'].items()
+    })
+
+
+# the columnar chart events, and how each route of their data is converted back to its legacy shape
+_LEGACY_CHARTS = {
+    'candles_chart': _legacy_candles,
+    'orders_chart': _legacy_orders,
+    'add_line_to_candle_chart': _legacy_lines,
+    'add_extra_line_chart': _legacy_extra_lines,
+}
+
+
+def from_columnar(message: bytes) -> dict:
+    """
+    Converts a columnar message into the envelope which clients that haven't asked
+    for columnar messages have always received: a compressed list of plain objects.
+    """
+    decoded = columnar.decode(message)
+    convert = _LEGACY_CHARTS.get(decoded['event'].split('.', 1)[-1])
+    data = [convert(route) for route in decoded['data']] if convert else decoded['data']
+    return {'id': decoded['id'], 'event': decoded['event'], 'is_compressed': True, 'data': data}
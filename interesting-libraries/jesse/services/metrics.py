@@ -1,13 +1,13 @@
-from datetime import datetime
-from typing import List
+from typing import List, Union
 
 import numpy as np
-import pandas as pd
 
 import jesse.helpers as jh
+from jesse.enums import trade_types
 from jesse.models import ClosedTrade
 from jesse.services import selectors
 from jesse.store import store
+from jesse.store.state_completed_trades import RunningTradesMetrics
 
 
 def candles_info(candles_array: np.ndarray) -> dict:
@@ -50,36 +50,106 @@ def routes(routes_arr: list) -> list:
         } for r in routes_arr]
 
 
+TRADES_DTYPE = np.dtype([
+    ('pnl', np.float64),
+    ('pnl_percentage', np.float64),
+    ('fee', np.float64),
+    ('holding_period', np.float64),
+    ('is_long', np.bool_),
+])
+
+
+def trades_to_array(trades_list: List[ClosedTrade]) -> np.ndarray:
+    """
+    Converts closed trades into a structured array (see TRADES_DTYPE) which
+    is what the trades() metrics are calculated from.
+    """
+    arr = np.empty(len(trades_list), dtype=TRADES_DTYPE)
+    for i, t in enumerate(trades_list):
+        arr[i] = (t.pnl, t.pnl_percentage, t.fee, t.holding_period, t.type == trade_types.LONG)
+    return arr
+
+
+def daily_returns(daily_balance) -> np.ndarray:
+    """
+    Daily percentage changes of the daily balance. Like pandas' pct_change(),
+    the first value is NaN. All the ratio functions below expect this array
+    and skip NaN values the same way pandas does.
+    """
+    balances = np.asarray(daily_balance, dtype=np.float64)
+    returns = np.full(len(balances), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = balances[1:] / balances[:-1] - 1
+    return returns
+
+
+def _nanmean(a: np.ndarray) -> float:
+    mask = np.isnan(a)
+    count = a.size - mask.sum()
+    if count == 0:
+        return np.nan
+    return np.where(mask, 0, a).sum() / count
+
+
+def _nanstd(a: np.ndarray, ddof: int = 1) -> float:
+    # two-pass algorithm, same as pandas
+    mask = np.isnan(a)
+    count = a.size - mask.sum()
+    if count <= ddof:
+        return np.nan
+    values = np.where(mask, 0, a)
+    avg = values.sum() / count
+    sqr = (avg - values) ** 2
+    sqr[mask] = 0
+    return np.sqrt(sqr.sum() / (count - ddof))
+
+
+def _nanmin(a: np.ndarray) -> float:
+    if np.isnan(a).all():
+        return np.nan
+    return np.nanmin(a)
+
+
+def _nanprod(a: np.ndarray) -> float:
+    return np.where(np.isnan(a), 1, a).prod()
+
+
+def _nancumprod(a: np.ndarray) -> np.ndarray:
+    mask = np.isnan(a)
+    result = np.cumprod(np.where(mask, 1, a))
+    result[mask] = np.nan
+    return result
+
+
 def _prepare_returns(returns, rf=0.0, periods=252):
     """
-    Helper function to prepare returns data by converting to pandas Series and 
-    adjusting for risk-free rate if provided
+    Helper function to prepare returns data by converting it to a 1D float array
+    and adjusting for risk-free rate if provided
     """
+    returns = np.asarray(returns, dtype=np.float64).ravel()
+
     if rf != 0:
         returns = returns - (rf / periods)
-    
-    if isinstance(returns, pd.DataFrame):
-        returns = returns[returns.columns[0]]
-        
+
     return returns
 
+
 def sharpe_ratio(returns, rf=0.0, periods=365, annualize=True, smart=False):
     """
     Calculates the sharpe ratio of access returns
     """
     returns = _prepare_returns(returns, rf, periods)
-    divisor = returns.std(ddof=1)
-    
+    divisor = _nanstd(returns)
+
     if smart:
         divisor = divisor * autocorr_penalty(returns)
-        
-    res = returns.mean() / divisor
-    
+
+    res = _nanmean(returns) / divisor
+
     if annualize:
         res = res * np.sqrt(1 if periods is None else periods)
-    
-    # Always convert to pandas Series    
-    return pd.Series([res])
+
+    return res
 
 
 def sortino_ratio(returns, rf=0, periods=365, annualize=True, smart=False):
@@ -87,29 +157,29 @@ def sortino_ratio(returns, rf=0, periods=365, annualize=True, smart=False):
     Calculates the sortino ratio of access returns
     """
     returns = _prepare_returns(returns, rf, periods)
-    
+
     downside = np.sqrt((returns[returns < 0] ** 2).sum() / len(returns))
-    
+
     # Handle division by zero
     if downside == 0:
-        res = np.inf if returns.mean() > 0 else -np.inf
+        res = np.inf if _nanmean(returns) > 0 else -np.inf
     else:
         if smart:
             downside = downside * autocorr_penalty(returns)
-            
-        res = returns.mean() / downside
-        
+
+        res = _nanmean(returns) / downside
+
         if annualize:
             res = res * np.sqrt(1 if periods is None else periods)
-    
-    # Always convert to pandas Series
-    return pd.Series([res])
+
+    return res
 
 
 def autocorr_penalty(returns):
     """
     Calculates the autocorrelation penalty for returns
     """
+    returns = returns[~np.isnan(returns)]
     num = len(returns)
     coef = np.abs(np.corrcoef(returns[:-1], returns[1:])[0, 1])
     corr = [((num - x) / num) * coef**x for x in range(1, num)]
@@ -122,40 +192,34 @@ def calmar_ratio(returns):
     """
     # Get daily returns
     returns = _prepare_returns(returns)
-    
+
     # Calculate CAGR exactly as in cagr() function
     first_value = 1
-    last_value = (1 + returns).prod()
-    days = (returns.index[-1] - returns.index[0]).days
+    last_value = _nanprod(1 + returns)
+    days = len(returns) - 1
     years = float(days) / 365
-    
+
     if years == 0:
-        return pd.Series([0.0])
-        
+        return 0.0
+
     cagr_ratio = (last_value / first_value) ** (1 / years) - 1
-    
+
     # Calculate Max Drawdown using cumulative returns
-    cum_returns = (1 + returns).cumprod()
-    rolling_max = cum_returns.expanding(min_periods=1).max()
+    cum_returns = _nancumprod(1 + returns)
+    rolling_max = np.fmax.accumulate(cum_returns)
     drawdown = cum_returns / rolling_max - 1
-    max_dd = abs(drawdown.min())
-    
+    max_dd = abs(_nanmin(drawdown))
+
     # Calculate Calmar
-    result = cagr_ratio / max_dd if max_dd != 0 else 0
-    
-    # Always convert to pandas Series
-    return pd.Series([result])
+    return cagr_ratio / max_dd if max_dd != 0 else 0
 
 
 def max_drawdown(returns):
     """
     Calculates the maximum drawdown
     """
-    prices = (returns + 1).cumprod()
-    result = (prices / prices.expanding(min_periods=0).max()).min() - 1
-    
-    # Always convert to pandas Series
-    return pd.Series([result])
+    prices = _nancumprod(_prepare_returns(returns) + 1)
+    return _nanmin(prices / np.fmax.accumulate(prices)) - 1
 
 
 def cagr(returns, rf=0.0, compounded=True, periods=365):
@@ -163,23 +227,21 @@ def cagr(returns, rf=0.0, compounded=True, periods=365):
     Calculates the communicative annualized growth return (CAGR%)
     """
     returns = _prepare_returns(returns, rf)
-    
+
     # Get first and last values of cumulative returns
     first_value = 1
-    last_value = (1 + returns).prod()
-    
-    # Calculate years exactly as quantstats does
-    days = (returns.index[-1] - returns.index[0]).days
+    last_value = _nanprod(1 + returns)
+
+    # Calculate years exactly as quantstats does (one return per day)
+    days = len(returns) - 1
     years = float(days) / 365
-    
+
     # Handle edge case
     if years == 0:
-        return pd.Series([0.0])
-        
+        return 0.0
+
     # Calculate CAGR using quantstats formula
-    result = (last_value / first_value) ** (1 / years) - 1
-    
-    return pd.Series([result])
+    return (last_value / first_value) ** (1 / years) - 1
 
 
 def omega_ratio(returns, rf=0.0, required_return=0.0, periods=365):
@@ -187,32 +249,27 @@ def omega_ratio(returns, rf=0.0, required_return=0.0, periods=365):
     Determines the Omega ratio of a strategy
     """
     returns = _prepare_returns(returns, rf, periods)
-    
+
     if periods == 1:
         return_threshold = required_return
     else:
         return_threshold = (1 + required_return) ** (1.0 / periods) - 1
-        
+
     returns_less_thresh = returns - return_threshold
     numer = returns_less_thresh[returns_less_thresh > 0.0].sum()
     denom = -1.0 * returns_less_thresh[returns_less_thresh < 0.0].sum()
-    
-    result = numer / denom if denom > 0.0 else np.nan
-    
-    # Always convert to pandas Series
-    return pd.Series([result])
+
+    return numer / denom if denom > 0.0 else np.nan
 
 
 def serenity_index(returns, rf=0):
     """
     Calculates the serenity index score
     """
+    returns = _prepare_returns(returns)
     dd = to_drawdown_series(returns)
-    pitfall = -conditional_value_at_risk(dd) / returns.std()
-    result = (returns.sum() - rf) / (ulcer_index(returns) * pitfall)
-    
-    # Always convert to pandas Series
-    return pd.Series([result])
+    pitfall = -conditional_value_at_risk(dd) / _nanstd(returns)
+    return (np.nansum(returns) - rf) / (ulcer_index(returns) * pitfall)
 
 
 def ulcer_index(returns):
@@ -220,16 +277,17 @@ def ulcer_index(returns):
     Calculates the ulcer index score (downside risk measurement)
     """
     dd = to_drawdown_series(returns)
-    return np.sqrt(np.divide((dd**2).sum(), returns.shape[0] - 1))
+    return np.sqrt(np.divide(np.nansum(dd**2), returns.shape[0] - 1))
 
 
 def to_drawdown_series(returns):
     """
     Convert returns series to drawdown series
     """
-    prices = (1 + returns).cumprod()
+    prices = _nancumprod(1 + _prepare_returns(returns))
     dd = prices / np.maximum.accumulate(prices) - 1.0
-    return dd.replace([np.inf, -np.inf, -0], 0)
+    dd[np.isinf(dd) | (dd == 0)] = 0
+    return dd
 
 
 def conditional_value_at_risk(returns, sigma=1, confidence=0.95):
@@ -238,42 +296,60 @@ def conditional_value_at_risk(returns, sigma=1, confidence=0.95):
     """
     if len(returns) < 2:
         return 0
-        
+
     returns = _prepare_returns(returns)
     # Sort returns from worst to best
     sorted_returns = np.sort(returns)
     # Find the index based on confidence level
     index = int((1 - confidence) * len(sorted_returns))
-    
+
     # Handle empty slice warning
     if index == 0:
         return sorted_returns[0] if len(sorted_returns) > 0 else 0
-        
+
     # Calculate CVaR as the mean of worst losses
     c_var = sorted_returns[:index].mean()
     return c_var if ~np.isnan(c_var) else 0
 
 
-def trades(trades_list: List[ClosedTrade], daily_balance: list, final: bool = True) -> dict:
-    starting_balance = 0
-    current_balance = 0
+def _mean(a: np.ndarray) -> float:
+    return a.sum() / len(a) if len(a) else np.nan
 
-    for e in store.exchanges.storage:
-        starting_balance += store.exchanges.storage[e].starting_assets[jh.app_currency()]
-        current_balance += store.exchanges.storage[e].assets[jh.app_currency()]
 
-    if not trades_list:
+def trades(
+        trades_list: Union[List[ClosedTrade], np.ndarray], daily_balance: list, final: bool = True,
+        balances: tuple = None, open_trades: tuple = None
+) -> dict:
+    """
+    trades_list can be a list of closed trades or a structured array
+    of them created by trades_to_array()
+
+    balances (starting, current) and open_trades (count, PNL) default to the ones of the
+    store; they are passed for the merged metrics of a sharded portfolio backtest.
+    """
+    starting_balance, current_balance = balances if balances is not None else _balances()
+
+    if not len(trades_list):
         return {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}
 
-    df = pd.DataFrame.from_records([t.to_dict for t in trades_list])
+    if not isinstance(trades_list, np.ndarray):
+        trades_list = trades_to_array(trades_list)
+
+    pnl = np.ascontiguousarray(trades_list['pnl'])
+    pnl_percentage = np.ascontiguousarray(trades_list['pnl_percentage'])
+    fees = np.ascontiguousarray(trades_list['fee'])
+    holding_periods = np.ascontiguousarray(trades_list['holding_period'])
+    is_long = trades_list['is_long']
 
-    total_completed = len(df)
-    winning_trades = df.loc[df['PNL'] > 0]
-    total_winning_trades = len(winning_trades)
-    losing_trades = df.loc[df['PNL'] < 0]
-    total_losing_trades = len(losing_trades)
+    total_completed = len(pnl)
+    is_winning = pnl > 0
+    is_losing = pnl < 0
+    winning_pnl = pnl[is_winning]
+    losing_pnl = pnl[is_losing]
+    total_winning_trades = len(winning_pnl)
+    total_losing_trades = len(losing_pnl)
 
-    arr = df['PNL'].to_numpy()
+    arr = pnl
     pos = np.clip(arr, 0, 1).astype(bool).cumsum()
     neg = np.clip(arr, -1, 0).astype(bool).cumsum()
     current_streak = np.where(arr >= 0, pos - np.maximum.accumulate(np.where(arr <= 0, pos, 0)),
@@ -285,100 +361,193 @@ def trades(trades_list: List[ClosedTrade], daily_balance: list, final: bool = Tr
     s_max = current_streak.max()
     winning_streak = max(s_max, 0)
 
-    largest_losing_trade = 0 if total_losing_trades == 0 else losing_trades['PNL'].min()
-    largest_winning_trade = 0 if total_winning_trades == 0 else winning_trades['PNL'].max()
-    if len(winning_trades) == 0:
+    # drawdown of the cumulative PNL of the closed trades (from the starting balance)
+    cumulative_pnl = pnl.cumsum()
+    pnl_max_drawdown = (np.maximum.accumulate(np.maximum(cumulative_pnl, 0)) - cumulative_pnl).max()
+
+    return _summary(
+        starting_balance, current_balance, daily_balance, open_trades=open_trades,
+        total_completed=total_completed,
+        total_winning_trades=total_winning_trades,
+        total_losing_trades=total_losing_trades,
+        longs_count=int(is_long.sum()),
+        fee=fees.sum(),
+        net_profit=pnl.sum(),
+        average_win=_mean(winning_pnl),
+        average_loss=abs(_mean(losing_pnl)),
+        average_holding_period=_mean(holding_periods),
+        average_winning_holding_period=_mean(holding_periods[is_winning]),
+        average_losing_holding_period=_mean(holding_periods[is_losing]),
+        gross_profit=winning_pnl.sum(),
+        gross_loss=losing_pnl.sum(),
+        largest_winning_trade=0 if total_winning_trades == 0 else winning_pnl.max(),
+        largest_losing_trade=0 if total_losing_trades == 0 else losing_pnl.min(),
+        winning_streak=winning_streak,
+        losing_streak=losing_streak,
+        current_streak=current_streak[-1],
+        pnl_percentage_std=pnl_percentage.std(ddof=1) if total_completed > 1 else np.nan,
+        pnl_max_drawdown=pnl_max_drawdown,
+    )
+
+
+def running_trades(running: RunningTradesMetrics, daily_balance: list, ratios: tuple = None) -> dict:
+    """
+    Same as trades() but built from the running metrics of store.completed_trades
+    in O(1) instead of going through all the closed trades.
+
+    The daily balance ratios only change once a day, so they can be passed
+    (as returned by daily_balance_ratios()) to avoid recalculating them.
+    """
+    starting_balance, current_balance = _balances()
+
+    if not running.count:
+        return {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}
+
+    return _summary(
+        starting_balance, current_balance, daily_balance, ratios,
+        total_completed=running.count,
+        total_winning_trades=running.winning_count,
+        total_losing_trades=running.losing_count,
+        longs_count=running.longs_count,
+        fee=running.fee,
+        net_profit=running.gross_profit + running.gross_loss,
+        average_win=running.average_win,
+        average_loss=abs(running.average_loss),
+        average_holding_period=running.holding_period / running.count,
+        average_winning_holding_period=_divide(running.winning_holding_period, running.winning_count),
+        average_losing_holding_period=_divide(running.losing_holding_period, running.losing_count),
+        gross_profit=running.gross_profit,
+        gross_loss=running.gross_loss,
+        largest_winning_trade=running.largest_winning_trade,
+        largest_losing_trade=running.largest_losing_trade,
+        winning_streak=max(running.max_streak, 0),
+        losing_streak=0 if running.min_streak > 0 else abs(running.min_streak),
+        current_streak=running.current_streak,
+        pnl_percentage_std=running.pnl_percentage_std,
+        pnl_max_drawdown=running.max_drawdown,
+    )
+
+
+def daily_balance_ratios(daily_balance: list) -> tuple:
+    """
+    Returns (max_drawdown, annual_return, sharpe, calmar, sortino, omega, serenity)
+    of the daily balance using 365 days for crypto markets
+    """
+    daily_return = daily_returns(daily_balance)
+    if len(daily_return) < 2:
+        return (np.nan,) * 7
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (
+            max_drawdown(daily_return) * 100,
+            cagr(daily_return, periods=365) * 100,
+            sharpe_ratio(daily_return, periods=365),
+            calmar_ratio(daily_return),
+            sortino_ratio(daily_return, periods=365),
+            omega_ratio(daily_return, periods=365),
+            serenity_index(daily_return),
+        )
+
+
+def _balances() -> tuple:
+    starting_balance = 0
+    current_balance = 0
+
+    for e in store.exchanges.storage:
+        starting_balance += store.exchanges.storage[e].starting_assets[jh.app_currency()]
+        current_balance += store.exchanges.storage[e].assets[jh.app_currency()]
+
+    return starting_balance, current_balance
+
+
+def _divide(a: float, b: int) -> float:
+    return a / b if b else np.nan
+
+
+def _safe_convert(value, convert_type=float):
+    try:
+        if np.isnan(value):
+            return np.nan
+        return convert_type(value)
+    except:
+        return np.nan
+
+
+def _summary(
+        starting_balance: float, current_balance: float, daily_balance: list, ratios: tuple = None,
+        open_trades: tuple = None, *,
+        total_completed: int, total_winning_trades: int, total_losing_trades: int, longs_count: int,
+        fee: float, net_profit: float, average_win: float, average_loss: float,
+        average_holding_period: float, average_winning_holding_period: float,
+        average_losing_holding_period: float, gross_profit: float, gross_loss: float,
+        largest_winning_trade: float, largest_losing_trade: float,
+        winning_streak: int, losing_streak: int, current_streak: int,
+        pnl_percentage_std: float, pnl_max_drawdown: float
+) -> dict:
+    if total_winning_trades == 0:
         win_rate = 0
     else:
-        win_rate = len(winning_trades) / (len(losing_trades) + len(winning_trades))
-    longs_count = len(df.loc[df['type'] == 'long'])
-    shorts_count = len(df.loc[df['type'] == 'short'])
+        win_rate = total_winning_trades / (total_losing_trades + total_winning_trades)
+    shorts_count = total_completed - longs_count
     longs_percentage = longs_count / (longs_count + shorts_count) * 100
     shorts_percentage = 100 - longs_percentage
-    fee = df['fee'].sum()
-    net_profit = df['PNL'].sum()
     net_profit_percentage = (net_profit / starting_balance) * 100
-    average_win = winning_trades['PNL'].mean()
-    average_loss = abs(losing_trades['PNL'].mean())
-    ratio_avg_win_loss = average_win / average_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio_avg_win_loss = np.float64(average_win) / average_loss
     expectancy = (0 if np.isnan(average_win) else average_win) * win_rate - (
         0 if np.isnan(average_loss) else average_loss) * (1 - win_rate)
-    expectancy = expectancy
     expectancy_percentage = (expectancy / starting_balance) * 100
     expected_net_profit_every_100_trades = expectancy_percentage * 100
-    average_holding_period = df['holding_period'].mean()
-    average_winning_holding_period = winning_trades['holding_period'].mean()
-    average_losing_holding_period = losing_trades['holding_period'].mean()
-    gross_profit = winning_trades['PNL'].sum()
-    gross_loss = losing_trades['PNL'].sum()
-
-    start_date = datetime.fromtimestamp(store.app.starting_time / 1000)
-    date_index = pd.date_range(start=start_date, periods=len(daily_balance))
-
-    daily_return = pd.DataFrame(daily_balance, index=date_index).pct_change(1)
-
-    total_open_trades = store.app.total_open_trades
-    open_pl = store.app.total_open_pl
-
-    # Helper function to safely convert values
-    def safe_convert(value, convert_type=float):
-        try:
-            if isinstance(value, pd.Series):
-                value = value.iloc[0]
-            if np.isnan(value):
-                return np.nan
-            return convert_type(value)
-        except:
-            return np.nan
 
-    # Calculate metrics using 365 days for crypto markets
-    max_dd = np.nan if len(daily_return) < 2 else max_drawdown(daily_return).iloc[0] * 100
-    annual_return = np.nan if len(daily_return) < 2 else cagr(daily_return, periods=365).iloc[0] * 100
-    sharpe = np.nan if len(daily_return) < 2 else sharpe_ratio(daily_return, periods=365).iloc[0]
-    calmar = np.nan if len(daily_return) < 2 else calmar_ratio(daily_return).iloc[0]
-    sortino = np.nan if len(daily_return) < 2 else sortino_ratio(daily_return, periods=365).iloc[0]
-    omega = np.nan if len(daily_return) < 2 else omega_ratio(daily_return, periods=365).iloc[0]
-    serenity = np.nan if len(daily_return) < 2 else serenity_index(daily_return).iloc[0]
+    if ratios is None:
+        ratios = daily_balance_ratios(daily_balance)
+    max_dd, annual_return, sharpe, calmar, sortino, omega, serenity = ratios
+
+    if open_trades is None:
+        open_trades = (store.app.total_open_trades, store.app.total_open_pl)
+    total_open_trades, open_pl = open_trades
 
     return {
-        'total': safe_convert(total_completed, int),
-        'total_winning_trades': safe_convert(total_winning_trades, int),
-        'total_losing_trades': safe_convert(total_losing_trades, int),
-        'starting_balance': safe_convert(starting_balance),
-        'finishing_balance': safe_convert(current_balance),
-        'win_rate': safe_convert(win_rate),
-        'ratio_avg_win_loss': safe_convert(ratio_avg_win_loss),
-        'longs_count': safe_convert(longs_count, int),
-        'longs_percentage': safe_convert(longs_percentage),
-        'shorts_percentage': safe_convert(shorts_percentage),
-        'shorts_count': safe_convert(shorts_count, int),
-        'fee': safe_convert(fee),
-        'net_profit': safe_convert(net_profit),
-        'net_profit_percentage': safe_convert(net_profit_percentage),
-        'average_win': safe_convert(average_win),
-        'average_loss': safe_convert(average_loss),
-        'expectancy': safe_convert(expectancy),
-        'expectancy_percentage': safe_convert(expectancy_percentage),
-        'expected_net_profit_every_100_trades': safe_convert(expected_net_profit_every_100_trades),
-        'average_holding_period': safe_convert(average_holding_period),
-        'average_winning_holding_period': safe_convert(average_winning_holding_period),
-        'average_losing_holding_period': safe_convert(average_losing_holding_period),
-        'gross_profit': safe_convert(gross_profit),
-        'gross_loss': safe_convert(gross_loss),
-        'max_drawdown': safe_convert(max_dd),
-        'annual_return': safe_convert(annual_return),
-        'sharpe_ratio': safe_convert(sharpe),
-        'calmar_ratio': safe_convert(calmar),
-        'sortino_ratio': safe_convert(sortino),
-        'omega_ratio': safe_convert(omega),
-        'serenity_index': safe_convert(serenity),
-        'total_open_trades': safe_convert(total_open_trades, int),
-        'open_pl': safe_convert(open_pl),
-        'winning_streak': safe_convert(winning_streak, int),
-        'losing_streak': safe_convert(losing_streak, int),
-        'largest_losing_trade': safe_convert(largest_losing_trade),
-        'largest_winning_trade': safe_convert(largest_winning_trade),
-        'current_streak': safe_convert(current_streak[-1], int),
+        'total': _safe_convert(total_completed, int),
+        'total_winning_trades': _safe_convert(total_winning_trades, int),
+        'total_losing_trades': _safe_convert(total_losing_trades, int),
+        'starting_balance': _safe_convert(starting_balance),
+        'finishing_balance': _safe_convert(current_balance),
+        'win_rate': _safe_convert(win_rate),
+        'ratio_avg_win_loss': _safe_convert(ratio_avg_win_loss),
+        'longs_count': _safe_convert(longs_count, int),
+        'longs_percentage': _safe_convert(longs_percentage),
+        'shorts_percentage': _safe_convert(shorts_percentage),
+        'shorts_count': _safe_convert(shorts_count, int),
+        'fee': _safe_convert(fee),
+        'net_profit': _safe_convert(net_profit),
+        'net_profit_percentage': _safe_convert(net_profit_percentage),
+        'average_win': _safe_convert(average_win),
+        'average_loss': _safe_convert(average_loss),
+        'expectancy': _safe_convert(expectancy),
+        'expectancy_percentage': _safe_convert(expectancy_percentage),
+        'expected_net_profit_every_100_trades': _safe_convert(expected_net_profit_every_100_trades),
+        'average_holding_period': _safe_convert(average_holding_period),
+        'average_winning_holding_period': _safe_convert(average_winning_holding_period),
+        'average_losing_holding_period': _safe_convert(average_losing_holding_period),
+        'gross_profit': _safe_convert(gross_profit),
+        'gross_loss': _safe_convert(gross_loss),
+        'max_drawdown': _safe_convert(max_dd),
+        'annual_return': _safe_convert(annual_return),
+        'sharpe_ratio': _safe_convert(sharpe),
+        'calmar_ratio': _safe_convert(calmar),
+        'sortino_ratio': _safe_convert(sortino),
+        'omega_ratio': _safe_convert(omega),
+        'serenity_index': _safe_convert(serenity),
+        'total_open_trades': _safe_convert(total_open_trades, int),
+        'open_pl': _safe_convert(open_pl),
+        'winning_streak': _safe_convert(winning_streak, int),
+        'losing_streak': _safe_convert(losing_streak, int),
+        'largest_losing_trade': _safe_convert(largest_losing_trade),
+        'largest_winning_trade': _safe_convert(largest_winning_trade),
+        'current_streak': _safe_convert(current_streak, int),
+        'pnl_percentage_std': _safe_convert(pnl_percentage_std),
+        'pnl_max_drawdown': _safe_convert(pnl_max_drawdown),
     }
 
 
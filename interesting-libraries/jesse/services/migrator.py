@@ -31,7 +31,8 @@ def run():
 
     # create initial tables
     from jesse.models import Candle, ClosedTrade, Log, Order, Option
-    database.db.create_tables([Candle, ClosedTrade, Log, Order])
+    from jesse.models.CandleAggregate import CandleAggregate
+    database.db.create_tables([Candle, ClosedTrade, Log, Order, CandleAggregate])
 
     database.close_connection()
 
@@ -3,7 +3,7 @@ import time
 from typing import List
 import multiprocessing as mp
 import traceback
-from jesse.services.redis import sync_publish, sync_redis
+from jesse.services.redis import sync_publish, get_sync_redis
 from jesse.services.failure import terminate_session
 import jesse.helpers as jh
 from jesse.services.env import ENV_VALUES
@@ -59,7 +59,7 @@ class ProcessManager:
         self._pid_to_client_id_map = {}
         self.client_id_to_pid_to_map = {}
         # clear all process status
-        sync_redis.delete(self._active_workers_key)
+        get_sync_redis().delete(self._active_workers_key)
 
     @staticmethod
     def _prefixed_pid(pid):
@@ -70,7 +70,7 @@ class ProcessManager:
         return f"{ENV_VALUES['APP_PORT']}|{client_id}"
 
     def _add_process(self, client_id):
-        sync_redis.sadd(self._active_workers_key, client_id)
+        get_sync_redis().sadd(self._active_workers_key, client_id)
 
     def add_task(self, function, *args):
         client_id = args[0]
@@ -93,7 +93,7 @@ class ProcessManager:
         return self.client_id_to_pid_to_map[self._prefixed_client_id(client_id)]
 
     def cancel_process(self, client_id):
-        sync_redis.srem(self._active_workers_key, client_id)
+        get_sync_redis().srem(self._active_workers_key, client_id)
 
     def flush(self):
         for w in self._workers:
@@ -134,7 +134,7 @@ class ProcessManager:
         """
         Returns the set of all the processes client_id as a list of strings
         """
-        return {client_id.decode('utf-8') for client_id in sync_redis.smembers(self._active_workers_key)}
+        return {client_id.decode('utf-8') for client_id in get_sync_redis().smembers(self._active_workers_key)}
 
 
 process_manager = ProcessManager()
@@ -0,0 +1,80 @@
+import atexit
+import os
+import threading
+from time import sleep
+from typing import Callable
+
+
+class PublishBuffer:
+    """
+    Per-process buffer which batches high-frequency dashboard events into one
+    Redis publish per tick. A background thread flushes it every `interval` seconds.
+
+    - coalesced events (progressbar, positions, ...): only the latest message is kept
+    - other buffered events (logs): every message is kept, in order
+
+    `publish` receives the list of buffered messages in the order they were added.
+    """
+    def __init__(self, publish: Callable[[list], None], interval: float = 0.1) -> None:
+        self.interval = interval
+        self._publish = publish
+        self._lock = threading.Lock()
+        # held while a batch is taken and published, so a flush() returns only after the
+        # messages which were added before it (including an in-flight batch) are published
+        self._publish_lock = threading.Lock()
+        self._messages = []
+        # index of the latest message of each coalesced event inside self._messages
+        self._coalesced = {}
+        self._thread = None
+        # a forked process (for example a backtest started by the dashboard) starts with an empty buffer
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._messages = []
+        self._coalesced = {}
+        self._thread = None
+
+    def add(self, event: str, message, coalesce: bool = False) -> None:
+        with self._lock:
+            if coalesce and event in self._coalesced:
+                self._messages[self._coalesced[event]] = message
+            else:
+                if coalesce:
+                    self._coalesced[event] = len(self._messages)
+                self._messages.append(message)
+
+        if self._thread is None:
+            self._start()
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._messages)
+
+    def flush(self) -> None:
+        with self._publish_lock:
+            with self._lock:
+                messages = self._messages
+                self._messages = []
+                self._coalesced = {}
+
+            if messages:
+                self._publish(messages)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='publish-buffer', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                import jesse.helpers as jh
+                print(jh.color(f'Failed to publish buffered messages: {e}', 'red'))
@@ -1,15 +1,20 @@
-import aioredis
-import redis as sync_redis_lib
-import simplejson as json
 import asyncio
 import jesse.helpers as jh
-from jesse.libs.custom_json import NpEncoder
+from jesse.libs import columnar
 import os
-import base64
+from jesse.services import message_encoding
 from jesse.services.env import ENV_VALUES
+from jesse.services.publish_buffer import PublishBuffer
+
+# the clients connect on first use, so processes which import this module
+# (such as the ones running backtests) don't connect to Redis unless they publish
+_async_redis = None
+_sync_redis = None
 
 
 async def init_redis():
+    import aioredis
+
     return await aioredis.create_redis_pool(
         address=(ENV_VALUES['REDIS_HOST'], ENV_VALUES['REDIS_PORT']),
         password=ENV_VALUES['REDIS_PASSWORD'] or None,
@@ -17,57 +22,107 @@ async def init_redis():
     )
 
 
-async_redis = None
-sync_redis = None
-if jh.is_jesse_project():
-    if not jh.is_notebook():
-        async_redis = asyncio.run(init_redis())
-        sync_redis = sync_redis_lib.Redis(
+async def get_async_redis():
+    global _async_redis
+    if _async_redis is None:
+        pool = await init_redis()
+        # another coroutine might have connected in the meantime
+        if _async_redis is None:
+            _async_redis = pool
+        else:
+            pool.close()
+    return _async_redis
+
+
+def get_sync_redis():
+    global _sync_redis
+    if _sync_redis is None:
+        import redis as sync_redis_lib
+
+        _sync_redis = sync_redis_lib.Redis(
             host=ENV_VALUES['REDIS_HOST'], port=ENV_VALUES['REDIS_PORT'], db=int(ENV_VALUES.get('REDIS_DB') or 0),
             password=ENV_VALUES['REDIS_PASSWORD'] if ENV_VALUES['REDIS_PASSWORD'] else None
         )
+    return _sync_redis
+
+
+# high-frequency events which are batched into one Redis publish per tick
+COALESCED_EVENTS = {'progressbar', 'general_info', 'positions', 'orders', 'current_candles', 'watch_list'}
+STREAMED_EVENTS = {'info_log', 'error_log', 'log'}
+
+
+def _channel() -> str:
+    return f"{ENV_VALUES['APP_PORT']}:channel:1"
+
+
+def _envelope(event: str, msg, compression: bool) -> dict:
+    return {
+        'id': os.getpid(),
+        'event': f'{jh.app_mode()}.{event}',
+        # compression is applied by the websocket manager depending on each client's encoding
+        'is_compressed': compression,
+        'data': msg
+    }
+
+
+def _binary_message(event: str, msg) -> bytes:
+    return columnar.encode({
+        'id': os.getpid(),
+        'event': f'{jh.app_mode()}.{event}',
+        'is_compressed': False,
+        'is_binary': True,
+        'data': msg
+    })
 
 
-def sync_publish(event: str, msg, compression: bool = False):
+def _publish_batch(envelopes: list) -> None:
+    get_sync_redis().publish(_channel(), message_encoding.pack({'id': os.getpid(), 'is_batch': True, 'data': envelopes}))
+
+
+publish_buffer = PublishBuffer(_publish_batch)
+
+
+def sync_publish(event: str, msg, compression: bool = False, binary: bool = False):
     if jh.is_unit_testing():
         raise EnvironmentError('sync_publish() should be NOT called during testing. There must be something wrong')
 
-    if compression:
-        msg = jh.gzip_compress(msg)
-        # Encode the compressed message using Base64
-        msg = base64.b64encode(msg).decode('utf-8')
-
-    sync_redis.publish(
-        f"{ENV_VALUES['APP_PORT']}:channel:1", json.dumps({
-            'id': os.getpid(),
-            'event': f'{jh.app_mode()}.{event}',
-            'is_compressed': compression,
-            'data': msg
-        }, ignore_nan=True, cls=NpEncoder)
-    )
+    if event in COALESCED_EVENTS or event in STREAMED_EVENTS:
+        publish_buffer.add(event, _envelope(event, msg, compression), coalesce=event in COALESCED_EVENTS)
+        return
+
+    # keep the order of the events
+    publish_buffer.flush()
 
+    if binary:
+        # numpy arrays inside msg are sent as raw typed arrays (see jesse.libs.columnar)
+        get_sync_redis().publish(_channel(), _binary_message(event, msg))
+        return
 
-async def async_publish(event: str, msg, compression: bool = False):
+    get_sync_redis().publish(_channel(), message_encoding.pack(_envelope(event, msg, compression)))
+
+
+async def async_publish(event: str, msg, compression: bool = False, binary: bool = False):
     if jh.is_unit_testing():
         raise EnvironmentError('sync_publish() should be NOT called during testing. There must be something wrong')
 
-    if compression:
-        msg = jh.gzip_compress(msg)
-        # Encode the compressed message using Base64
-        msg = base64.b64encode(msg).decode('utf-8')
-
-    await async_redis.publish(
-        f"{ENV_VALUES['APP_PORT']}:channel:1", json.dumps({
-            'id': os.getpid(),
-            'event': f'{jh.app_mode()}.{event}',
-            'is_compressed': compression,
-            'data': msg
-        }, ignore_nan=True, cls=NpEncoder)
-    )
+    if event in COALESCED_EVENTS or event in STREAMED_EVENTS:
+        publish_buffer.add(event, _envelope(event, msg, compression), coalesce=event in COALESCED_EVENTS)
+        return
+
+    # the buffered messages go first; they are published with the sync client, which
+    # would block the event loop
+    await asyncio.get_running_loop().run_in_executor(None, publish_buffer.flush)
+
+    async_redis = await get_async_redis()
+    if binary:
+        await async_redis.publish(_channel(), _binary_message(event, msg))
+        return
+
+    await async_redis.publish(_channel(), message_encoding.pack(_envelope(event, msg, compression)))
 
 
 def is_process_active(client_id: str) -> bool:
     if jh.is_unit_testing():
         return False
 
-    return sync_redis.sismember(f"{ENV_VALUES['APP_PORT']}|active-processes", client_id)
+    return get_sync_redis().sismember(f"{ENV_VALUES['APP_PORT']}|active-processes", client_id)
@@ -132,8 +132,8 @@ def livetrade():
         'current_balance': str(current_balance),
         'debug_mode': str(config['app']['debug_mode']),
         'paper_mode': str(jh.is_paper_trading()),
-        'count_error_logs': str(len(store.logs.errors)),
-        'count_info_logs': str(len(store.logs.info)),
+        'count_error_logs': str(store.logs.errors.count),
+        'count_info_logs': str(store.logs.info.count),
         'count_active_orders': str(store.orders.count_all_active_orders()),
         'open_positions': str(store.positions.count_open_positions()),
         'pnl': str(pnl),
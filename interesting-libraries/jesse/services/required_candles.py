@@ -8,7 +8,7 @@ from jesse.config import config
 from jesse.exceptions import CandleNotFoundInDatabase
 from jesse.models import Candle
 from jesse.services.cache import cache
-from jesse.services.candle import generate_candle_from_one_minutes
+from jesse.services.candle import resample
 from jesse.store import store
 
 
@@ -112,30 +112,9 @@ def inject_required_candles_to_store(candles: np.ndarray, exchange: str, symbol:
     """
     generate and add required candles to the candle store
     """
-    # batch add 1m candles:
-    store.candles.batch_add_candle(candles, exchange, symbol, '1m', with_generation=False)
-
-    # loop to generate, and add candles (without execution)
-    for i in range(len(candles)):
-        for timeframe in config['app']['considering_timeframes']:
-            # skip 1m. already added
-            if timeframe == '1m':
-                continue
-
-            num = jh.timeframe_to_one_minutes(timeframe)
-
-            if (i + 1) % num == 0:
-                generated_candle = generate_candle_from_one_minutes(
-                    timeframe,
-                    candles[(i - (num - 1)):(i + 1)],
-                    True
-                )
-
-                store.candles.add_candle(
-                    generated_candle,
-                    exchange,
-                    symbol,
-                    timeframe,
-                    with_execution=False,
-                    with_generation=False
-                )
+    # generate candles of bigger timeframes, and add them with the 1m candles (without execution)
+    generated_by_timeframe = {
+        timeframe: resample(candles, timeframe)
+        for timeframe in config['app']['considering_timeframes'] if timeframe != '1m'
+    }
+    store.candles.bulk_load(exchange, symbol, candles, generated_by_timeframe)
@@ -0,0 +1,59 @@
+from time import monotonic
+from typing import Callable, Union
+
+
+class ThrottledPublisher:
+    """
+    Coalesces frequent dashboard updates so that each event is published
+    at most once per `interval` seconds.
+
+    - set(): state-like events (progressbar, general_info, ...). Only the
+      latest value is published. The value can also be a callable which is
+      evaluated at flush time, so expensive payloads are built once per window.
+    - extend(): stream-like events (objective_curve, ...). Items are
+      accumulated and published together as one list.
+    """
+    def __init__(self, interval: float = 0.5, publish: Callable = None, clock: Callable = monotonic) -> None:
+        if publish is None:
+            from jesse.services.redis import sync_publish
+            publish = sync_publish
+
+        self.interval = interval
+        self._publish = publish
+        self._clock = clock
+        self._last_flush = None
+        self._latest = {}
+        self._items = {}
+
+    def set(self, event: str, msg: Union[Callable, dict, list]) -> None:
+        self._latest[event] = msg
+
+    def extend(self, event: str, items: list) -> None:
+        self._items.setdefault(event, []).extend(items)
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._latest) or bool(self._items)
+
+    def maybe_flush(self) -> bool:
+        """
+        Publishes the pending events if the time window has passed since
+        the last flush. Returns True if a flush happened.
+        """
+        if not self.has_pending:
+            return False
+        if self._last_flush is not None and self._clock() - self._last_flush < self.interval:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        latest, items = self._latest, self._items
+        self._latest, self._items = {}, {}
+        self._last_flush = self._clock()
+
+        for event, msg in latest.items():
+            self._publish(event, msg() if callable(msg) else msg)
+        for event, msg in items.items():
+            if msg:
+                self._publish(event, msg)
@@ -52,6 +52,22 @@ class OptimizationRequestJson(BaseModel):
     state: dict
 
 
+class WalkForwardOptimizationRequestJson(BaseModel):
+    id: str
+    exchange: str
+    routes: List[Dict[str, str]]
+    data_routes: List[Dict[str, str]]
+    config: dict
+    start_date: str
+    finish_date: str
+    folds: int
+    anchored: bool = False
+    optimal_total: int
+    fast_mode: bool
+    cpu_cores: int
+    state: dict
+
+
 class ImportCandlesRequestJson(BaseModel):
     id: str
     exchange: str
@@ -1,37 +1,149 @@
 import asyncio
-import json
-from typing import Set
+from collections import Counter, deque
+from typing import Dict, Set
 from starlette.websockets import WebSocket
 
-from jesse.services.redis import async_redis
+from jesse.libs import columnar
+from jesse.services import message_encoding
+from jesse.services.redis import get_async_redis, COALESCED_EVENTS
 from jesse.services.multiprocessing import process_manager
 import jesse.helpers as jh
 
 
+# how many messages can wait to be sent to one connection
+SEND_QUEUE_SIZE = 256
+
+
+def _is_coalesced(event: str) -> bool:
+    # events are prefixed with the app mode, e.g. "backtest.progressbar"
+    return event.split('.', 1)[-1] in COALESCED_EVENTS
+
+
+class SendQueue:
+    """
+    Bounded queue of the frames which are waiting to be sent to one websocket.
+
+    When it's full, a queued message of a coalesced event (only the latest value
+    matters, see redis.COALESCED_EVENTS) which has a newer message in the queue is
+    dropped. If there is none, the oldest message is dropped.
+    """
+    def __init__(self, maxsize: int = SEND_QUEUE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = deque()
+        self._not_empty = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, event: str, frame) -> None:
+        if len(self._items) >= self.maxsize:
+            self._make_room()
+        self._items.append((event, frame))
+        self._not_empty.set()
+
+    def _make_room(self) -> None:
+        counts = Counter(e for e, _ in self._items)
+        for i, (e, _) in enumerate(self._items):
+            if counts[e] > 1 and _is_coalesced(e):
+                del self._items[i]
+                break
+        else:
+            self._items.popleft()
+        self.dropped += 1
+
+    async def get(self):
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._items.popleft()[1]
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Set[WebSocket] = set()
+        # the message encoding each connection has asked for (see message_encoding)
+        self.encodings: Dict[WebSocket, str] = {}
+        # connections which have asked for the charts as columnar binary frames (see jesse.libs.columnar)
+        self.columnar_connections: Set[WebSocket] = set()
+        # each connection has its own queue and writer task so a slow client can't block the others
+        self.send_queues: Dict[WebSocket, SendQueue] = {}
+        self.writer_tasks: Dict[WebSocket, asyncio.Task] = {}
         self.is_subscribed = False
         self.redis_subscriber = None
         self.reader_task = None
         
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, encoding: str = message_encoding.JSON, columnar: bool = False):
+        if encoding not in message_encoding.ENCODINGS:
+            encoding = message_encoding.JSON
         await websocket.accept()
         self.active_connections.add(websocket)
+        self.encodings[websocket] = encoding
+        if columnar:
+            self.columnar_connections.add(websocket)
+        self.send_queues[websocket] = SendQueue()
+        self.writer_tasks[websocket] = asyncio.create_task(self._writer(websocket, self.send_queues[websocket]))
         
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        
+        self.active_connections.discard(websocket)
+        self.encodings.pop(websocket, None)
+        self.columnar_connections.discard(websocket)
+        self.send_queues.pop(websocket, None)
+        task = self.writer_tasks.pop(websocket, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _writer(self, websocket: WebSocket, queue: SendQueue):
+        try:
+            while True:
+                frame = await queue.get()
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(jh.color(f"WebSocket send error: {str(e)}", 'red'))
+            self.disconnect(websocket)
+
     async def broadcast(self, message: dict):
-        # Process id with the manager for each websocket separately
-        for connection in self.active_connections:
-            message_copy = dict(message)
-            message_copy['id'] = process_manager.get_client_id(message_copy['id'])
-            await connection.send_json(message_copy)
-            
+        message = dict(message)
+        message['id'] = process_manager.get_client_id(message['id'])
+        # encode the message once per encoding instead of once per connection
+        rendered = {}
+        for connection in list(self.active_connections):
+            encoding = self.encodings.get(connection, message_encoding.JSON)
+            if encoding not in rendered:
+                rendered[encoding] = message_encoding.render(message, encoding)
+            self.send_queues[connection].put(message['event'], rendered[encoding])
+
+    async def broadcast_binary(self, message: bytes):
+        # only the header is decoded to set the id; the arrays are forwarded as they are
+        header, buffers = columnar.decode_header(message)
+        client_id = process_manager.get_client_id(header['id'])
+        header['id'] = client_id
+        frame = None
+        # the clients which haven't asked for columnar frames get the legacy message, rendered once per encoding
+        legacy_envelope = None
+        rendered = {}
+        for connection in list(self.active_connections):
+            if connection in self.columnar_connections:
+                if frame is None:
+                    frame = columnar.encode_with_header(header, buffers)
+                self.send_queues[connection].put(header['event'], frame)
+                continue
+
+            encoding = self.encodings.get(connection, message_encoding.JSON)
+            if encoding not in rendered:
+                if legacy_envelope is None:
+                    legacy_envelope = dict(message_encoding.from_columnar(message), id=client_id)
+                rendered[encoding] = message_encoding.render(legacy_envelope, encoding)
+            self.send_queues[connection].put(header['event'], rendered[encoding])
+
     async def start_redis_listener(self, channel_pattern):
         if not self.is_subscribed:
-            self.redis_subscriber, = await async_redis.psubscribe(channel_pattern)
+            self.redis_subscriber, = await (await get_async_redis()).psubscribe(channel_pattern)
             self.is_subscribed = True
             
             # Start the listener task
@@ -40,9 +152,16 @@ class ConnectionManager:
     async def _redis_listener(self, channel):
         try:
             async for ch, message in channel.iter():
+                if columnar.is_encoded(message):
+                    await self.broadcast_binary(message)
+                    continue
                 # Parse the message and broadcast to all clients
-                message_dict = json.loads(message)
-                await self.broadcast(message_dict)
+                message_dict = message_encoding.decode(message)
+                if message_dict.get('is_batch'):
+                    for m in message_dict['data']:
+                        await self.broadcast(m)
+                else:
+                    await self.broadcast(message_dict)
         except Exception as e:
             print(jh.color(f"Redis listener error: {str(e)}", 'red'))
             
@@ -53,7 +172,7 @@ class ConnectionManager:
                 self.reader_task.cancel()
                 
             from jesse.services.env import ENV_VALUES
-            await async_redis.punsubscribe(f"{ENV_VALUES['APP_PORT']}:channel:*")
+            await (await get_async_redis()).punsubscribe(f"{ENV_VALUES['APP_PORT']}:channel:*")
             self.is_subscribed = False
             print(jh.color("Redis unsubscribed - no more active connections", 'yellow'))
 
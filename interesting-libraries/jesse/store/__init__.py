@@ -97,12 +97,19 @@ class StoreClass:
         if not jh.is_unit_testing() or force_install_routes:
             install_routes()
 
+        self.candles = CandlesState()
+        self.reset_trading_state()
+
+    def reset_trading_state(self) -> None:
+        """
+        Resets the states that are mutated while trading, but keeps the installed
+        routes and the candles untouched. Used for re-running backtests on warm candles.
+        """
         self.app = AppState()
         self.orders = OrdersState()
         self.completed_trades = ClosedTrades()
         self.logs = LogsState()
         self.exchanges = ExchangesState()
-        self.candles = CandlesState()
         self.positions = PositionsState()
         self.tickers = TickersState()
         self.trades = TradesState()
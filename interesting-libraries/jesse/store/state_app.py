@@ -9,6 +9,8 @@ class AppState:
         self.starting_time = None
         self.ending_time = None
         self.daily_balance = []
+        # IntradayEquityRecorder of the backtest if the intraday equity curve is requested
+        self.equity_recorder = None
 
         # used as placeholders for detecting open trades metrics
         self.total_open_trades = 0
@@ -1,3 +1,5 @@
+import threading
+
 import numpy as np
 
 import jesse.helpers as jh
@@ -5,19 +7,96 @@ import jesse.services.selectors as selectors
 from jesse.config import config
 from jesse.enums import timeframes
 from jesse.exceptions import RouteNotFound
-from jesse.libs import DynamicNumpyArray
-from jesse.models.Candle import store_candle_into_db
+from jesse.libs import DynamicNumpyArray, TradeAggregator
+from jesse.services.candle_writer import candle_writer
 from jesse.services.candle import generate_candle_from_one_minutes
 from timeloop import Timeloop
 from datetime import timedelta
 from jesse.services import logger
 
+# milliseconds between two updates of a forming candle that is generated from trades
+TRADE_CANDLE_EMIT_INTERVAL = 1000
+
+
+class _FormingCandle:
+    """
+    A candle which is being generated from the trades stream
+    """
+    __slots__ = ('aggregator', 'route', 'emitted_at', 'emitted_count')
+
+    def __init__(self, candle: np.ndarray, route: tuple) -> None:
+        self.aggregator = TradeAggregator(candle)
+        # (exchange, symbol, timeframe)
+        self.route = route
+        self.emitted_at = 0
+        self.emitted_count = 0
+
+    @property
+    def has_pending(self) -> bool:
+        return self.aggregator.count != self.emitted_count
+
+
+class _GeneratedCandle:
+    """
+    The forming candle of a bigger timeframe that is generated from the 1m candles in live
+    sessions. The aggregates of its completed 1m candles are kept, so each update of the
+    forming 1m candle costs O(1) instead of slicing and reducing its 1m candles again.
+    """
+    __slots__ = ('timestamp', 'last_minute', 'open', 'high', 'low', 'volume')
+
+    def __init__(self, one_minutes: np.ndarray) -> None:
+        # the 1m candles of the forming candle so far; the last one is still forming
+        completed = one_minutes[:-1]
+        self.timestamp = one_minutes[0][0]
+        self.last_minute = one_minutes[-1][0]
+        self.open = completed[0][1] if len(completed) else None
+        self.high = completed[:, 3].max() if len(completed) else -np.inf
+        self.low = completed[:, 4].min() if len(completed) else np.inf
+        self.volume = completed[:, 5].sum()
+
+    def update(self, one_minutes: DynamicNumpyArray):
+        """
+        Returns the updated candle, or None if the new 1m candle doesn't continue the
+        previous one (in which case it has to be generated from the 1m candles again)
+        """
+        current = one_minutes[-1]
+        if current[0] == self.last_minute + 60_000:
+            previous = one_minutes[-2]
+            if previous[0] != self.last_minute:
+                return None
+            # the previous 1m candle is completed
+            if self.open is None:
+                self.open = previous[1]
+            self.high = max(self.high, previous[3])
+            self.low = min(self.low, previous[4])
+            self.volume += previous[5]
+            self.last_minute = current[0]
+        elif current[0] != self.last_minute:
+            return None
+
+        return np.array([
+            self.timestamp,
+            current[1] if self.open is None else self.open,
+            current[2],
+            max(self.high, current[3]),
+            min(self.low, current[4]),
+            self.volume + current[5],
+        ])
+
 
 class CandlesState:
     def __init__(self) -> None:
         self.storage = {}
         self.are_all_initiated = False
         self.initiated_pairs = {}
+        # forming candles which are generated from trades, by route key. The lock is held while they are
+        # updated by the trades stream and while the timeloop thread adds them to the candles
+        self.candles_from_trades = {}
+        self._candles_from_trades_lock = threading.Lock()
+        # forming candles of the bigger timeframes which are generated from 1m candles, by route key
+        self.generated_candles = {}
+        # the parallel route execution of backtests reads the candles from several threads
+        self._forming_candles_lock = threading.Lock()
 
     def generate_new_candles_loop(self) -> None:
         """
@@ -31,6 +110,9 @@ class CandlesState:
             if not self.are_all_initiated:
                 return
 
+            # add the latest trades to the candles (which are generated from trades)
+            self.flush_candles_from_trades()
+
             # only at first second on each minute
             if jh.now() % 60_000 != 1000:
                 return
@@ -177,14 +259,18 @@ class CandlesState:
             )
 
     def _store_or_update_candle_into_db(self, exchange: str, symbol: str, timeframe: str, candle: np.ndarray) -> None:
-        # if it's not an initial candle, add it to the storage, if already exists, update it
+        # if it's not an initial candle, add it to the storage, if already exists, update it.
+        # it's written in the background, in batches, by the candle writer
         if f'{exchange}-{symbol}' in self.initiated_pairs:
-            store_candle_into_db(exchange, symbol, timeframe, candle, on_conflict='replace')
+            candle_writer.add(exchange, symbol, timeframe, candle)
 
     def add_candle_from_trade(self, trade, exchange: str, symbol: str) -> None:
         """
         In few exchanges, there's no candle stream over the WS, for
-        those we have to use cases the trades stream
+        those we have to use cases the trades stream.
+
+        Trades are aggregated into the forming candle in scalars, and the candle is added
+        to the store only when a new candle begins or every TRADE_CANDLE_EMIT_INTERVAL.
         """
         if not jh.is_live():
             raise Exception('add_candle_from_trade() is for live modes only')
@@ -196,36 +282,57 @@ class CandlesState:
         # update position's current price
         self.update_position(exchange, symbol, trade['price'])
 
-        def do(t):
+        # to support both candle generation and ...
+        if jh.get_config('env.data.generate_candles_from_1m'):
+            self._add_trade_to_forming_candle(trade, exchange, symbol, '1m')
+        else:
+            for ar in selectors.get_all_routes():
+                if ar['exchange'] == exchange and ar['symbol'] == symbol:
+                    self._add_trade_to_forming_candle(trade, exchange, symbol, ar['timeframe'])
+
+    def _add_trade_to_forming_candle(self, trade, exchange: str, symbol: str, timeframe: str) -> None:
+        with self._candles_from_trades_lock:
+            self._add_trade_to_forming_candle_unlocked(trade, exchange, symbol, timeframe)
+
+    def _add_trade_to_forming_candle_unlocked(self, trade, exchange: str, symbol: str, timeframe: str) -> None:
+        key = jh.key(exchange, symbol, timeframe)
+        now = jh.now()
+        forming = self.candles_from_trades.get(key)
+
+        # a new candle has begun: add the finished one and continue the store's current candle
+        if forming is None or now >= forming.aggregator.timestamp + jh.timeframe_to_one_minutes(timeframe) * 60_000:
+            if forming is not None and forming.has_pending:
+                self.add_candle(forming.aggregator.to_candle(), exchange, symbol, timeframe)
+
             # in some cases we might be missing the current forming candle like it is on FTX, hence
             # if that is the case, generate the current forming candle (it won't be super accurate)
-            current_candle = self.get_current_candle(exchange, symbol, t)
-            if jh.next_candle_timestamp(current_candle, t) < jh.now():
-                new_candle = self._generate_empty_candle_from_previous_candle(current_candle, t)
-                self.add_candle(new_candle, exchange, symbol, t)
+            current_candle = self.get_current_candle(exchange, symbol, timeframe)
+            if jh.next_candle_timestamp(current_candle, timeframe) < now:
+                new_candle = self._generate_empty_candle_from_previous_candle(current_candle, timeframe)
+                self.add_candle(new_candle, exchange, symbol, timeframe)
+                current_candle = self.get_current_candle(exchange, symbol, timeframe)
 
-            current_candle = self.get_current_candle(exchange, symbol, t)
+            forming = _FormingCandle(current_candle, (exchange, symbol, timeframe))
+            self.candles_from_trades[key] = forming
 
-            new_candle = current_candle.copy()
-            # close
-            new_candle[2] = trade['price']
-            # high
-            new_candle[3] = max(new_candle[3], trade['price'])
-            # low
-            new_candle[4] = min(new_candle[4], trade['price'])
-            # volume
-            new_candle[5] += trade['volume']
+        forming.aggregator.add(now, trade['price'], trade['volume'])
 
-            self.add_candle(new_candle, exchange, symbol, t)
+        if now - forming.emitted_at >= TRADE_CANDLE_EMIT_INTERVAL:
+            self._emit_forming_candle(forming, exchange, symbol, timeframe, now)
 
-        # to support both candle generation and ...
-        if jh.get_config('env.data.generate_candles_from_1m'):
-            do('1m')
-        else:
-            for ar in selectors.get_all_routes():
-                if ar['exchange'] != exchange or ar['symbol'] != symbol:
-                    return
-                do(ar['timeframe'])
+    def _emit_forming_candle(self, forming: '_FormingCandle', exchange: str, symbol: str, timeframe: str, now: int) -> None:
+        self.add_candle(forming.aggregator.to_candle(), exchange, symbol, timeframe)
+        forming.emitted_at = now
+        forming.emitted_count = forming.aggregator.count
+
+    def flush_candles_from_trades(self) -> None:
+        """
+        Adds the trades that haven't been added to the forming candles yet
+        """
+        with self._candles_from_trades_lock:
+            for forming in self.candles_from_trades.values():
+                if forming.has_pending:
+                    self._emit_forming_candle(forming, *forming.route, jh.now())
 
     @staticmethod
     def update_position(exchange: str, symbol: str, price: float) -> None:
@@ -248,11 +355,26 @@ class CandlesState:
         if not jh.is_live():
             return
 
+        one_minutes = self.get_storage(exchange, symbol, '1m')
         for timeframe in config['app']['considering_timeframes']:
             # skip '1m'
             if timeframe == '1m':
                 continue
 
+            # update the forming candle with the new 1m candle if it's the one that was generated last time
+            generated = self.generated_candles.get(jh.key(exchange, symbol, timeframe))
+            if (
+                    generated is not None
+                    and len(one_minutes) > 1
+                    and generated.timestamp == self._current_candle_timestamp(exchange, symbol, timeframe)
+            ):
+                generated_candle = generated.update(one_minutes)
+                if generated_candle is not None:
+                    self.add_candle(
+                        generated_candle, exchange, symbol, timeframe, with_execution, with_generation=False
+                    )
+                    continue
+
             last_candle = self.get_current_candle(exchange, symbol, timeframe)
             generate_from_count = int((candle[0] - last_candle[0]) / 60_000)
             number_of_candles = len(self.get_candles(exchange, symbol, '1m'))
@@ -283,26 +405,31 @@ class CandlesState:
                 short_candles,
                 accept_forming_candles=True
             )
+            self.generated_candles[jh.key(exchange, symbol, timeframe)] = _GeneratedCandle(short_candles)
 
             self.add_candle(
                 generated_candle, exchange, symbol, timeframe, with_execution, with_generation=False
             )
 
     def simulate_order_execution(self, exchange: str, symbol: str, timeframe: str, new_candle: np.ndarray) -> None:
+        from jesse.store import store
+
         previous_candle = self.get_current_candle(exchange, symbol, timeframe)
-        orders = selectors.get_orders(exchange, symbol)
 
         if previous_candle[2] == new_candle[2]:
             return
 
-        for o in orders:
-            # skip inactive orders
-            if not o.is_active:
-                continue
+        low, high = sorted((previous_candle[2], new_candle[2]))
+        # executing an order can submit new ones (such as the exit orders) which might be in the range too
+        while True:
+            orders = store.orders.get_active_orders_between(exchange, symbol, low, high)
+            if not orders:
+                return
 
-            if ((o.price >= previous_candle[2]) and (o.price <= new_candle[2])) or (
-                    (o.price <= previous_candle[2]) and (o.price >= new_candle[2])):
-                o.execute()
+            for o in orders:
+                # skip the orders that were cancelled by the execution of the previous ones
+                if o.is_active:
+                    o.execute()
 
     def batch_add_candle(
             self,
@@ -315,6 +442,47 @@ class CandlesState:
         for c in candles:
             self.add_candle(c, exchange, symbol, timeframe, with_execution=False, with_generation=with_generation, with_skip=False)
 
+    def bulk_load(
+            self,
+            exchange: str,
+            symbol: str,
+            one_minute_array: np.ndarray,
+            generated_by_timeframe: dict
+    ) -> None:
+        """
+        Loads past candles (such as warmup candles) into the storage without execution, with
+        one write per timeframe. generated_by_timeframe is {timeframe: candles} of the
+        bigger timeframes, already generated from one_minute_array.
+        """
+        candles_by_timeframe = {timeframes.MINUTE_1: one_minute_array, **generated_by_timeframe}
+
+        for timeframe, candles in candles_by_timeframe.items():
+            if len(candles) == 0:
+                continue
+
+            arr: DynamicNumpyArray = self.get_storage(exchange, symbol, timeframe)
+
+            # live sessions store candles into the database too, and candles which aren't newer
+            # than the stored ones replace them; both are handled by add_candle()
+            if jh.is_live() or (len(arr) and candles[0][0] <= arr[-1][0]):
+                self.batch_add_candle(candles, exchange, symbol, timeframe, with_generation=False)
+                continue
+
+            arr.append_multiple(candles)
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the candles storage which can later be restored by restore_snapshot().
+        Used for re-running backtests on the same (warm) candles without re-injecting them.
+        """
+        return {key: (arr.index, arr.array.copy()) for key, arr in self.storage.items()}
+
+    def restore_snapshot(self, snapshot: dict) -> None:
+        for key, (index, array) in snapshot.items():
+            arr: DynamicNumpyArray = self.storage[key]
+            arr.index = index
+            arr.array = array.copy()
+
     def forming_estimation(self, exchange: str, symbol: str, timeframe: str) -> tuple:
         long_key = jh.key(exchange, symbol, timeframe)
         short_key = jh.key(exchange, symbol, '1m')
@@ -354,12 +522,21 @@ class CandlesState:
                 True
             )
             existing_candles_arr: DynamicNumpyArray = self.storage[long_key]
-            self.add_candle(forming_candle, exchange, symbol, timeframe, with_execution=False, with_generation=False, with_skip=False)
-            return existing_candles_arr[:]
+            with self._forming_candles_lock:
+                self.add_candle(forming_candle, exchange, symbol, timeframe, with_execution=False, with_generation=False, with_skip=False)
+                return existing_candles_arr[:]
         # in live mode, just return the complete candles
         else:
             return self.storage[long_key][:long_count]
 
+    def get_candles_stack(self, exchange: str, symbols: list, timeframe: str, length: int = None) -> np.ndarray:
+        """
+        The candles of several symbols as one (symbols, length, 6) array, for computing
+        indicators across all of them at once with jesse.indicators.cross_section()
+        """
+        from jesse.services.candle import stack_candles
+        return stack_candles([self.get_candles(exchange, symbol, timeframe) for symbol in symbols], length)
+
     def get_current_candle(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
         # no need to worry for forming candles when timeframe == 1m
         if timeframe == '1m':
@@ -385,6 +562,15 @@ class CandlesState:
         else:
             return self.storage[long_key][-1]
 
+    def _current_candle_timestamp(self, exchange: str, symbol: str, timeframe: str) -> float:
+        # the timestamp of get_current_candle() without generating the forming candle
+        dif, long_key, short_key = self.forming_estimation(exchange, symbol, timeframe)
+        if dif != 0:
+            short_candles = self.storage[short_key]
+            return short_candles[len(short_candles) - dif][0]
+        long_candles = self.storage[long_key]
+        return long_candles[-1][0] if len(long_candles) else None
+
     def add_multiple_1m_candles(
         self,
         candles: np.ndarray,
@@ -6,10 +6,100 @@ from jesse.enums import sides
 from jesse.services import logger
 
 
+class RunningTradesMetrics:
+    """
+    Trade metrics which are updated in O(1) per closed trade so that reading
+    them (for example through Strategy.metrics) doesn't require going
+    through all the closed trades again.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.winning_count = 0
+        self.losing_count = 0
+        self.longs_count = 0
+        self.fee = 0
+        self.gross_profit = 0
+        self.gross_loss = 0
+        self.holding_period = 0
+        self.winning_holding_period = 0
+        self.losing_holding_period = 0
+        self.largest_winning_trade = 0
+        self.largest_losing_trade = 0
+        # positive for consecutive winning trades, negative for losing ones
+        self.current_streak = 0
+        self.max_streak = 0
+        self.min_streak = 0
+        # Welford's online mean and variance of the trades' PNL percentages
+        self.pnl_percentage_mean = 0
+        self._pnl_percentage_m2 = 0
+        # drawdown of the cumulative PNL of the closed trades
+        self.cumulative_pnl = 0
+        self.peak_cumulative_pnl = 0
+        self.max_drawdown = 0
+
+    def add(self, trade: ClosedTrade) -> None:
+        pnl = trade.pnl
+        holding_period = trade.holding_period
+
+        self.count += 1
+        self.fee += trade.fee
+        self.holding_period += holding_period
+        if trade.is_long:
+            self.longs_count += 1
+
+        if pnl > 0:
+            self.winning_count += 1
+            self.gross_profit += pnl
+            self.winning_holding_period += holding_period
+            self.largest_winning_trade = max(self.largest_winning_trade, pnl)
+            self.current_streak = self.current_streak + 1 if self.current_streak > 0 else 1
+        elif pnl < 0:
+            self.losing_count += 1
+            self.gross_loss += pnl
+            self.losing_holding_period += holding_period
+            self.largest_losing_trade = min(self.largest_losing_trade, pnl)
+            self.current_streak = self.current_streak - 1 if self.current_streak < 0 else -1
+        else:
+            self.current_streak = 0
+        self.max_streak = max(self.max_streak, self.current_streak)
+        self.min_streak = min(self.min_streak, self.current_streak)
+
+        pnl_percentage = trade.pnl_percentage
+        delta = pnl_percentage - self.pnl_percentage_mean
+        self.pnl_percentage_mean += delta / self.count
+        self._pnl_percentage_m2 += delta * (pnl_percentage - self.pnl_percentage_mean)
+
+        self.cumulative_pnl += pnl
+        self.peak_cumulative_pnl = max(self.peak_cumulative_pnl, self.cumulative_pnl)
+        self.max_drawdown = max(self.max_drawdown, self.peak_cumulative_pnl - self.cumulative_pnl)
+
+    @property
+    def win_rate(self) -> float:
+        return self.winning_count / self.count if self.count else 0
+
+    @property
+    def average_win(self) -> float:
+        return self.gross_profit / self.winning_count if self.winning_count else np.nan
+
+    @property
+    def average_loss(self) -> float:
+        return self.gross_loss / self.losing_count if self.losing_count else np.nan
+
+    @property
+    def pnl_percentage_variance(self) -> float:
+        """Sample variance of the trades' PNL percentages"""
+        return self._pnl_percentage_m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def pnl_percentage_std(self) -> float:
+        return np.sqrt(self.pnl_percentage_variance)
+
+
 class ClosedTrades:
     def __init__(self) -> None:
         self.trades = []
         self.tempt_trades = {}
+        self.running_metrics = RunningTradesMetrics()
 
     def _get_current_trade(self, exchange: str, symbol: str) -> ClosedTrade:
         key = jh.key(exchange, symbol)
@@ -96,6 +186,7 @@ class ClosedTrades:
             store_closed_trade_into_db(t)
         # store the trade into the list
         self.trades.append(t)
+        self.running_metrics.add(t)
         if not jh.is_unit_testing():
             logger.info(
                 f"CLOSED a {t.type} trade for {t.exchange}-{t.symbol}: qty: {t.qty},"
@@ -1,4 +1,38 @@
+from collections import deque
+
+# how many of the latest logs are kept in memory (the log files keep all of them)
+LOGS_BUFFER_SIZE = 1000
+
+
+class LogsBuffer:
+    """
+    Ring buffer of the latest logs. `count` is the number of logs which have
+    been appended in total, including the ones which are no longer kept.
+    """
+    def __init__(self, maxlen: int = LOGS_BUFFER_SIZE) -> None:
+        self._items = deque(maxlen=maxlen)
+        self.count = 0
+
+    def append(self, log: dict) -> None:
+        self._items.append(log)
+        self.count += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items)[index]
+        return self._items[index]
+
+    def __eq__(self, other) -> bool:
+        return list(self._items) == list(other)
+
+
 class LogsState:
     def __init__(self) -> None:
-        self.errors = []
-        self.info = []
+        self.errors = LogsBuffer()
+        self.info = LogsBuffer()
@@ -1,6 +1,7 @@
 from typing import List
 
 import fnc
+import numpy as np
 
 from jesse.config import config
 from jesse.models import Order
@@ -15,6 +16,8 @@ class OrdersState:
 
         self.storage = {}
         self.active_storage = {}
+        # key => (prices, indexes, orders): the active storage sorted by price, built when needed
+        self._price_index = {}
 
         for exchange in config['app']['trading_exchanges']:
             for symbol in config['app']['trading_symbols']:
@@ -29,6 +32,7 @@ class OrdersState:
         for key in self.storage:
             self.storage[key].clear()
             self.active_storage[key].clear()
+        self._price_index.clear()
 
     def reset_trade_orders(self, exchange: str, symbol: str) -> None:
         """
@@ -37,11 +41,13 @@ class OrdersState:
         key = f'{exchange}-{symbol}'
         self.storage[key] = []
         self.active_storage[key] = []
+        self._price_index.pop(key, None)
 
     def add_order(self, order: Order) -> None:
         key = f'{order.exchange}-{order.symbol}'
         self.storage[key].append(order)
         self.active_storage[key].append(order)
+        self._price_index.pop(key, None)
 
     def remove_order(self, order: Order) -> None:
         key = f'{order.exchange}-{order.symbol}'
@@ -51,6 +57,7 @@ class OrdersState:
         self.active_storage[key] = [
             o for o in self.active_storage[key] if o.id != order.id
         ]
+        self._price_index.pop(key, None)
 
     def execute_pending_market_orders(self) -> None:
         if not self.to_execute:
@@ -72,6 +79,25 @@ class OrdersState:
         key = f'{exchange}-{symbol}'
         return self.active_storage.get(key, [])
 
+    def get_active_orders_between(self, exchange: str, symbol: str, low: float, high: float) -> List[Order]:
+        """
+        Returns the active orders whose price is between low and high (inclusive), in the
+        order that they were submitted in. The active orders are indexed by their price,
+        so that it doesn't check every order's price on each candle update of paper trading.
+        """
+        key = f'{exchange}-{symbol}'
+        if key not in self._price_index:
+            orders = [o for o in self.active_storage.get(key, []) if o.price is not None]
+            prices = np.array([o.price for o in orders], dtype=float)
+            indexes = np.argsort(prices, kind='stable')
+            self._price_index[key] = (prices[indexes], indexes, orders)
+        prices, indexes, orders = self._price_index[key]
+
+        start = np.searchsorted(prices, low, side='left')
+        end = np.searchsorted(prices, high, side='right')
+        # orders that have been executed or cancelled since the index was built are skipped
+        return [orders[i] for i in np.sort(indexes[start:end]) if orders[i].is_active]
+
     def get_all_orders(self, exchange: str) -> List[Order]:
         return [
             o
@@ -171,3 +197,4 @@ class OrdersState:
             if not order.is_canceled and not order.is_executed
         ]
         self.active_storage[key] = active_orders
+        self._price_index.pop(key, None)
@@ -1,7 +1,7 @@
 from typing import List
 import numpy as np
 import jesse.helpers as jh
-from jesse.libs import DynamicNumpyArray
+from jesse.libs import DynamicNumpyArray, TradeAggregator
 from jesse.models.Trade import Trade
 from jesse.services import selectors
 
@@ -16,37 +16,20 @@ class TradesState:
             exchange, symbol = ar['exchange'], ar['symbol']
             key = jh.key(exchange, symbol)
             self.storage[key] = DynamicNumpyArray((60, 6), drop_at=120)
-            self.temp_storage[key] = DynamicNumpyArray((100, 4))
+            self.temp_storage[key] = TradeAggregator()
 
     def add_trade(self, trade: np.ndarray, exchange: str, symbol: str) -> None:
+        """
+        trade: [timestamp, price, qty, is_buy]. Trades are aggregated into one
+        trade per second (see TradeAggregator.to_trade()).
+        """
         key = jh.key(exchange, symbol)
-        if (
-            len(self.temp_storage[key])
-            and trade[0] - self.temp_storage[key][0][0] >= 1000
-        ):
-            arr = self.temp_storage[key]
-            buy_arr = np.array(list(filter(lambda x: x[3] == 1, arr)))
-            sell_arr = np.array(list(filter(lambda x: x[3] == 0, arr)))
+        aggregator: TradeAggregator = self.temp_storage[key]
+        if aggregator.count and trade[0] - aggregator.timestamp >= 1000:
+            self.storage[key].append(aggregator.to_trade())
+            aggregator.reset()
 
-            generated = np.array([
-                # timestamp
-                arr[0][0],
-                # price (weighted average)
-                (arr[:][:, 1] * arr[:][:, 2]).sum() / arr[:][:, 2].sum(),
-                # buy_qty
-                0 if not len(buy_arr) else buy_arr[:, 2].sum(),
-                # sell_qty
-                0 if not len(sell_arr) else sell_arr[:, 2].sum(),
-                # buy_count
-                len(buy_arr),
-                # sell_count
-                len(sell_arr)
-            ])
-
-            self.storage[key].append(generated)
-
-            self.temp_storage[key].flush()
-        self.temp_storage[key].append(trade)
+        aggregator.add(trade[0], trade[1], trade[2], trade[3] == 1)
 
     def get_trades(self, exchange: str, symbol: str) -> List[Trade]:
         key = jh.key(exchange, symbol)
@@ -69,6 +69,7 @@ class Strategy(ABC):
 
         self._cached_methods = {}
         self._cached_metrics = {}
+        self._cached_daily_ratios = (None, None)
         self._current_route_index = None
 
         # Add cached price
@@ -1052,6 +1053,30 @@ class Strategy(ABC):
         for m in self._cached_methods.values():
             m.cache_clear()
 
+    @classmethod
+    def _cached_properties(cls) -> tuple:
+        if '_cached_properties_names' not in cls.__dict__:
+            names = []
+            for klass in cls.__mro__:
+                for name, attr in vars(klass).items():
+                    if isinstance(attr, property) and getattr(attr.fget, 'is_cached', False) and name not in names:
+                        names.append(name)
+            cls._cached_properties_names = tuple(names)
+        return cls._cached_properties_names
+
+    def _prepare(self) -> None:
+        """
+        Evaluates the properties decorated with @cached (usually the indicators) ahead of
+        _execute(), which then reuses their values. The parallel route execution of backtests
+        calls it on worker threads, so those properties must only depend on the candles.
+        """
+        for name in self._cached_properties():
+            try:
+                getattr(self, name)
+            except Exception:
+                # lru_cache doesn't cache exceptions, so _execute() raises it again
+                pass
+
     @property
     def current_candle(self) -> np.ndarray:
         """
@@ -1147,14 +1172,33 @@ class Strategy(ABC):
         """
         return store.candles.get_candles(exchange, symbol, timeframe)
 
+    def get_candles_stack(self, exchange: str, symbols: list, timeframe: str, length: int = None) -> np.ndarray:
+        """
+        Get the candles of several symbols stacked into one (symbols, candles, 6) array,
+        aligned on their last candle. Pass it to ta.cross_section() to compute an
+        indicator for all of the symbols at once.
+
+        :param exchange: str
+        :param symbols: list
+        :param timeframe: str
+        :param length: int - default: the number of candles of the symbol with the most of them
+
+        :return: np.ndarray
+        """
+        return store.candles.get_candles_stack(exchange, symbols, timeframe, length)
+
     @property
     def metrics(self) -> dict:
         """
         Returns all the metrics of the strategy.
         """
         if self.trades_count not in self._cached_metrics:
-            self._cached_metrics[self.trades_count] = metrics.trades(
-                store.completed_trades.trades, store.app.daily_balance, final=False
+            # the daily balance ratios only change once a day
+            days = len(store.app.daily_balance)
+            if self._cached_daily_ratios[0] != days:
+                self._cached_daily_ratios = (days, metrics.daily_balance_ratios(store.app.daily_balance))
+            self._cached_metrics[self.trades_count] = metrics.running_trades(
+                store.completed_trades.running_metrics, store.app.daily_balance, self._cached_daily_ratios[1]
             )
         return self._cached_metrics[self.trades_count]
 
@@ -1,16 +1,17 @@
 import math
 from decimal import Decimal
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 import numpy as np
-import pandas as pd
 
 import jesse.helpers as jh
 from jesse.enums import timeframes
-import statsmodels.api as sm
 
 import jesse_rust
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def anchor_timeframe(timeframe: str) -> str:
     """
@@ -122,7 +123,9 @@ def limit_stop_loss(entry_price: float, stop_price: float, trade_type: str, max_
 def numpy_candles_to_dataframe(candles: np.ndarray, name_date: str = "date", name_open: str = "open",
                                name_high: str = "high",
                                name_low: str = "low", name_close: str = "close",
-                               name_volume: str = "volume") -> pd.DataFrame:
+                               name_volume: str = "volume") -> 'pd.DataFrame':
+    import pandas as pd
+
     columns = [name_date, name_open, name_close, name_high, name_low, name_volume]
     df = pd.DataFrame(data=candles, index=pd.to_datetime(candles[:, 0], unit="ms"), columns=columns)
     df[name_date] = pd.to_datetime(df.index, unit="ms")
@@ -316,6 +319,8 @@ def combinations_without_repeat(a: np.ndarray, n: int = 2) -> np.ndarray:
 
 
 def calculate_alpha_beta(returns1: np.ndarray, returns2: np.ndarray) -> tuple:
+    import statsmodels.api as sm
+
     # Add a constant to the independent variable (returns2)
     X = sm.add_constant(returns2)  # Independent variable
     model = sm.OLS(returns1, X).fit()  # Fit the model
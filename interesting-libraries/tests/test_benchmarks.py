@@ -0,0 +1,69 @@
+import numpy as np
+
+from jesse.benchmarks.optimization import synthetic_candles, measure_trial_phases, _core_counts, WARMUP_CANDLES_NUM
+
+
+def test_synthetic_candles_are_split_into_training_and_testing_periods():
+    training_warmup, training, testing_warmup, testing = synthetic_candles(3)
+
+    key = 'Sandbox-BTC-USDT'
+    warmup_count = WARMUP_CANDLES_NUM * 5
+    assert len(training_warmup[key]['candles']) == warmup_count
+    assert len(training[key]['candles']) == 2 * 1440
+    assert len(testing_warmup[key]['candles']) == warmup_count
+    assert len(testing[key]['candles']) == 1440
+    # periods are continuous
+    assert training[key]['candles'][0][0] - training_warmup[key]['candles'][-1][0] == 60_000
+    assert testing_warmup[key]['candles'][-1][0] == training[key]['candles'][-1][0]
+    assert testing[key]['candles'][0][0] - training[key]['candles'][-1][0] == 60_000
+
+    # reproducible
+    assert (synthetic_candles(3)[1][key]['candles'] == training[key]['candles']).all()
+
+
+def test_measure_trial_phases():
+    result = measure_trial_phases(synthetic_candles(1), trials=2)
+
+    assert result['trials'] == 2
+    for k in ['cold_setup_seconds', 'cold_simulation_seconds', 'warm_setup_seconds', 'warm_trial_seconds']:
+        assert result[k] > 0
+
+
+def test_core_counts():
+    assert _core_counts(1) == [1]
+    assert _core_counts(6) == [1, 2, 4, 6]
+    assert _core_counts(8) == [1, 2, 4, 8]
+
+
+def test_indicator_benchmark_candles():
+    from jesse.benchmarks.indicators import benchmark_candles
+
+    candles = benchmark_candles(1200)
+
+    assert candles.shape == (1200, 6)
+    assert (np.diff(candles[:, 0]) == 60_000).all()
+    assert (candles[:, 3] >= np.maximum(candles[:, 1], candles[:, 2])).all()
+    assert (candles[:, 4] <= np.minimum(candles[:, 1], candles[:, 2])).all()
+    # reproducible
+    assert (benchmark_candles(1200) == candles).all()
+
+
+def test_indicator_benchmark_run_and_compare(tmp_path):
+    from jesse.benchmarks.indicators import run, compare, save_report, load_report
+
+    report = run(sizes=[240, 500], names=['sma', 'supertrend'], min_seconds=0.001)
+
+    assert set(report['results']) == {'sma', 'supertrend'}
+    assert set(report['results']['sma']) == {'240/single', '500/single', '240/sequential', '500/sequential'}
+    assert all(seconds > 0 for seconds in report['results']['sma'].values())
+
+    path = str(tmp_path / 'baseline.json')
+    save_report(report, path)
+    baseline = load_report(path)
+    assert baseline['results'] == report['results']
+    assert compare(report, baseline) == []
+
+    baseline['results']['sma']['500/sequential'] = report['results']['sma']['500/sequential'] / 2
+    slowdowns = compare(report, baseline, threshold=0.5)
+    assert [(s['indicator'], s['case']) for s in slowdowns] == [('sma', '500/sequential')]
+    assert round(slowdowns[0]['ratio'], 6) == 2
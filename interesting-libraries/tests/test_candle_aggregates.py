@@ -0,0 +1,82 @@
+import numpy as np
+import peewee
+import pytest
+
+from jesse.factories import range_candles
+from jesse.models.Candle import Candle, store_candle_into_db, store_candle_updates_into_db
+from jesse.models.CandleAggregate import CandleAggregate, fetch_candle_aggregates_from_db, get_candle_aggregates
+from jesse.services.candle import generate_candle_from_one_minutes
+
+# the start of an hour
+HOUR = 1_552_309_200_000
+
+
+@pytest.fixture(autouse=True)
+def db():
+    sqlite = peewee.SqliteDatabase(':memory:')
+    with sqlite.bind_ctx([Candle, CandleAggregate]):
+        sqlite.create_tables([Candle, CandleAggregate])
+        yield sqlite
+    sqlite.close()
+
+
+def _candles(count: int) -> np.ndarray:
+    candles = range_candles(count)
+    candles[:, 0] = HOUR + np.arange(count) * 60_000
+    return candles
+
+
+def _stored_hourly() -> np.ndarray:
+    return fetch_candle_aggregates_from_db('Sandbox', 'BTC-USDT', '1h', HOUR, HOUR)
+
+
+def test_the_candle_updates_refresh_the_aggregates():
+    candles = _candles(60)
+    # the last 1m candle is still forming
+    forming = candles[-1].copy()
+    forming[2] = forming[1]
+    store_candle_updates_into_db(
+        [('Sandbox', 'BTC-USDT', '1m', c) for c in candles[:-1]] + [('Sandbox', 'BTC-USDT', '1m', forming)]
+    )
+    np.testing.assert_array_equal(
+        _stored_hourly(), [generate_candle_from_one_minutes('1h', np.vstack((candles[:-1], forming)), True)]
+    )
+
+    # its final update
+    store_candle_updates_into_db([('Sandbox', 'BTC-USDT', '1m', candles[-1]), ('Sandbox', 'BTC-USDT', '5m', candles[-1])])
+    np.testing.assert_array_equal(_stored_hourly(), [generate_candle_from_one_minutes('1h', candles, True)])
+
+
+def test_storing_a_candle_refreshes_the_aggregates():
+    candles = _candles(60)
+    for c in candles[:-1]:
+        store_candle_into_db('Sandbox', 'BTC-USDT', '1m', c)
+    assert len(_stored_hourly()) == 0
+
+    store_candle_into_db('Sandbox', 'BTC-USDT', '1m', candles[-1])
+    np.testing.assert_array_equal(_stored_hourly(), [generate_candle_from_one_minutes('1h', candles, True)])
+
+    candles[-1][2] += 1
+    store_candle_into_db('Sandbox', 'BTC-USDT', '1m', candles[-1], on_conflict='replace')
+    np.testing.assert_array_equal(_stored_hourly(), [generate_candle_from_one_minutes('1h', candles, True)])
+
+
+def test_the_generated_aggregates_are_stored_once_the_next_candle_is_stored():
+    candles = _candles(61)
+    # bypass the refresh of the aggregates
+    Candle.insert_many([{
+        'id': str(i), 'exchange': 'Sandbox', 'symbol': 'BTC-USDT', 'timeframe': '1m', 'timestamp': c[0],
+        'open': c[1], 'close': c[2], 'high': c[3], 'low': c[4], 'volume': c[5]
+    } for i, c in enumerate(candles[:60].tolist())]).execute()
+
+    hourly = [generate_candle_from_one_minutes('1h', candles[:60], True)]
+    # the final update of the last 1m candle might not have been written yet
+    np.testing.assert_array_equal(get_candle_aggregates('Sandbox', 'BTC-USDT', '1h', HOUR, HOUR + 3_600_000), hourly)
+    assert len(_stored_hourly()) == 0
+
+    Candle.insert(
+        id='60', exchange='Sandbox', symbol='BTC-USDT', timeframe='1m', timestamp=candles[60][0],
+        open=candles[60][1], close=candles[60][2], high=candles[60][3], low=candles[60][4], volume=candles[60][5]
+    ).execute()
+    np.testing.assert_array_equal(get_candle_aggregates('Sandbox', 'BTC-USDT', '1h', HOUR, HOUR + 3_600_000), hourly)
+    np.testing.assert_array_equal(_stored_hourly(), hourly)
@@ -1,6 +1,7 @@
-from jesse.factories import range_candles
+from jesse.factories import range_candles, candles_from_close_prices
 from jesse.services.candle import *
 import numpy as np
+import pytest
 
 
 def test_candle_includes_price():
@@ -175,3 +176,78 @@ def test_candle_dict_to_np_array():
         np.array([1660369080000, 2, 3, 4, 1, 10])
     )
 
+
+
+def test_aggregate_one_minute_candles():
+    from jesse.models.CandleAggregate import aggregate_one_minute_candles
+
+    candles = range_candles(60 * 5)
+    # start in the middle of an hour
+    candles[:, 0] = np.arange(len(candles)) * 60_000 + 1_552_309_186_171 - 1_552_309_186_171 % 3_600_000 + 30 * 60_000
+
+    hourly = aggregate_one_minute_candles(candles, '1h')
+
+    # the first and the last hours are not complete
+    assert len(hourly) == 4
+    assert hourly[0][0] % 3_600_000 == 0
+    np.testing.assert_array_equal(
+        hourly, np.array([generate_candle_from_one_minutes('1h', candles[i:i + 60], True) for i in range(30, 270, 60)])
+    )
+
+    assert len(aggregate_one_minute_candles(candles, '1D')) == 0
+    assert len(aggregate_one_minute_candles(candles[:0], '1h')) == 0
+
+
+def test_resample():
+    candles = range_candles(100)
+
+    resampled = resample(candles, '15m')
+    assert len(resampled) == 6
+    np.testing.assert_array_equal(
+        resampled, np.array([generate_candle_from_one_minutes('15m', candles[i:i + 15]) for i in range(0, 90, 15)])
+    )
+
+    # the trailing partial candle
+    with_partial = resample(candles, '15m', keep_partial=True)
+    assert len(with_partial) == 7
+    np.testing.assert_array_equal(with_partial[-1], generate_candle_from_one_minutes('15m', candles[90:], True))
+
+    assert resample(candles[:10], '15m').shape == (0, 6)
+    np.testing.assert_array_equal(resample(candles, '1m'), candles)
+
+
+def test_resample_anchored_to_timestamps():
+    candles = range_candles(60)
+    candles[:, 0] = np.arange(60) * 60_000 + 1_552_309_200_000
+    # remove 5 minutes from the second 15m candle
+    gapped = np.delete(candles, range(20, 25), axis=0)
+
+    resampled = resample(gapped, '15m', anchored=True)
+
+    assert len(resampled) == 4
+    np.testing.assert_array_equal(resampled[:, 0], candles[::15, 0])
+    np.testing.assert_array_equal(resampled[1], generate_candle_from_one_minutes('15m', gapped[15:25], True))
+    np.testing.assert_array_equal(resampled[2], generate_candle_from_one_minutes('15m', candles[30:45]))
+
+    # a trailing partial candle is left out unless it's asked for
+    assert len(resample(candles[:50], '15m', anchored=True)) == 3
+    assert len(resample(candles[:50], '15m', anchored=True, keep_partial=True)) == 4
+
+
+def test_stack_candles():
+    from jesse.services.candle import stack_candles
+
+    btc = candles_from_close_prices(range(100, 110))
+    eth = candles_from_close_prices(range(10, 20))[4:]
+
+    stack = stack_candles([btc, eth])
+    assert stack.shape == (2, 10, 6)
+    np.testing.assert_equal(stack[0], btc)
+    assert np.isnan(stack[1, :4]).all()
+    np.testing.assert_equal(stack[1, 4:], eth)
+
+    # the latest candles only
+    np.testing.assert_equal(stack_candles([btc, eth], length=3)[1], eth[-3:])
+
+    with pytest.raises(ValueError):
+        stack_candles([btc, eth[:-1]])
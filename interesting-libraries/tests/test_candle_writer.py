@@ -0,0 +1,111 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from jesse.services.candle_writer import CandleWriteBuffer
+
+
+def test_coalesces_the_updates_of_the_same_candle():
+    batches = []
+    buffer = CandleWriteBuffer(batches.append, interval=60)
+
+    forming = np.array([1_552_309_200_000, 10, 11, 11, 10, 1])
+    buffer.add('Sandbox', 'BTC-USDT', '1m', forming)
+    buffer.add('Sandbox', 'ETH-USDT', '1m', np.array([1_552_309_200_000, 5, 5, 5, 5, 1]))
+    # the store keeps updating its arrays, so the buffered candle must be a copy
+    forming[2] = 12
+    buffer.add('Sandbox', 'BTC-USDT', '1m', forming)
+    buffer.add('Sandbox', 'BTC-USDT', '5m', forming)
+    assert batches == []
+
+    buffer.flush()
+    assert len(batches) == 1
+    assert [c[:3] for c in batches[0]] == [
+        ('Sandbox', 'BTC-USDT', '1m'), ('Sandbox', 'ETH-USDT', '1m'), ('Sandbox', 'BTC-USDT', '5m')
+    ]
+    np.testing.assert_equal(batches[0][0][3], [1_552_309_200_000, 10, 12, 11, 10, 1])
+    assert buffer.has_pending is False
+
+    buffer.flush()
+    assert len(batches) == 1
+
+
+def test_keeps_the_candles_when_writing_fails():
+    written = []
+
+    def write(candles):
+        if not written:
+            written.append(None)
+            raise ConnectionError('database is down')
+        written.append(candles)
+
+    buffer = CandleWriteBuffer(write, interval=60)
+    buffer.add('Sandbox', 'BTC-USDT', '1m', np.array([1_552_309_200_000, 10, 11, 11, 10, 1]))
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    assert buffer.has_pending
+
+    # a newer update of the same candle wins over the one that failed to be written
+    buffer.add('Sandbox', 'BTC-USDT', '1m', np.array([1_552_309_200_000, 10, 12, 12, 10, 2]))
+    buffer.flush()
+    assert len(written[1]) == 1
+    np.testing.assert_equal(written[1][0][3], [1_552_309_200_000, 10, 12, 12, 10, 2])
+
+
+def test_flushes_in_the_background():
+    batches = []
+    buffer = CandleWriteBuffer(batches.append, interval=0.01)
+
+    buffer.add('Sandbox', 'BTC-USDT', '1m', np.array([1_552_309_200_000, 10, 11, 11, 10, 1]))
+    deadline = time.time() + 5
+    while not batches and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(batches) == 1 and batches[0][0][:3] == ('Sandbox', 'BTC-USDT', '1m')
+
+
+
+def test_a_flush_during_a_slow_write_keeps_the_newer_candle():
+    written = []
+    writing = []
+    is_writing = threading.Event()
+
+    def write(candles):
+        # no other batch may be written at the same time
+        assert writing == []
+        writing.append(candles)
+        is_writing.set()
+        time.sleep(0.2)
+        written.append(candles[0][3][2])
+        writing.clear()
+
+    buffer = CandleWriteBuffer(write, interval=60)
+    buffer.add('Sandbox', 'BTC-USDT', '1m', np.array([1_552_309_200_000, 10, 11, 11, 10, 1]))
+    background = threading.Thread(target=buffer.flush)
+    background.start()
+    is_writing.wait(5)
+
+    # the newer snapshot is written only after the older one
+    buffer.add('Sandbox', 'BTC-USDT', '1m', np.array([1_552_309_200_000, 10, 12, 12, 10, 2]))
+    buffer.flush()
+    background.join()
+    assert written == [11, 12]
+
+
+def test_close_waits_for_the_batch_being_written():
+    written = []
+    is_writing = threading.Event()
+
+    def write(candles):
+        is_writing.set()
+        time.sleep(0.2)
+        written.append(candles)
+
+    buffer = CandleWriteBuffer(write, interval=0.01)
+    buffer.add('Sandbox', 'BTC-USDT', '1m', np.array([1_552_309_200_000, 10, 11, 11, 10, 1]))
+    is_writing.wait(5)
+
+    buffer.close()
+    assert len(written) == 1
+    assert not buffer._thread.is_alive()
@@ -0,0 +1,108 @@
+import numpy as np
+
+from jesse.libs import columnar
+from jesse.services import message_encoding
+from jesse.modes import backtest_mode
+from jesse.routes import router
+from jesse.store import store
+from jesse.testing_utils import single_route_backtest
+
+
+def test_encode_and_decode():
+    obj = {
+        'event': 'backtest.candles_chart',
+        'data': [{
+            'symbol': 'BTC-USDT',
+            'candles': {
+                'time': np.array([1, 2, 3], dtype=np.uint32),
+                'close': np.array([1.5, np.nan, 3.25]),
+            },
+            'text': ['a', 'b'],
+        }],
+    }
+    message = columnar.encode(obj)
+
+    assert columnar.is_encoded(message)
+    assert not columnar.is_encoded('{"event": "x"}')
+
+    decoded = columnar.decode(message)
+    assert decoded['event'] == 'backtest.candles_chart'
+    assert decoded['data'][0]['text'] == ['a', 'b']
+    np.testing.assert_equal(decoded['data'][0]['candles']['time'], [1, 2, 3])
+    np.testing.assert_equal(decoded['data'][0]['candles']['close'], [1.5, np.nan, 3.25])
+
+    # every array starts at an 8 bytes aligned position of the message
+    header, buffers = columnar.decode_header(message)
+    assert (len(message) - len(buffers)) % 8 == 0
+    assert header['data'][0]['candles']['close'] == {'__array__': 16, 'dtype': '<f8', 'shape': [3]}
+
+
+def test_encode_with_header_keeps_the_arrays():
+    message = columnar.encode({'id': 1, 'data': np.arange(5, dtype=np.float64)})
+    header, buffers = columnar.decode_header(message)
+    header['id'] = 'a-much-longer-client-id'
+
+    decoded = columnar.decode(columnar.encode_with_header(header, buffers))
+    assert decoded['id'] == 'a-much-longer-client-id'
+    np.testing.assert_equal(decoded['data'], np.arange(5))
+
+
+def test_formatted_candles_for_frontend():
+    single_route_backtest('Test19')
+
+    r = router.routes[0]
+    candles = store.candles.get_candles(r.exchange, r.symbol, r.timeframe)
+    starting_index = next(i for i, c in enumerate(candles) if c[0] >= store.app.starting_time)
+
+    chart = backtest_mode._get_formatted_candles_for_frontend()[0]
+    decoded = columnar.decode(columnar.encode(chart))
+
+    assert decoded['symbol'] == r.symbol
+    np.testing.assert_equal(decoded['candles']['time'], candles[starting_index:, 0] // 1000)
+    for i, key in enumerate(['open', 'close', 'high', 'low', 'volume'], start=1):
+        np.testing.assert_equal(decoded['candles'][key], candles[starting_index:, i])
+
+
+def test_line_charts_for_frontend():
+    single_route_backtest('Test19')
+
+    strategy = router.routes[0].strategy
+    strategy._add_line_to_candle_chart_values = {
+        'sma': {'color': 'red', 'data': [{'time': 60, 'value': 1.5, 'color': 'red'}, {'time': 120, 'value': 2, 'color': 'red'}]},
+    }
+    strategy._add_extra_line_chart_values = {
+        'rsi': {'value': {'color': 'blue', 'data': [{'time': 60, 'value': 30, 'color': 'green'}]}},
+    }
+
+    line = backtest_mode._get_add_line_to_candle_chart()[0]['lines']['sma']
+    assert line['color'] == 'red'
+    assert line['colors'] is None
+    np.testing.assert_equal(line['time'], [60, 120])
+    np.testing.assert_equal(line['value'], [1.5, 2])
+
+    extra_line = backtest_mode._get_add_extra_line_chart()[0]['charts']['rsi']['value']
+    assert extra_line['colors'] == ['green']
+    np.testing.assert_equal(extra_line['value'], [30])
+
+
+def test_legacy_charts_from_columnar_messages():
+    single_route_backtest('Test19')
+
+    strategy = router.routes[0].strategy
+    lines = {
+        'sma': {'data': [{'time': 60, 'value': 1.5, 'color': 'red'}, {'time': 120, 'value': 2, 'color': 'green'}], 'color': 'red'},
+    }
+    strategy._add_line_to_candle_chart_values = lines
+    strategy._add_extra_line_chart_values = {'rsi': lines}
+    strategy._executed_orders = [{
+        'time': 60, 'position': 'belowBar', 'color': '#2196F3', 'shape': 'arrowUp', 'text': 'BUY • LONG', 'order_id': 'a'
+    }]
+
+    def legacy(event, data):
+        return message_encoding.from_columnar(
+            columnar.encode({'id': 1, 'event': f'backtest.{event}', 'is_compressed': False, 'data': data})
+        )['data'][0]
+
+    assert legacy('orders_chart', backtest_mode._get_formatted_orders_for_frontend())['orders'] == strategy._executed_orders
+    assert legacy('add_line_to_candle_chart', backtest_mode._get_add_line_to_candle_chart())['lines'] == lines
+    assert legacy('add_extra_line_chart', backtest_mode._get_add_extra_line_chart())['charts'] == {'rsi': lines}
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+# dependencies which only some commands need, and which slow down the start of every process
+HEAVY_MODULES = ['fastapi', 'uvicorn', 'ray', 'optuna', 'statsmodels', 'pandas', 'jesse.app', 'jesse.controllers']
+
+
+def _imported_modules(statement: str) -> set:
+    code = f'import sys\n{statement}\nprint("\\n".join(sys.modules))'
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_importing_research_does_not_import_heavy_dependencies():
+    modules = _imported_modules('import jesse.research')
+
+    assert 'jesse.research' in modules
+    assert [m for m in HEAVY_MODULES if m in modules] == []
+
+
+def test_importing_jesse_does_not_import_the_dashboard_app():
+    modules = _imported_modules('import jesse')
+
+    assert [m for m in HEAVY_MODULES if m in modules] == []
+
+
+def test_fastapi_app_is_still_accessible_from_jesse():
+    modules = _imported_modules('from jesse import fastapi_app; assert fastapi_app.routes')
+
+    assert 'jesse.app' in modules
+
+
+def test_importing_the_backtest_mode_does_not_import_the_optimizer_or_redis_clients():
+    modules = _imported_modules('import jesse.modes.backtest_mode, jesse.modes.optimize_mode')
+
+    assert [m for m in ['ray', 'optuna', 'aioredis', 'redis'] if m in modules] == []
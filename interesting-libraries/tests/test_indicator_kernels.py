@@ -0,0 +1,23 @@
+from jesse.benchmarks.optimization import BenchmarkStrategy
+from jesse.services.indicator_kernels import indicator_names, used_indicators, warmup_kernels, warmup_routes_kernels
+
+
+def test_used_indicators():
+    assert used_indicators(BenchmarkStrategy) == {'sma'}
+
+
+def test_warmup_kernels():
+    # indicators with two candles parameters too
+    result = warmup_kernels(['sma', 'beta', 'hma'])
+
+    assert set(result['durations']) == {'sma', 'beta', 'hma'}
+    assert result['errors'] == {}
+    assert 'hma' in indicator_names()
+
+
+def test_warmup_routes_kernels():
+    logs = []
+    result = warmup_routes_kernels([{'strategy': BenchmarkStrategy}], logs.append)
+
+    assert set(result['durations']) == {'sma'}
+    assert len(logs) == 1
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from jesse.indicators.cci import calculate_cci_loop
+from jesse.indicators.cwma import vpwma_fast
+from jesse.indicators.hma import _wma
+from jesse.indicators.linearreg import _fast_linearreg
+from jesse.indicators.pwma import pascals_triangle, pwma_fast
+from jesse.indicators.sqwma import sqwma_fast
+from jesse.indicators.srwma import srwma_fast
+
+
+# the implementations which recompute every window from scratch
+
+
+def _reference_wma(arr, period):
+    weights = np.arange(1, period + 1)
+    wma = np.zeros_like(arr)
+    for i in range(period - 1, len(arr)):
+        wma[i] = np.sum(arr[i - period + 1:i + 1] * weights) / np.sum(weights)
+    return wma
+
+
+def _reference_linearreg(source, period):
+    windows = sliding_window_view(source, window_shape=period)
+    mean_y = np.mean(windows, axis=1)
+    x = np.arange(period)
+    mean_x = (period - 1) / 2.0
+    S_xx = np.sum((x - mean_x) ** 2)
+    S_xy = np.sum((windows - mean_y[:, None]) * (x - mean_x), axis=1)
+    result = np.full(len(source), np.nan)
+    result[period - 1:] = mean_y + ((period - 1) / 2.0) * (S_xy / S_xx)
+    return result
+
+
+def _reference_cci(tp, period):
+    result = np.full(len(tp), np.nan)
+    windows = sliding_window_view(tp, window_shape=period)
+    sma = windows.mean(axis=1)
+    md = np.abs(windows - sma[:, None]).mean(axis=1)
+    # flat windows (apart from the rounding errors of their mean) are 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[period - 1:] = np.where(md <= 1e-12 * np.abs(sma), 0, (tp[period - 1:] - sma) / (0.015 * md))
+    return result
+
+
+def _reference_power_weighted_ma(source, period, power):
+    # the window ending at j weighs source[j - i] with (period - i) ** power
+    weights = np.power(period - np.arange(period - 1), power)
+    windows = sliding_window_view(source, window_shape=period - 1)[:, ::-1]
+    newseries = np.copy(source)
+    newseries[period + 1:] = (windows @ weights / np.sum(weights))[3:]
+    return newseries
+
+
+def _prices(n):
+    return 20_000 + np.cumsum(np.random.default_rng(7).normal(0, 50, n))
+
+
+@pytest.mark.parametrize('period', [2, 5, 14, 200, 250])
+def test_wma_matches_the_windowed_implementation(period):
+    source = _prices(2000)
+    np.testing.assert_allclose(_wma(source, period), _reference_wma(source, period), rtol=1e-10)
+
+
+@pytest.mark.parametrize('period', [2, 14, 200, 250])
+def test_linearreg_matches_the_windowed_implementation(period):
+    source = _prices(2000)
+    np.testing.assert_allclose(_fast_linearreg(source, period), _reference_linearreg(source, period), rtol=1e-10)
+
+
+@pytest.mark.parametrize('period', [2, 14, 200, 250])
+def test_cci_matches_the_windowed_implementation(period):
+    tp = _prices(2000)
+    np.testing.assert_allclose(calculate_cci_loop(tp, period), _reference_cci(tp, period), rtol=1e-8)
+
+
+def test_cci_of_flat_and_nearly_flat_windows():
+    # illiquid 1m candles: prices rounded to 0.1, with runs of identical candles
+    rng = np.random.default_rng(7)
+    close = np.round(_prices(3000), 1)
+    high = close + np.round(rng.uniform(0, 3, 3000), 1)
+    low = close - np.round(rng.uniform(0, 3, 3000), 1)
+    for start in (1000, 2000):
+        for prices in (close, high, low):
+            prices[start:start + 100] = prices[start]
+    # nearly flat: one tick away from the rest of the window
+    close[2050] += 0.1
+    tp = (high + low + close) / 3
+
+    result = calculate_cci_loop(tp, 20)
+    assert (result[1019:1100] == 0).all()
+    assert (result[2019:2050] == 0).all()
+    np.testing.assert_allclose(result, _reference_cci(tp, 20), rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize('period', [3, 14, 200, 250])
+def test_power_weighted_mas_match_the_windowed_implementation(period):
+    source = _prices(2000)
+    np.testing.assert_allclose(vpwma_fast(source, period), _reference_power_weighted_ma(source, period, 3), rtol=1e-10)
+    np.testing.assert_allclose(sqwma_fast(source, period), _reference_power_weighted_ma(source, period, 2), rtol=1e-10)
+    np.testing.assert_allclose(srwma_fast(source, period), _reference_power_weighted_ma(source, period, 0.5), rtol=1e-10)
+
+
+@pytest.mark.parametrize('period', [2, 5, 200])
+def test_pwma_matches_the_windowed_implementation(period):
+    source = _prices(2000)
+    triangle = pascals_triangle(n=period - 1)
+    expected = np.average(sliding_window_view(source, window_shape=period), weights=triangle, axis=-1).astype(np.float64)
+    np.testing.assert_allclose(pwma_fast(source, triangle.astype(np.float64)), expected, rtol=1e-10)
+
+
+def test_rolling_kernels_propagate_nans_like_the_windowed_implementations():
+    source = _prices(300)
+    source[:20] = np.nan
+    source[150] = np.nan
+
+    np.testing.assert_allclose(_wma(source, 14), _reference_wma(source, 14), rtol=1e-10)
+    np.testing.assert_allclose(_fast_linearreg(source, 14), _reference_linearreg(source, 14), rtol=1e-10)
+    np.testing.assert_allclose(calculate_cci_loop(source, 14), _reference_cci(source, 14), rtol=1e-8)
+    np.testing.assert_allclose(vpwma_fast(source, 14), _reference_power_weighted_ma(source, 14, 3), rtol=1e-10)
+    np.testing.assert_allclose(sqwma_fast(source, 14), _reference_power_weighted_ma(source, 14, 2), rtol=1e-10)
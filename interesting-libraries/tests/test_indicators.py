@@ -179,6 +179,47 @@ def test_bandpass():
     assert len(seq_bp.trigger) == len(candles)
 
 
+def test_batch():
+    candles = np.array(test_candles_19)
+    specs = [
+        ('ema', {'period': 9}),
+        ('ema', {'period': 21}),
+        'sma',
+        {'name': 'bollinger_bands', 'period': 20},
+        {'name': 'bollinger_bands', 'period': 20, 'devtype': 1},
+        'atr',
+        {'name': 'supertrend', 'period': 14, 'factor': 3},
+        'macd',
+        ('rsi', {'period': 14}),
+    ]
+    expected = [
+        ta.ema(candles, period=9, sequential=True),
+        ta.ema(candles, period=21, sequential=True),
+        ta.sma(candles, sequential=True),
+        ta.bollinger_bands(candles, period=20, sequential=True),
+        ta.bollinger_bands(candles, period=20, devtype=1, sequential=True),
+        ta.atr(candles, sequential=True),
+        ta.supertrend(candles, period=14, factor=3, sequential=True),
+        ta.macd(candles, sequential=True),
+        ta.rsi(candles, period=14, sequential=True),
+    ]
+
+    seq = ta.batch(candles, specs, sequential=True)
+    single = ta.batch(candles, specs)
+
+    assert len(seq) == len(single) == len(specs)
+    for s, r, e in zip(seq, single, expected):
+        assert type(s) == type(e)
+        np.testing.assert_allclose(np.array(s, dtype=float), np.array(e, dtype=float), rtol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(np.array(r, dtype=float), np.array(e, dtype=float)[..., -1], rtol=1e-9)
+    assert type(single[3]).__name__ == 'BollingerBands'
+
+    with pytest.raises(ValueError):
+        ta.batch(candles, ['not_an_indicator'])
+    with pytest.raises(ValueError):
+        ta.batch(candles, [('ema', {'sequential': True})])
+
+
 def test_beta():
     # use the same candles as mama_candles
     candles = np.array(test_candles_sol)
@@ -367,6 +408,49 @@ def test_correlation_cycle():
     assert len(seq.state) == len(candles)
 
 
+def test_cross_section():
+    from jesse.services.candle import stack_candles
+
+    candles = np.array(test_candles_19)
+    # a symbol with fewer candles, and one with other prices
+    symbols_candles = [candles, candles[60:], candles * [1, 2, 2, 2, 2, 1]]
+    stack = stack_candles(symbols_candles)
+    assert stack.shape == (3, len(candles), 6)
+
+    cases = [
+        ('sma', {'period': 20}),
+        ('ema', {'period': 9}),
+        ('rsi', {}),
+        ('atr', {'period': 10}),
+        ('stddev', {'period': 10, 'nbdev': 2}),
+        ('roc', {}),
+        ('bollinger_bands', {}),
+        ('macd', {}),
+        # computed for each symbol
+        ('bollinger_bands', {'devtype': 1}),
+        ('hma', {}),
+        ('supertrend', {}),
+    ]
+    for name, kwargs in cases:
+        indicator = getattr(ta, name)
+        seq = ta.cross_section(stack, name, sequential=True, **kwargs)
+        single = ta.cross_section(stack, name, **kwargs)
+        assert len(seq) == len(single) == 3
+
+        for c, s, r in zip(symbols_candles, seq, single):
+            expected = indicator(c, sequential=True, **kwargs)
+            assert type(s) == type(expected)
+            # the candles of the shorter symbol are padded with NaNs
+            s = np.array(s, dtype=float)[..., len(candles) - len(c):]
+            np.testing.assert_allclose(s, np.array(expected, dtype=float), rtol=1e-9, equal_nan=True)
+            np.testing.assert_allclose(np.array(r, dtype=float), np.array(indicator(c, **kwargs), dtype=float), rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        ta.cross_section(candles, 'sma')
+    with pytest.raises(TypeError):
+        ta.cross_section(stack, 'sma', not_a_parameter=1)
+
+
 def test_cvi():
     candles = np.array(test_candles_19)
 
@@ -0,0 +1,78 @@
+import numpy as np
+
+from jesse.factories import candles_from_close_prices
+from jesse.research import backtest
+from jesse.services.intraday_equity import lttb, max_drawdown, min_max_downsample
+
+
+def _backtest_config() -> dict:
+    return {
+        'starting_balance': 10_000,
+        'fee': 0,
+        'type': 'futures',
+        'futures_leverage': 1,
+        'futures_leverage_mode': 'cross',
+        'exchange': 'Sandbox',
+        'warm_up_candles': 0
+    }
+
+
+def test_intraday_equity_curve_of_backtest():
+    candles = {
+        'Sandbox-BTC-USDT': {
+            'exchange': 'Sandbox',
+            'symbol': 'BTC-USDT',
+            'candles': candles_from_close_prices(range(101, 200)),
+        }
+    }
+    routes = [{'exchange': 'Sandbox', 'strategy': 'Test01', 'symbol': 'BTC-USDT', 'timeframe': '1m'}]
+
+    result = backtest(
+        _backtest_config(), routes, [], candles, intraday_equity_curve=True, generate_equity_curve=True
+    )
+    timestamps, equity = result['intraday_equity_curve']
+    closes = candles['Sandbox-BTC-USDT']['candles'][:, 2]
+
+    assert len(equity) == len(closes)
+    np.testing.assert_array_equal(timestamps, candles['Sandbox-BTC-USDT']['candles'][:, 0])
+    # 1 BTC is bought at the close of the first candle, and sold by the take-profit 10 dollars higher
+    np.testing.assert_allclose(equity[:10], 10_000 + closes[:10] - 101)
+    np.testing.assert_allclose(equity[11:], 10_010)
+    assert result['metrics']['intraday_max_drawdown'] == 0
+    assert result['equity_curve'][0]['data'][-1]['value'] == 10_010
+
+
+def test_max_drawdown():
+    assert max_drawdown(np.array([100, 120, 90, 130, 65])) == -50
+    assert max_drawdown(np.array([100, 110])) == 0
+
+
+def test_min_max_downsample_keeps_the_extremes():
+    x = np.arange(10_000)
+    y = np.sin(x / 100) * 100
+    y[5_432] = -500
+    y[7_777] = 500
+
+    dx, dy = min_max_downsample(x, y, 200)
+
+    assert len(dx) <= 200
+    assert np.all(np.diff(dx) > 0)
+    assert dy.min() == -500
+    assert dy.max() == 500
+    assert 5_432 in dx and 7_777 in dx
+    # short series are returned untouched
+    assert len(min_max_downsample(x[:50], y[:50], 200)[0]) == 50
+
+
+def test_lttb():
+    x = np.arange(10_000)
+    y = np.sin(x / 100) * 100
+    y[5_432] = -500
+
+    dx, dy = lttb(x, y, 300)
+
+    assert len(dx) == 300
+    assert dx[0] == 0 and dx[-1] == 9_999
+    assert np.all(np.diff(dx) > 0)
+    # a single spike forms the largest triangle in its bucket
+    assert -500 in dy
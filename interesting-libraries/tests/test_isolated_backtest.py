@@ -345,3 +345,183 @@ def test_passed_candles_are_not_affected_by_running_isolated_backtests():
     research.backtest(config, routes, data_routes, candles)
 
     assert len(candles['Fake Exchange-FAKE-USDT']['candles']) == 10
+
+
+def test_warm_backtest_matches_isolated_backtest():
+    import numpy as np
+    import jesse.indicators as ta
+    from jesse.research.backtest import WarmBacktest
+
+    class TestWarmStrategy(Strategy):
+        def should_long(self) -> bool:
+            return self.close > ta.sma(self.candles, self.hp['period'])
+
+        def go_long(self):
+            self.buy = 1, self.price
+            self.stop_loss = 1, self.price - self.hp['stop']
+            self.take_profit = 1, self.price + self.hp['stop'] * 2
+
+        def should_cancel_entry(self) -> bool:
+            return True
+
+        def hyperparameters(self):
+            return [
+                {'name': 'period', 'type': int, 'min': 2, 'max': 30, 'default': 10},
+                {'name': 'stop', 'type': int, 'min': 1, 'max': 10, 'default': 3},
+            ]
+
+    prices = 100 + 20 * np.sin(np.arange(1200) / 25)
+    all_candles = candles_from_close_prices(prices)
+    exchange_name = 'Sandbox'
+    symbol = 'FAKE-USDT'
+    config = {
+        'starting_balance': 10_000,
+        'fee': 0.001,
+        'type': 'futures',
+        'futures_leverage': 2,
+        'futures_leverage_mode': 'cross',
+        'exchange': exchange_name,
+        'warm_up_candles': 10
+    }
+    routes = [
+        {'exchange': exchange_name, 'strategy': TestWarmStrategy, 'symbol': symbol, 'timeframe': '5m'},
+    ]
+    data_routes = [{'exchange': exchange_name, 'symbol': symbol, 'timeframe': '15m'}]
+    key = jh.key(exchange_name, symbol)
+    warmup_candles = {key: {'exchange': exchange_name, 'symbol': symbol, 'candles': all_candles[:150]}}
+    candles = {key: {'exchange': exchange_name, 'symbol': symbol, 'candles': all_candles[150:]}}
+
+    hps = [{'period': 3, 'stop': 1}, {'period': 8, 'stop': 2}, {'period': 3, 'stop': 1}]
+    expected = [
+        research.backtest(config, routes, data_routes, candles, warmup_candles, hyperparameters=hp)['metrics']
+        for hp in hps
+    ]
+
+    warm_backtest = WarmBacktest(config, routes, data_routes, candles, warmup_candles)
+    for hp, metrics in zip(hps, expected):
+        assert metrics['total'] > 0
+        # assert_equal treats NaN ratios as equal
+        np.testing.assert_equal(warm_backtest.run(hp)['metrics'], metrics)
+
+    # the passed candles must not be mutated
+    assert np.array_equal(candles[key]['candles'], all_candles[150:])
+
+
+@pytest.mark.parametrize('fast_mode', [False, True])
+def test_parallel_routes_match_sequential_routes(fast_mode):
+    import threading
+    import numpy as np
+    import jesse.indicators as ta
+    from jesse.services.cache import cached
+
+    threads = set()
+
+    class TestParallelStrategy(Strategy):
+        @property
+        @cached
+        def trend(self):
+            threads.add(threading.current_thread().name)
+            fast = ta.ema(self.candles, 8)
+            slow = ta.ema(self.get_candles(self.exchange, self.symbol, '15m'), 5)
+            return fast - slow
+
+        def should_long(self) -> bool:
+            return self.trend > 0
+
+        def should_short(self) -> bool:
+            return self.trend < -0.5
+
+        def go_long(self):
+            # the entries depend on the shared balance, so the routes' order matters
+            self.buy = round(self.balance * 0.2 / self.price, 3), self.price
+
+        def go_short(self):
+            self.sell = round(self.balance * 0.2 / self.price, 3), self.price
+
+        def update_position(self) -> None:
+            if (self.is_long and self.trend < 0) or (self.is_short and self.trend > 0):
+                self.liquidate()
+
+        def should_cancel_entry(self) -> bool:
+            return True
+
+    exchange_name = 'Sandbox'
+    config = {
+        'starting_balance': 10_000,
+        'fee': 0.001,
+        'type': 'futures',
+        'futures_leverage': 2,
+        'futures_leverage_mode': 'cross',
+        'exchange': exchange_name,
+        'warm_up_candles': 20
+    }
+    symbols = ['A-USDT', 'B-USDT', 'C-USDT', 'D-USDT']
+    routes = [
+        {'exchange': exchange_name, 'strategy': TestParallelStrategy, 'symbol': symbol, 'timeframe': timeframe}
+        for symbol, timeframe in zip(symbols, ['1m', '5m', '5m', '1m'])
+    ]
+    data_routes = [{'exchange': exchange_name, 'symbol': symbol, 'timeframe': '15m'} for symbol in symbols]
+    candles, warmup_candles = {}, {}
+    for n, symbol in enumerate(symbols):
+        prices = 100 + (n + 5) * np.sin(np.arange(2000) / (15 + 7 * n))
+        all_candles = candles_from_close_prices(prices)
+        key = jh.key(exchange_name, symbol)
+        warmup_candles[key] = {'exchange': exchange_name, 'symbol': symbol, 'candles': all_candles[:300]}
+        candles[key] = {'exchange': exchange_name, 'symbol': symbol, 'candles': all_candles[300:]}
+
+    sequential = research.backtest(config, routes, data_routes, candles, warmup_candles, fast_mode=fast_mode)
+    assert threads == {threading.current_thread().name}
+    threads.clear()
+    parallel = research.backtest(
+        config, routes, data_routes, candles, warmup_candles, fast_mode=fast_mode, parallel_routes=4
+    )
+
+    assert sequential['metrics']['total'] > 10
+    # assert_equal treats NaN ratios as equal
+    np.testing.assert_equal(parallel['metrics'], sequential['metrics'])
+    assert all(name.startswith('jesse-route') for name in threads)
+
+
+def test_the_log_file_is_written_when_the_backtest_returns(tmp_path, monkeypatch):
+    from jesse.config import config as jesse_config
+
+    class LoggingStrategy(Strategy):
+        def before(self) -> None:
+            self.log(f'candle {self.index}')
+
+        def should_long(self):
+            return False
+
+        def should_cancel_entry(self):
+            return False
+
+        def go_long(self):
+            pass
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(jesse_config['app'], 'debug_mode', True)
+    exchange_name = 'Fake Exchange'
+    symbol = 'FAKE-USDT'
+    config = {
+        'starting_balance': 10_000,
+        'fee': 0,
+        'type': 'futures',
+        'futures_leverage': 2,
+        'futures_leverage_mode': 'cross',
+        'exchange': exchange_name,
+        'warm_up_candles': 0
+    }
+    routes = [{'exchange': exchange_name, 'strategy': LoggingStrategy, 'symbol': symbol, 'timeframe': '1m'}]
+    candles = {
+        jh.key(exchange_name, symbol): {
+            'exchange': exchange_name,
+            'symbol': symbol,
+            'candles': candles_from_close_prices(list(range(101, 131))),
+        },
+    }
+
+    result = research.backtest(config, routes, [], candles, generate_logs=True)
+
+    with open(result['logs']) as f:
+        lines = f.read().splitlines()
+    assert [line for line in lines if 'candle' in line][-1] == '[INFO | 2021-01-01T00:30:00] candle 29'
@@ -0,0 +1,96 @@
+import base64
+import gzip
+import json
+import threading
+import time
+
+import numpy as np
+
+from jesse.services import message_encoding
+from jesse.services.publish_buffer import PublishBuffer
+
+
+def test_pack_and_unpack_numpy_values():
+    data = {
+        'candles': np.array([[1, 2.5], [3, np.nan]]),
+        'count': np.int64(3),
+        'price': np.float64(1.5),
+        'is_open': np.bool_(True),
+    }
+    unpacked = message_encoding.unpack(message_encoding.pack(data))
+
+    np.testing.assert_equal(unpacked['candles'], data['candles'])
+    assert unpacked['count'] == 3
+    assert unpacked['price'] == 1.5
+    assert unpacked['is_open'] is True
+
+
+def test_decode_accepts_json_and_msgpack():
+    envelope = {'id': 1, 'event': 'backtest.alert', 'is_compressed': False, 'data': {'message': 'hi'}}
+
+    assert message_encoding.decode(json.dumps(envelope).encode()) == envelope
+    assert message_encoding.decode(message_encoding.pack(envelope)) == envelope
+
+
+def test_render_compressed_messages():
+    envelope = {'id': 1, 'event': 'backtest.trades', 'is_compressed': True, 'data': [{'pnl': np.float64(1.5)}]}
+
+    # the same format as before for JSON clients: gzipped and base64'd JSON
+    rendered = json.loads(message_encoding.render(envelope, message_encoding.JSON))
+    assert rendered['is_compressed'] is True
+    assert json.loads(gzip.decompress(base64.b64decode(rendered['data']))) == [{'pnl': 1.5}]
+
+    # no base64 for msgpack clients
+    rendered = message_encoding.unpack(message_encoding.render(envelope, message_encoding.MSGPACK))
+    assert message_encoding.unpack(gzip.decompress(rendered['data'])) == [{'pnl': 1.5}]
+
+
+def test_publish_buffer_coalesces_state_events_and_keeps_streams():
+    batches = []
+    buffer = PublishBuffer(batches.append, interval=60)
+
+    buffer.add('progressbar', 1, coalesce=True)
+    buffer.add('info_log', 'a')
+    buffer.add('progressbar', 2, coalesce=True)
+    buffer.add('info_log', 'b')
+    assert batches == []
+
+    buffer.flush()
+    assert batches == [[2, 'a', 'b']]
+    assert buffer.has_pending is False
+
+    buffer.flush()
+    assert len(batches) == 1
+
+
+def test_publish_buffer_flushes_in_the_background():
+    batches = []
+    buffer = PublishBuffer(batches.append, interval=0.01)
+
+    buffer.add('info_log', 'a')
+    deadline = time.time() + 5
+    while not batches and time.time() < deadline:
+        time.sleep(0.01)
+    assert batches == [['a']]
+
+
+def test_publish_buffer_flush_waits_for_the_batch_being_published():
+    published = []
+    is_publishing = threading.Event()
+
+    def publish(messages):
+        is_publishing.set()
+        time.sleep(0.2)
+        published.append(messages)
+
+    buffer = PublishBuffer(publish, interval=60)
+    buffer.add('info_log', 'a')
+    background = threading.Thread(target=buffer.flush)
+    background.start()
+    is_publishing.wait(5)
+
+    # returns only after the older batch is published, so a message sent after it stays in order
+    buffer.flush()
+    published.append('unbuffered')
+    background.join()
+    assert published == [['a'], 'unbuffered']
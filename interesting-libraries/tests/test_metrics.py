@@ -2,6 +2,7 @@ from jesse.store import store
 from jesse.testing_utils import single_route_backtest
 from jesse.services import metrics
 import numpy as np
+import pytest
 
 
 def test_open_pl_and_total_open_trades():
@@ -105,3 +106,139 @@ def test_daily_balance_stores_portfolio_value():
         is_futures_trading=False,
         candles_count=10 * 1024
     )
+
+
+def _closed_trade(trade_type: str, qty: float, entry_price: float, exit_price: float, opened_at: int, closed_at: int):
+    import jesse.helpers as jh
+    from jesse.models import ClosedTrade
+
+    t = ClosedTrade({
+        'id': jh.generate_unique_id(),
+        'strategy_name': 'TestMetrics1',
+        'symbol': 'BTC-USDT',
+        'exchange': 'Sandbox',
+        'type': trade_type,
+        'timeframe': '1m',
+        'opened_at': opened_at,
+        'closed_at': closed_at,
+        'leverage': 1,
+    })
+    buy_price, sell_price = (entry_price, exit_price) if trade_type == 'long' else (exit_price, entry_price)
+    t.buy_orders.append(np.array([qty, buy_price]))
+    t.sell_orders.append(np.array([qty, sell_price]))
+    return t
+
+
+def _metrics_scenario(days: int) -> tuple:
+    # to have the exchange balances in the store
+    single_route_backtest('TestVanillaStrategy', fee=0.001)
+    store.app.starting_time = 1609459200000
+
+    rng = np.random.RandomState(7)
+    trades = []
+    for i in range(25):
+        entry = 100 + rng.rand() * 10
+        exit_price = entry * (1 + rng.randn() * 0.03)
+        opened_at = 1609459200000 + i * 3_600_000
+        trades.append(_closed_trade(
+            'long' if i % 3 else 'short', round(rng.rand() * 2 + 0.1, 3), entry, exit_price,
+            opened_at, opened_at + int(rng.randint(1, 600)) * 60_000
+        ))
+    daily_balance = list(10_000 * np.cumprod(1 + rng.randn(days) * 0.01))
+    return trades, daily_balance
+
+
+def test_trades_metrics_match_the_pandas_implementation():
+
+    # values which the pandas based implementation of metrics.trades() returned for the same scenarios
+    expected_ratios = {
+        1: (np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan),
+        2: (0.0, -93.30832513171976, np.nan, 0.0, -27.018512172212592, 0.0, np.nan),
+        5: (-0.5484288533534443, -44.003601223541914, -5.2279985695563775, -80.23575155551315,
+            -7.3167372990530355, 0.5103305453455755, np.nan),
+        19: (-4.100831039657793, -23.06752852095584, -1.1730317745352619, -5.6250863051604245,
+             -1.6056615961952045, 0.8601307676346824, np.nan),
+        40: (-7.21925836717271, -28.969263548453384, -1.9213130991154297, -4.012775561570415,
+             -2.529546643329763, 0.7835838902681904, -np.inf),
+    }
+    ratio_keys = [
+        'max_drawdown', 'annual_return', 'sharpe_ratio', 'calmar_ratio', 'sortino_ratio', 'omega_ratio', 'serenity_index'
+    ]
+
+    for days, ratios in expected_ratios.items():
+        trades, daily_balance = _metrics_scenario(days)
+        stats = metrics.trades(trades, daily_balance)
+
+        assert stats['total'] == 25
+        assert stats['total_winning_trades'] == 12
+        assert stats['total_losing_trades'] == 13
+        assert stats['win_rate'] == 0.48
+        assert stats['ratio_avg_win_loss'] == 0.6921491468969998
+        assert stats['longs_count'] == 16
+        assert stats['shorts_count'] == 9
+        assert stats['longs_percentage'] == 64
+        assert stats['fee'] == 5.733334851243099
+        assert stats['net_profit'] == -21.24413038692369
+        assert stats['average_win'] == 3.1323920277877844
+        np.testing.assert_equal([stats[k] for k in ratio_keys], ratios)
+
+        # a structured array of the trades gives the same result
+        np.testing.assert_equal(metrics.trades(metrics.trades_to_array(trades), daily_balance), stats)
+
+
+def test_trades_metrics_of_no_winning_trades():
+
+    trades, daily_balance = _metrics_scenario(5)
+    losing_trades = [t for t in trades if t.pnl < 0]
+    stats = metrics.trades(losing_trades, daily_balance)
+
+    assert stats['total_winning_trades'] == 0
+    assert stats['win_rate'] == 0
+    assert stats['largest_winning_trade'] == 0
+    assert stats['average_win'] is np.nan
+    assert stats['ratio_avg_win_loss'] is np.nan
+    assert stats['winning_streak'] == 0
+    assert stats['losing_streak'] == 13
+
+
+def test_running_metrics_match_the_metrics_of_all_trades():
+    from jesse.store.state_completed_trades import RunningTradesMetrics
+
+    trades, daily_balance = _metrics_scenario(40)
+    running = RunningTradesMetrics()
+    for t in trades:
+        running.add(t)
+
+    expected = metrics.trades(trades, daily_balance)
+    stats = metrics.running_trades(running, daily_balance)
+
+    assert stats.keys() == expected.keys()
+    for key, value in expected.items():
+        assert stats[key] == pytest.approx(value, rel=1e-12, nan_ok=True), key
+
+    pnl_percentages = np.array([t.pnl_percentage for t in trades])
+    assert running.pnl_percentage_mean == pytest.approx(pnl_percentages.mean())
+    assert stats['pnl_percentage_std'] == pytest.approx(pnl_percentages.std(ddof=1))
+    cumulative_pnl = np.cumsum([t.pnl for t in trades])
+    assert stats['pnl_max_drawdown'] == pytest.approx(
+        (np.maximum.accumulate(np.maximum(cumulative_pnl, 0)) - cumulative_pnl).max()
+    )
+    assert stats['pnl_max_drawdown'] > 0
+
+
+def test_running_metrics_of_no_trades():
+    from jesse.store.state_completed_trades import RunningTradesMetrics
+
+    running = RunningTradesMetrics()
+    assert metrics.running_trades(running, []) == {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}
+    assert running.win_rate == 0
+    assert np.isnan(running.pnl_percentage_variance)
+
+
+def test_running_metrics_of_a_trade_without_a_cost():
+    from jesse.store.state_completed_trades import RunningTradesMetrics
+
+    running = RunningTradesMetrics()
+    running.add(_closed_trade('long', 1, 0, 0, 1609459200000, 1609459260000))
+    assert running.count == 1
+    assert running.pnl_percentage_mean == 0
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+import jesse.helpers as jh
+from jesse import research
+from jesse.factories import candles_from_close_prices
+from jesse.research.portfolio import split_routes
+from jesse.strategies import Strategy
+
+
+class FixedQtyStrategy(Strategy):
+    # its trades don't depend on the balance, so sharding doesn't change them
+    def should_long(self) -> bool:
+        return self.close > self.candles[-5:, 2].mean()
+
+    def go_long(self):
+        self.buy = 2, self.price
+        self.stop_loss = 2, self.price * 0.98
+        self.take_profit = 2, self.price * 1.01
+
+    def should_cancel_entry(self) -> bool:
+        return True
+
+
+def _candles(exchange: str, symbols: list) -> tuple:
+    candles, warmup_candles = {}, {}
+    for n, symbol in enumerate(symbols):
+        prices = 100 + (4 + n) * np.sin(np.arange(4 * 1440) / (30 + 11 * n))
+        all_candles = candles_from_close_prices(prices)
+        key = jh.key(exchange, symbol)
+        warmup_candles[key] = {'exchange': exchange, 'symbol': symbol, 'candles': all_candles[:60]}
+        candles[key] = {'exchange': exchange, 'symbol': symbol, 'candles': all_candles[60:]}
+    return candles, warmup_candles
+
+
+def _config(starting_balance: float) -> dict:
+    return {
+        'starting_balance': starting_balance,
+        'fee': 0.001,
+        'type': 'futures',
+        'futures_leverage': 2,
+        'futures_leverage_mode': 'cross',
+        'warm_up_candles': 20
+    }
+
+
+def test_split_routes():
+    candles, warmup_candles = _candles('Sandbox', ['A-USDT', 'B-USDT', 'C-USDT'])
+    routes = [
+        {'exchange': 'Sandbox', 'strategy': FixedQtyStrategy, 'symbol': 'A-USDT', 'timeframe': '5m'},
+        {'exchange': 'Sandbox', 'strategy': FixedQtyStrategy, 'symbol': 'B-USDT', 'timeframe': '5m'},
+    ]
+    data_routes = [
+        {'exchange': 'Sandbox', 'symbol': 'A-USDT', 'timeframe': '1h'},
+        {'exchange': 'Sandbox', 'symbol': 'C-USDT', 'timeframe': '5m'},
+    ]
+
+    shards = split_routes({'Sandbox': _config(10_000)}, routes, data_routes, candles, warmup_candles)
+    assert [s['name'] for s in shards] == ['Sandbox A-USDT', 'Sandbox B-USDT']
+    assert [s['config']['starting_balance'] for s in shards] == [5_000, 5_000]
+    assert shards[0]['data_routes'] == data_routes
+    assert shards[1]['data_routes'] == data_routes[1:]
+    assert set(shards[1]['candles']) == {'Sandbox-B-USDT', 'Sandbox-C-USDT'}
+
+    shards = split_routes({'Sandbox': _config(10_000)}, routes, data_routes, candles, warmup_candles, 'exchange')
+    assert len(shards) == 1 and shards[0]['routes'] == routes
+
+    with pytest.raises(ValueError):
+        split_routes({}, routes, data_routes, candles, warmup_candles)
+    with pytest.raises(ValueError):
+        research.portfolio_backtest({'Sandbox': _config(10_000)}, routes, [], candles, group_by='route')
+
+
+def test_portfolio_backtest_matches_serial_backtest():
+    symbols = ['A-USDT', 'B-USDT', 'C-USDT']
+    candles, warmup_candles = _candles('Sandbox', symbols)
+    routes = [
+        {'exchange': 'Sandbox', 'strategy': FixedQtyStrategy, 'symbol': symbol, 'timeframe': '5m'}
+        for symbol in symbols
+    ]
+    serial = research.backtest({**_config(9_000), 'exchange': 'Sandbox'}, routes, [], candles, warmup_candles)
+
+    # a single shard is the same backtest
+    result = research.portfolio_backtest(
+        {'Sandbox': _config(9_000)}, routes, [], candles, warmup_candles, group_by='exchange', cores=1
+    )
+    np.testing.assert_equal(result['metrics'], serial['metrics'])
+
+    # with a shard for each symbol, only the ratios of the daily balances can differ a little,
+    # because the margin isn't shared anymore
+    result = research.portfolio_backtest(
+        {'Sandbox': _config(9_000)}, routes, [], candles, warmup_candles, cores=1, generate_equity_curve=True
+    )
+    assert serial['metrics']['total'] > 10
+    assert [s['name'] for s in result['shards']] == ['Sandbox A-USDT', 'Sandbox B-USDT', 'Sandbox C-USDT']
+    assert sum(s['metrics']['total'] for s in result['shards']) == result['metrics']['total']
+    for key in ('total', 'win_rate', 'longs_count', 'starting_balance', 'finishing_balance', 'net_profit', 'fee'):
+        assert result['metrics'][key] == pytest.approx(serial['metrics'][key])
+    assert len(result['trades']) == result['metrics']['total']
+    assert [t['closed_at'] for t in result['trades']] == sorted(t['closed_at'] for t in result['trades'])
+    assert result['daily_balance'][0] == 9_000
+    assert [c['name'] for c in result['equity_curve']] == ['Portfolio'] + [s['name'] for s in result['shards']]
+
+
+def test_portfolio_backtest_of_several_exchanges_in_processes():
+    candles, warmup_candles = _candles('Sandbox', ['BTC-USDT'])
+    other_candles, other_warmup_candles = _candles('Fake Exchange', ['A-USDT', 'B-USDT'])
+    candles.update(other_candles)
+    warmup_candles.update(other_warmup_candles)
+    configs = {'Sandbox': _config(10_000), 'Fake Exchange': _config(4_000)}
+    # processes can't import the strategies defined in a test
+    routes = [
+        {'exchange': 'Sandbox', 'strategy': 'Test01', 'symbol': 'BTC-USDT', 'timeframe': '1m'},
+        {'exchange': 'Fake Exchange', 'strategy': 'Test01', 'symbol': 'A-USDT', 'timeframe': '1m'},
+        {'exchange': 'Fake Exchange', 'strategy': 'Test01', 'symbol': 'B-USDT', 'timeframe': '1m'},
+    ]
+
+    in_process = research.portfolio_backtest(configs, routes, [], candles, warmup_candles, cores=1)
+    in_processes = research.portfolio_backtest(configs, routes, [], candles, warmup_candles, cores=2)
+
+    assert in_process['metrics']['total'] == 3
+    assert in_process['metrics']['starting_balance'] == 14_000
+    np.testing.assert_equal(in_processes['metrics'], in_process['metrics'])
+    assert in_processes['daily_balance'] == in_process['daily_balance']
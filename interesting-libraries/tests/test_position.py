@@ -1,8 +1,25 @@
+import pytest
+
+from jesse.config import config
 from jesse.enums import exchanges
 from jesse.models import Position
+from jesse.routes import router
+from jesse.store import store
 from jesse.testing_utils import set_up, single_route_backtest
 
 
+@pytest.fixture(autouse=True)
+def sandbox_exchange():
+    # the positions need the Sandbox exchange to be in the store
+    set_up()
+    config['app']['considering_exchanges'] = [exchanges.SANDBOX]
+    config['app']['trading_exchanges'] = [exchanges.SANDBOX]
+    router.initiate([
+        {'exchange': exchanges.SANDBOX, 'symbol': 'BTC-USDT', 'timeframe': '1m', 'strategy': 'TestVanillaStrategy'}
+    ])
+    store.reset()
+
+
 def test_increase_a_long_position():
     set_up()
 
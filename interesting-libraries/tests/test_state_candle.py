@@ -1,9 +1,13 @@
+import threading
+from unittest import mock
+
 import numpy as np
 
 from jesse.config import config, reset_config
 from jesse.factories import fake_candle, range_candles
 from jesse.services.candle import generate_candle_from_one_minutes
 from jesse.store import store
+from jesse.store.state_candles import CandlesState
 import jesse.helpers as jh
 
 
@@ -34,6 +38,26 @@ def test_batch_add_candles():
     np.testing.assert_equal(store.candles.get_candles('Sandbox', 'BTC-USD', '1m'), candles_to_add)
 
 
+def test_bulk_load():
+    set_up()
+
+    # more candles than the storage's initial size
+    candles = range_candles(2503)
+    five_minutes = np.array([generate_candle_from_one_minutes('5m', candles[i:i + 5]) for i in range(0, 2500, 5)])
+
+    store.candles.bulk_load('Sandbox', 'BTC-USD', candles[:2000], {'5m': five_minutes[:400]})
+    # candles that are not newer than the stored ones update them
+    store.candles.bulk_load('Sandbox', 'BTC-USD', candles[1999:], {'5m': five_minutes[399:]})
+
+    np.testing.assert_equal(store.candles.get_candles('Sandbox', 'BTC-USD', '1m'), candles)
+    np.testing.assert_equal(store.candles.get_storage('Sandbox', 'BTC-USD', '5m')[:], five_minutes)
+    # the forming 5m candle is generated from the last 1m candles
+    np.testing.assert_equal(
+        store.candles.get_candles('Sandbox', 'BTC-USD', '5m')[-1],
+        generate_candle_from_one_minutes('5m', candles[2500:], True)
+    )
+
+
 def test_can_add_new_candle():
     set_up()
 
@@ -160,3 +184,150 @@ def test_can_update_previous_candle():
 
     # assert that the 2nd candle is updated now
     assert store.candles.get_candles('Sandbox', 'BTC-USD', '1m')[-2][2] == new_c2[2]
+
+
+def test_add_candle_from_trade():
+    set_up()
+
+    start = 1_552_309_200_000
+    store.candles.add_candle(np.array([start, 10, 10, 10, 10, 0]), 'Sandbox', 'BTC-USD', '1m')
+    store.candles.add_candle(np.array([start, 10, 10, 10, 10, 0]), 'Sandbox', 'BTC-USD', '5m')
+    store.candles.initiated_pairs['Sandbox-BTC-USD'] = True
+    now = [start]
+
+    def add_trade(timestamp, price, volume):
+        now[0] = timestamp
+        store.candles.add_candle_from_trade({'price': price, 'volume': volume}, 'Sandbox', 'BTC-USD')
+
+    with mock.patch.object(jh, 'is_live', return_value=True), \
+            mock.patch.object(jh, 'now', lambda force_fresh=False: now[0]), \
+            mock.patch.object(jh, 'get_config', return_value=True), \
+            mock.patch.object(CandlesState, 'update_position'), \
+            mock.patch('jesse.store.state_candles.candle_writer'):
+        # the first trade of a candle is added right away
+        add_trade(start + 1000, 12, 1)
+        np.testing.assert_equal(store.candles.get_current_candle('Sandbox', 'BTC-USD', '1m'), [start, 10, 12, 12, 10, 1])
+
+        # the next ones at most once per TRADE_CANDLE_EMIT_INTERVAL
+        add_trade(start + 1500, 9, 2)
+        np.testing.assert_equal(store.candles.get_current_candle('Sandbox', 'BTC-USD', '1m'), [start, 10, 12, 12, 10, 1])
+        add_trade(start + 2000, 11, 1)
+        np.testing.assert_equal(store.candles.get_current_candle('Sandbox', 'BTC-USD', '1m'), [start, 10, 11, 12, 9, 4])
+        add_trade(start + 2500, 12.5, 1)
+
+        # a new candle begins: the previous one is completed, and the new one continues the empty one
+        add_trade(start + 60_500, 13, 1)
+        np.testing.assert_equal(store.candles.get_candles('Sandbox', 'BTC-USD', '1m'), [
+            [start, 10, 12.5, 12.5, 9, 5],
+            [start + 60_000, 12.5, 13, 13, 12.5, 1],
+        ])
+        np.testing.assert_equal(store.candles.get_current_candle('Sandbox', 'BTC-USD', '5m'), [start, 10, 13, 13, 9, 6])
+
+        add_trade(start + 60_700, 14, 1)
+        store.candles.flush_candles_from_trades()
+        np.testing.assert_equal(store.candles.get_current_candle('Sandbox', 'BTC-USD', '1m'), [start + 60_000, 12.5, 14, 14, 12.5, 2])
+
+
+def test_candles_from_trades_are_flushed_while_trades_arrive():
+    set_up()
+    start = 1_552_309_200_000
+    store.candles.add_candle(np.array([start, 10, 10, 10, 10, 0]), 'Sandbox', 'BTC-USD', '1m')
+    store.candles.initiated_pairs['Sandbox-BTC-USD'] = True
+    first_trade = threading.Thread(
+        target=store.candles.add_candle_from_trade, args=({'price': 12, 'volume': 1}, 'Sandbox', 'BTC-USD')
+    )
+
+    def emit(*args):
+        # the first trade of another route arrives on the websocket thread while flushing
+        if first_trade.ident is None:
+            first_trade.start()
+            first_trade.join(0.1)
+
+    with mock.patch.object(jh, 'is_live', return_value=True), \
+            mock.patch.object(jh, 'now', return_value=start + 1000), \
+            mock.patch.object(jh, 'get_config', return_value=True), \
+            mock.patch.object(CandlesState, 'update_position'), \
+            mock.patch('jesse.store.state_candles.candle_writer'):
+        store.candles.candles_from_trades['Sandbox-ETH-USD-1m'] = mock.Mock(
+            has_pending=True, route=('Sandbox', 'ETH-USD', '1m')
+        )
+        with mock.patch.object(CandlesState, '_emit_forming_candle', side_effect=emit):
+            store.candles.flush_candles_from_trades()
+        first_trade.join()
+
+    assert 'Sandbox-BTC-USD-1m' in store.candles.candles_from_trades
+
+
+def test_live_candles_are_stored_by_the_candle_writer():
+    set_up()
+    start = 1_552_309_200_000
+    store.candles.add_candle(np.array([start, 10, 10, 10, 10, 0]), 'Sandbox', 'BTC-USD', '1m')
+    store.candles.initiated_pairs['Sandbox-BTC-USD'] = True
+
+    with mock.patch.object(jh, 'is_live', return_value=True), \
+            mock.patch.object(jh, 'now', return_value=start + 61_000), \
+            mock.patch.object(jh, 'get_config', return_value=True), \
+            mock.patch.object(CandlesState, 'update_position'), \
+            mock.patch('jesse.store.state_candles.candle_writer') as candle_writer:
+        store.candles.add_candle(np.array([start + 60_000, 10, 11, 11, 10, 1]), 'Sandbox', 'BTC-USD', '1m')
+
+    # the 1m candle and the 5m candle that is generated from it
+    assert [c[0][:3] for c in candle_writer.add.call_args_list] == [
+        ('Sandbox', 'BTC-USD', '1m'), ('Sandbox', 'BTC-USD', '5m')
+    ]
+
+
+def test_bigger_timeframes_are_updated_incrementally_in_live_sessions():
+    set_up()
+    start = 1_552_309_200_000
+    store.candles.add_candle(np.array([start, 10, 10, 10, 10, 1]), 'Sandbox', 'BTC-USD', '1m')
+    store.candles.initiated_pairs['Sandbox-BTC-USD'] = True
+    rng = np.random.default_rng(1)
+
+    with mock.patch.object(jh, 'is_live', return_value=True), \
+            mock.patch.object(jh, 'now', return_value=start + 3_600_000), \
+            mock.patch.object(jh, 'get_config', return_value=True), \
+            mock.patch.object(CandlesState, 'update_position'), \
+            mock.patch('jesse.store.state_candles.candle_writer'), \
+            mock.patch('jesse.store.state_candles.generate_candle_from_one_minutes',
+                       wraps=generate_candle_from_one_minutes) as generate:
+        for minute in range(1, 13):
+            # several updates of each forming 1m candle
+            for _ in range(3):
+                o, c = rng.integers(5, 15, 2)
+                candle = np.array([start + minute * 60_000, o, c, max(o, c) + 1, min(o, c) - 1, rng.integers(1, 5)])
+                store.candles.add_candle(candle, 'Sandbox', 'BTC-USD', '1m')
+
+                one_minutes = store.candles.get_candles('Sandbox', 'BTC-USD', '1m')
+                forming = store.candles.get_storage('Sandbox', 'BTC-USD', '5m')[-1]
+                np.testing.assert_equal(
+                    forming,
+                    generate_candle_from_one_minutes('5m', one_minutes[one_minutes[:, 0] >= forming[0]], True)
+                )
+
+    # the 1m candles are only reduced again when a new 5m candle begins
+    assert generate.call_count < 10
+
+
+def test_get_candles_stack():
+    reset_config()
+    from jesse.routes import router
+    router.set_routes([
+        {'exchange': 'Sandbox', 'symbol': 'BTC-USD', 'timeframe': '1m', 'strategy': 'Test01'}
+    ])
+    router.set_data_candles([{'exchange': 'Sandbox', 'symbol': 'ETH-USD', 'timeframe': '1m'}])
+    config['app']['considering_timeframes'] = ['1m']
+    config['app']['considering_symbols'] = ['BTC-USD', 'ETH-USD']
+    config['app']['considering_exchanges'] = ['Sandbox']
+    store.reset(True)
+    store.candles.init_storage()
+
+    candles = range_candles(20)
+    store.candles.batch_add_candle(candles, 'Sandbox', 'BTC-USD', '1m')
+    store.candles.batch_add_candle(candles[5:], 'Sandbox', 'ETH-USD', '1m')
+
+    stack = store.candles.get_candles_stack('Sandbox', ['BTC-USD', 'ETH-USD'], '1m')
+    assert stack.shape == (2, 20, 6)
+    np.testing.assert_equal(stack[0], candles)
+    assert np.isnan(stack[1, :5]).all()
+    np.testing.assert_equal(stack[1, 5:], candles[5:])
@@ -41,3 +41,64 @@ def set_up():
 #     }
 #
 #     assert store.logs.info == [first_logged_info, second_logged_info]
+
+
+def test_logs_buffer_keeps_the_latest_logs():
+    from jesse.store.state_logs import LogsBuffer
+
+    logs = LogsBuffer(maxlen=3)
+    for i in range(5):
+        logs.append({'message': i})
+
+    assert logs.count == 5
+    assert len(logs) == 3
+    assert logs == [{'message': 2}, {'message': 3}, {'message': 4}]
+    assert logs[0] == {'message': 2}
+    assert logs[::-1][0:2] == [{'message': 4}, {'message': 3}]
+
+
+def test_log_sink_writes_batches_in_the_background(tmp_path, monkeypatch):
+    import logging
+
+    published = []
+    monkeypatch.setattr(logger, 'sync_publish', lambda event, msg: published.append((event, msg['message'])))
+    file_logger = logging.getLogger('test-log-sink')
+    file_logger.setLevel(logging.INFO)
+    file_logger.addHandler(logging.FileHandler(tmp_path / 'logs.txt', mode='w'))
+    monkeypatch.setitem(logger.LOGGERS, 'test-log-sink', file_logger)
+
+    sink = logger.LogSink()
+    timestamp = 1609459200000
+    sink.put({'timestamp': timestamp, 'message': 'first'}, 'test-log-sink', '[INFO | {time}] {message}', 'info_log')
+    sink.put({'timestamp': timestamp, 'message': 'second {x}'}, 'test-log-sink', '[ERROR | {time}] {message}')
+    sink.put({'timestamp': timestamp, 'message': 'third'}, event='error_log')
+    sink.flush()
+
+    assert published == [('info_log', 'first'), ('error_log', 'third')]
+    assert (tmp_path / 'logs.txt').read_text() == (
+        '[INFO | 2021-01-01T00:00:00] first\n'
+        '[ERROR | 2021-01-01T00:00:00] second {x}\n'
+    )
+
+
+def test_log_sink_writes_the_logs_of_loggers_which_have_been_reset(tmp_path, monkeypatch):
+    import logging
+
+    file_logger = logging.getLogger('test-log-sink-reset')
+    file_logger.setLevel(logging.INFO)
+    file_logger.addHandler(logging.FileHandler(tmp_path / 'logs.txt', mode='w'))
+    monkeypatch.setitem(logger.LOGGERS, 'test-log-sink-reset', file_logger)
+
+    sink = logger.LogSink()
+    timestamp = 1609459200000
+    sink.put({'timestamp': timestamp, 'message': 'first'}, 'test-log-sink-reset', '[INFO | {time}] {message}')
+    logger.LOGGERS.pop('test-log-sink-reset')
+    sink.put({'timestamp': timestamp, 'message': 'second'}, 'test-log-sink-reset', '[INFO | {time}] {message}')
+    # a logger which was never created is skipped without losing the batch
+    sink.put({'timestamp': timestamp, 'message': 'lost'}, 'test-log-sink-unknown', '[INFO | {time}] {message}')
+    sink.flush()
+
+    assert (tmp_path / 'logs.txt').read_text() == (
+        '[INFO | 2021-01-01T00:00:00] first\n'
+        '[INFO | 2021-01-01T00:00:00] second\n'
+    )
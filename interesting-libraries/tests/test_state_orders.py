@@ -1,5 +1,5 @@
 from jesse.config import config, reset_config
-from jesse.enums import exchanges
+from jesse.enums import exchanges, order_statuses
 from jesse.factories import fake_order
 from jesse.store import store
 from jesse.routes import router
@@ -61,3 +61,27 @@ def test_state_order_get_orders():
     store.orders.add_order(o1)
     store.orders.add_order(o2)
     assert store.orders.get_orders(exchanges.SANDBOX, 'BTC-USD') == [o1, o2]
+
+
+def test_get_active_orders_between():
+    set_up()
+
+    o1 = fake_order({'price': 50})
+    o2 = fake_order({'price': 30})
+    o3 = fake_order({'price': 40})
+    o4 = fake_order({'price': 45, 'status': order_statuses.CANCELED})
+    o5 = fake_order({'price': 50})
+    for o in (o1, o2, o3, o4, o5):
+        store.orders.add_order(o)
+
+    # in the order that they were submitted in, including the prices at both ends
+    assert store.orders.get_active_orders_between(exchanges.SANDBOX, 'BTC-USD', 40, 50) == [o1, o3, o5]
+    assert store.orders.get_active_orders_between(exchanges.SANDBOX, 'BTC-USD', 51, 60) == []
+
+    o3.status = order_statuses.EXECUTED
+    o6 = fake_order({'price': 42})
+    store.orders.add_order(o6)
+    assert store.orders.get_active_orders_between(exchanges.SANDBOX, 'BTC-USD', 40, 50) == [o1, o5, o6]
+
+    store.orders.remove_order(o1)
+    assert store.orders.get_active_orders_between(exchanges.SANDBOX, 'BTC-USD', 40, 50) == [o5, o6]
@@ -0,0 +1,70 @@
+from jesse.services.throttled_publisher import ThrottledPublisher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def _publisher(interval=0.5):
+    published = []
+    clock = FakeClock()
+    publisher = ThrottledPublisher(interval, lambda event, msg: published.append((event, msg)), clock)
+    return publisher, published, clock
+
+
+def test_publishes_only_the_latest_state_per_window():
+    publisher, published, clock = _publisher()
+
+    publisher.set('progressbar', {'current': 1})
+    assert publisher.maybe_flush() is True
+    assert published == [('progressbar', {'current': 1})]
+
+    publisher.set('progressbar', {'current': 2})
+    publisher.set('progressbar', {'current': 3})
+    clock.now = 0.3
+    assert publisher.maybe_flush() is False
+    assert len(published) == 1
+
+    clock.now = 0.6
+    assert publisher.maybe_flush() is True
+    assert published[1:] == [('progressbar', {'current': 3})]
+
+    # nothing pending, nothing to publish
+    clock.now = 2
+    assert publisher.maybe_flush() is False
+    assert len(published) == 2
+
+
+def test_batches_stream_events_into_one_message():
+    publisher, published, clock = _publisher()
+
+    publisher.flush()
+    publisher.extend('objective_curve', [{'trial': 1}])
+    publisher.extend('objective_curve', [{'trial': 2}, {'trial': 3}])
+    assert publisher.maybe_flush() is False
+
+    clock.now = 1
+    publisher.maybe_flush()
+    assert published == [('objective_curve', [{'trial': 1}, {'trial': 2}, {'trial': 3}])]
+
+
+def test_callable_payloads_are_built_at_flush_time():
+    publisher, published, clock = _publisher()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return len(calls)
+
+    for _ in range(10):
+        publisher.set('best_candidates', build)
+    assert calls == []
+
+    publisher.flush()
+    assert calls == [1]
+    assert published == [('best_candidates', 1)]
+    assert publisher.has_pending is False
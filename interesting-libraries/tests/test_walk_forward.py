@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from jesse import exceptions
+from jesse.modes.optimize_mode.walk_forward import get_folds, slice_fold_candles, aggregate_out_of_sample_metrics
+
+DAY = 86_400_000
+# 2021-01-01T00:00:00+00:00
+START = 1609459200000
+
+
+def _fake_candles(days: int, warmup_minutes: int = 0) -> dict:
+    timestamps = START - warmup_minutes * 60_000 + np.arange(days * 1440 + warmup_minutes) * 60_000
+    arr = np.zeros((len(timestamps), 6))
+    arr[:, 0] = timestamps
+    arr[:, 1:5] = 100
+    return {
+        'Sandbox-BTC-USDT': {
+            'exchange': 'Sandbox',
+            'symbol': 'BTC-USDT',
+            'candles': arr,
+        }
+    }
+
+
+def test_get_folds_rolling():
+    folds = get_folds(START, START + 40 * DAY, 3)
+
+    assert len(folds) == 3
+    assert [f['index'] for f in folds] == [0, 1, 2]
+    # 40 days split into 4 segments of 10 days
+    assert folds[0]['training_start'] == START
+    assert folds[0]['training_finish'] == START + 10 * DAY
+    assert folds[0]['testing_start'] == START + 10 * DAY
+    assert folds[0]['testing_finish'] == START + 20 * DAY
+    assert folds[1]['training_start'] == START + 10 * DAY
+    assert folds[2]['training_start'] == START + 20 * DAY
+    assert folds[2]['testing_finish'] == START + 40 * DAY
+
+
+def test_get_folds_anchored():
+    folds = get_folds(START, START + 40 * DAY, 3, anchored=True)
+
+    assert all(f['training_start'] == START for f in folds)
+    assert folds[2]['training_finish'] == START + 30 * DAY
+    assert folds[2]['testing_start'] == START + 30 * DAY
+
+
+def test_get_folds_adds_remaining_days_to_the_last_testing_segment():
+    folds = get_folds(START, START + 42 * DAY, 3)
+
+    assert folds[1]['testing_finish'] == START + 30 * DAY
+    assert folds[2]['testing_finish'] == START + 42 * DAY
+
+
+def test_get_folds_validates_input():
+    with pytest.raises(ValueError):
+        get_folds(START, START + 40 * DAY, 0)
+
+    with pytest.raises(exceptions.InvalidConfig):
+        get_folds(START, START + 3 * DAY, 3)
+
+
+def test_slice_fold_candles():
+    candles = _fake_candles(4, warmup_minutes=100)
+
+    warmup, trading = slice_fold_candles(candles, START + DAY, START + 2 * DAY, 100)
+
+    trading_arr = trading['Sandbox-BTC-USDT']['candles']
+    warmup_arr = warmup['Sandbox-BTC-USDT']['candles']
+    assert len(trading_arr) == 1440
+    assert trading_arr[0][0] == START + DAY
+    assert trading_arr[-1][0] == START + 2 * DAY - 60_000
+    assert len(warmup_arr) == 100
+    assert warmup_arr[-1][0] == START + DAY - 60_000
+    assert trading['Sandbox-BTC-USDT']['exchange'] == 'Sandbox'
+
+    # the first segment uses the warmup candles that were loaded before the period
+    warmup, trading = slice_fold_candles(candles, START, START + DAY, 100)
+    assert warmup['Sandbox-BTC-USDT']['candles'][0][0] == START - 100 * 60_000
+
+    # without warmup candles
+    warmup, trading = slice_fold_candles(candles, START, START + DAY, 0)
+    assert warmup is None
+    assert len(trading['Sandbox-BTC-USDT']['candles']) == 1440
+
+
+def test_slice_fold_candles_raises_for_missing_warmup_candles():
+    candles = _fake_candles(4, warmup_minutes=10)
+
+    with pytest.raises(exceptions.CandlesNotFound):
+        slice_fold_candles(candles, START, START + DAY, 100)
+
+
+def test_aggregate_out_of_sample_metrics():
+    result = aggregate_out_of_sample_metrics([
+        {'total': 10, 'win_rate': 0.6, 'net_profit_percentage': 10, 'max_drawdown': -5, 'sharpe_ratio': 2},
+        {'total': 30, 'win_rate': 0.4, 'net_profit_percentage': -5, 'max_drawdown': -8, 'sharpe_ratio': np.nan},
+        {},
+    ])
+
+    assert result['folds'] == 3
+    assert result['profitable_folds'] == 1
+    assert result['total'] == 40
+    assert result['win_rate'] == pytest.approx(0.45)
+    assert result['net_profit_percentage'] == pytest.approx((1.1 * 0.95 - 1) * 100)
+    assert result['max_drawdown'] == -8
+    assert result['sharpe_ratio'] == 2
+    assert np.isnan(result['calmar_ratio'])
@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import gzip
+import json
+
+import numpy as np
+
+from jesse.libs import columnar
+from jesse.services import message_encoding
+from jesse.services.ws_manager import ConnectionManager, SendQueue
+
+
+class FakeWebSocket:
+    def __init__(self, is_slow=False):
+        self.sent = []
+        self.is_slow = is_slow
+        self.unblock = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.is_slow:
+            await self.unblock.wait()
+        self.sent.append(text)
+
+    async def send_bytes(self, data):
+        await self.send_text(data)
+
+
+def _message(event, data):
+    return {'id': 1, 'event': f'backtest.{event}', 'is_compressed': False, 'data': data}
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_broadcast_renders_each_encoding_once():
+    manager = ConnectionManager()
+    json_clients = [FakeWebSocket(), FakeWebSocket()]
+    msgpack_client = FakeWebSocket()
+
+    async def run():
+        for ws in json_clients:
+            await manager.connect(ws)
+        await manager.connect(msgpack_client, message_encoding.MSGPACK)
+        await manager.broadcast(_message('alert', {'a': 1}))
+        await _settle()
+
+    asyncio.run(run())
+
+    assert json.loads(json_clients[0].sent[0])['data'] == {'a': 1}
+    assert json_clients[0].sent[0] is json_clients[1].sent[0]
+    assert message_encoding.unpack(msgpack_client.sent[0])['data'] == {'a': 1}
+
+
+def test_slow_client_does_not_block_the_others():
+    manager = ConnectionManager()
+    slow, fast = FakeWebSocket(is_slow=True), FakeWebSocket()
+
+    async def run():
+        await manager.connect(slow)
+        await manager.connect(fast)
+        for i in range(3):
+            await manager.broadcast(_message('info_log', i))
+        await _settle()
+
+        assert [json.loads(m)['data'] for m in fast.sent] == [0, 1, 2]
+        assert slow.sent == []
+
+        slow.unblock.set()
+        await _settle()
+        assert [json.loads(m)['data'] for m in slow.sent] == [0, 1, 2]
+
+        manager.disconnect(slow)
+        manager.disconnect(fast)
+        await _settle()
+
+    asyncio.run(run())
+    assert manager.writer_tasks == {}
+
+
+def test_full_send_queue_drops_outdated_state_messages_first():
+    queue = SendQueue(maxsize=3)
+    queue.put('backtest.progressbar', 'p1')
+    queue.put('backtest.info_log', 'l1')
+    queue.put('backtest.progressbar', 'p2')
+    # p1 is outdated by p2
+    queue.put('backtest.info_log', 'l2')
+    assert [f for _, f in queue._items] == ['l1', 'p2', 'l2']
+    assert queue.dropped == 1
+
+    # no outdated message left: the oldest one is dropped
+    queue.put('backtest.alert', 'a1')
+    assert [f for _, f in queue._items] == ['p2', 'l2', 'a1']
+    assert queue.dropped == 2
+
+
+def test_charts_are_columnar_only_for_the_clients_which_asked_for_them():
+    manager = ConnectionManager()
+    json_client, columnar_client = FakeWebSocket(), FakeWebSocket()
+    message = columnar.encode(_message('candles_chart', [{
+        'exchange': 'Sandbox', 'symbol': 'BTC-USDT', 'timeframe': '1m',
+        'candles': {
+            'time': np.array([60, 120], dtype=np.uint32),
+            'open': np.array([1., 2.]), 'close': np.array([2., 3.]), 'high': np.array([3., 4.]),
+            'low': np.array([0.5, 1.5]), 'volume': np.array([10., 20.]),
+        },
+    }]))
+
+    async def run():
+        await manager.connect(json_client)
+        await manager.connect(columnar_client, columnar=True)
+        await manager.broadcast_binary(message)
+        await _settle()
+
+    asyncio.run(run())
+
+    assert columnar.is_encoded(columnar_client.sent[0])
+    np.testing.assert_equal(columnar.decode(columnar_client.sent[0])['data'][0]['candles']['close'], [2, 3])
+
+    # the default client gets the legacy JSON envelope
+    envelope = json.loads(json_client.sent[0])
+    assert envelope['event'] == 'backtest.candles_chart'
+    assert envelope['is_compressed'] is True
+    data = json.loads(gzip.decompress(base64.b64decode(envelope['data'])))
+    assert data[0]['symbol'] == 'BTC-USDT'
+    assert data[0]['candles'] == [
+        {'time': 60, 'open': 1, 'close': 2, 'high': 3, 'low': 0.5, 'volume': 10},
+        {'time': 120, 'open': 2, 'close': 3, 'high': 4, 'low': 1.5, 'volume': 20},
+    ]